@@ -5,17 +5,19 @@ from flask_login import LoginManager
 
 # Import configuration classes from config module
 from .config import DevelopmentConfig, ProductionConfig, TestingConfig
+from .sqlite import RoutingSession
 
 # Initialize the database and login manager
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 login_manager = LoginManager()
 
-def create_app(config_name=None):
+def create_app(config_name=None, **overrides):
     """
     Create and configure the Flask application.
 
     Args:
         config_name (str, optional): The name of the configuration to use. Defaults to None.
+        **overrides: Settings applied on top of the configuration (e.g. a database URI in tests).
 
     Returns:
         Flask: The configured Flask application.
@@ -34,24 +36,61 @@ def create_app(config_name=None):
     else:
         # Default configuration, can be set to development or any other default
         app.config.from_object(DevelopmentConfig)
+    app.config.update(overrides)
 
     # Initialize SQLAlchemy and LoginManager
+    from backend import sqlite
+    sqlite.configure(app)
     db.init_app(app)
+    sqlite.init_app(app)
     login_manager.init_app(app)
 
+    # taxonomy and audit hook the session's flush through listeners
+    from backend import observability, tenancy, tokens, resume_index, matching, taxonomy, audit, sync, migrations, events, lifecycle, idempotency, encoding, snapshots, catalog, reconcile
+    # First, so every other hook runs with a request ID
+    observability.init_app(app)
+    tenancy.init_app(app)
+    tokens.init_app(app)
+    resume_index.init_app(app)
+    matching.init_app(app)
+    migrations.init_app(app)
+    events.init_app(app)
+    lifecycle.init_app(app)
+    idempotency.init_app(app)
+    sync.init_app(app)
+    encoding.init_app(app)
+    snapshots.init_app(app)
+    catalog.init_app(app)
+    reconcile.init_app(app)
+
     # Import and register the different routes
     from backend.main import main
     from backend.auth_bp import auth_bp
     from backend.students_bp import students_bp
     from backend.jobs_bp import jobs_bp
+    from backend.placement_bp import placement_bp
+    from backend.events_bp import events_bp
+    from backend.changes_bp import changes_bp
+    from backend.snapshots_bp import snapshots_bp
+    from backend.ws_tracker_bp import ws_tracker_bp
 
     # Register your main and auth Blueprints
     app.register_blueprint(main)
     app.register_blueprint(students_bp)
     app.register_blueprint(jobs_bp)
+    app.register_blueprint(placement_bp)
+    app.register_blueprint(events_bp)
+    app.register_blueprint(changes_bp)
+    app.register_blueprint(snapshots_bp)
+    app.register_blueprint(ws_tracker_bp)
     app.register_blueprint(auth_bp, url_prefix="/auth")
+    observability.trace_views(app)
 
     with app.app_context():
-        db.create_all()
+        if app.config.get("AUTO_MIGRATE"):
+            migrations.upgrade()
+        else:
+            db.create_all()
+        tenancy.ensure_default_tenant()
 
     return app
@@ -0,0 +1,245 @@
+from datetime import date, datetime
+
+from flask import has_request_context
+from flask_login import current_user
+from sqlalchemy import event, func, inspect, or_, select
+
+from . import db
+from .models import ChangeLog, Job, Team, WSTracker
+
+# Models whose changes are written to the change log
+AUDITED = (WSTracker, Team, Job)
+# Bookkeeping columns (and uploaded files) left out of diffs
+IGNORED = {"id", "tenant_id", "updated_at", "accepted_count", "resume"}
+# IDs are allocated at flush, not commit, so a transaction can commit a lower
+# ID after a higher one is read. Readers remember the IDs missing from this
+# many IDs behind their cursor and check them again.
+LATE_COMMIT_WINDOW = 1000
+
+
+class CursorError(ValueError):
+    """Raised for change feed cursors that are malformed."""
+
+
+def _jsonable(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _values(state):
+    # Read the loaded state only; deleted rows can't lazy-load mid-flush
+    return {
+        attr.key: _jsonable(state.dict.get(attr.key))
+        for attr in state.mapper.column_attrs
+        if attr.key not in IGNORED
+    }
+
+
+def _diff(state):
+    changes = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key in IGNORED:
+            continue
+        history = state.attrs[attr.key].history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        changes[attr.key] = [_jsonable(old), _jsonable(new)]
+    return changes
+
+
+def _user_id():
+    if has_request_context() and current_user.is_authenticated:
+        return int(current_user.get_id())
+    return None
+
+
+@event.listens_for(db.session, "after_flush")
+def _write_change_log(session, flush_context):
+    rows = []
+    for operation, objects in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in objects:
+            if not isinstance(obj, AUDITED):
+                continue
+            state = inspect(obj)
+            changes = _diff(state) if operation == "update" else _values(state)
+            if not changes:
+                continue
+            rows.append({
+                "table_name": state.mapper.local_table.name,
+                "row_id": state.mapper.primary_key_from_instance(obj)[0],
+                "tenant_id": obj.tenant_id,
+                "operation": operation,
+                "changes": changes,
+            })
+    if not rows:
+        return
+
+    user_id = _user_id()
+    changed_at = datetime.utcnow()
+    for row in rows:
+        row.update(user_id=user_id, changed_at=changed_at)
+    # Same connection, so the log commits or rolls back with the change itself
+    session.connection().execute(ChangeLog.__table__.insert(), rows)
+
+
+def record_updates(table_name, rows, connection=None):
+    """
+    Log updates made outside the ORM (e.g. bulk reconciliation), which the flush listener can't see.
+
+    Args:
+        table_name (str): The table the rows were updated in.
+        rows (list): ``(id, tenant_id, changes)`` of each updated row, with
+            ``changes`` as ``{column: [old, new]}``.
+        connection (Connection, optional): Defaults to the session's connection.
+    """
+    _record("update", table_name, rows, connection)
+
+
+def record_inserts(table_name, rows, connection=None):
+    """
+    Log inserts made outside the ORM (e.g. ``upsert.insert_unique``), which the flush listener can't see.
+
+    Args:
+        table_name (str): The table the rows were inserted into.
+        rows (list): ``(id, tenant_id, values)`` of each new row, with
+            ``values`` as ``{column: value}``.
+        connection (Connection, optional): Defaults to the session's connection.
+    """
+    _record("insert", table_name, _logged_values(rows), connection)
+
+
+def record_deletes(table_name, rows, connection=None):
+    """
+    Log deletions made outside the ORM (e.g. bulk archiving), which the flush listener can't see.
+
+    Args:
+        table_name (str): The table the rows were deleted from.
+        rows (list): ``(id, tenant_id, values)`` of each deleted row, with
+            ``values`` as ``{column: value}``, e.g. its ``Row._mapping``.
+        connection (Connection, optional): Defaults to the session's connection.
+    """
+    _record("delete", table_name, _logged_values(rows), connection)
+
+
+def _logged_values(rows):
+    return [
+        (row_id, tenant_id, {key: _jsonable(value) for key, value in values.items() if key not in IGNORED})
+        for row_id, tenant_id, values in rows
+    ]
+
+
+def _record(operation, table_name, rows, connection):
+    if not rows:
+        return
+    user_id = _user_id()
+    changed_at = datetime.utcnow()
+    (connection or db.session.connection()).execute(
+        ChangeLog.__table__.insert(),
+        [
+            {"table_name": table_name, "row_id": row_id, "tenant_id": tenant_id, "operation": operation,
+             "changes": changes, "user_id": user_id, "changed_at": changed_at}
+            for row_id, tenant_id, changes in rows
+        ],
+    )
+
+
+def missing_ids(model, after, gaps, until):
+    """
+    Find the IDs of a log table that may still be committed late.
+
+    They are the IDs up to ``until``, within ``LATE_COMMIT_WINDOW`` of it,
+    that were missing before (``gaps``) or are newer than ``after``, and that
+    no committed row has, in any tenant. Call it before reading the rows, so a
+    row committed in between is read rather than lost.
+
+    Args:
+        model: ``ChangeLog`` or ``Tombstone``.
+        after (int): The newest ID already read.
+        gaps (iterable): The IDs that were missing then.
+        until (int): The newest ID about to be read.
+
+    Returns:
+        set: The missing IDs.
+    """
+    low = until - LATE_COMMIT_WINDOW
+    candidates = {row_id for row_id in gaps if row_id > low}
+    candidates.update(range(max(after, low) + 1, until + 1))
+    if not candidates:
+        return set()
+    present = db.session.execute(
+        select(model.id)
+        .where(model.id >= min(candidates), model.id <= max(candidates))
+        .execution_options(all_tenants=True)
+    ).scalars()
+    return candidates - set(present)
+
+
+def parse_cursor(cursor):
+    """
+    Split a change feed cursor into the newest ID read and the IDs missing behind it.
+
+    Args:
+        cursor (str): ``"<id>"`` or ``"<id>:<missing id>,<missing id>..."``.
+
+    Returns:
+        tuple: ``(after, gaps)``.
+
+    Raises:
+        CursorError: If the cursor is malformed.
+    """
+    after, _, gaps = (cursor or "0").partition(":")
+    try:
+        after, gaps = int(after), {int(row_id) for row_id in gaps.split(",") if row_id}
+    except ValueError:
+        raise CursorError("Invalid cursor") from None
+    if len(gaps) > LATE_COMMIT_WINDOW:
+        raise CursorError("Invalid cursor")
+    return after, gaps
+
+
+def make_cursor(after, gaps):
+    return f"{after}:{','.join(map(str, sorted(gaps)))}" if gaps else str(after)
+
+
+def read_changes(cursor="0", limit=100, table=None):
+    """
+    Read the change log after a cursor.
+
+    Besides the changes newer than the cursor, returns the ones that
+    committed late, behind changes already read (see ``LATE_COMMIT_WINDOW``),
+    so a client following the cursors never misses nor repeats a change.
+
+    Args:
+        cursor (str): The cursor returned by the previous call, "0" to start from the beginning.
+        limit (int): The maximum number of changes to return.
+        table (str, optional): Only return changes to this table.
+
+    Returns:
+        tuple: The changes, oldest first, and the next cursor.
+
+    Raises:
+        CursorError: If the cursor is malformed.
+    """
+    after, gaps = parse_cursor(cursor)
+    newest = db.session.execute(
+        select(func.coalesce(func.max(ChangeLog.id), 0)).execution_options(all_tenants=True)
+    ).scalar()
+    missing = missing_ids(ChangeLog, after, gaps, newest)
+
+    query = ChangeLog.query.filter(or_(ChangeLog.id > after, ChangeLog.id.in_(gaps)), ChangeLog.id <= newest)
+    if table:
+        query = query.filter(ChangeLog.table_name == table)
+    changes = query.order_by(ChangeLog.id).limit(limit).all()
+
+    read = {change.id for change in changes}
+    if len(changes) < limit:
+        until, unread = newest, set()
+    else:
+        # A full page stops short: what's after its last change is read next time
+        last = changes[-1].id
+        until, unread = max(last, after), {row_id for row_id in gaps if row_id > last}
+    gaps = {row_id for row_id in missing | unread if row_id <= until and row_id not in read}
+    return changes, make_cursor(until, gaps)
@@ -1,12 +1,21 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, g, request, jsonify
 from flask_login import login_user, current_user, logout_user, login_required
-from werkzeug.security import check_password_hash
-from .models import db, User
+from sqlalchemy.orm import selectinload
+from werkzeug.security import check_password_hash, generate_password_hash
+from .models import User
+from .encoding import jsonify_rows
+from .tokens import REFRESH, issue_tokens, revoke_token, validate_token
+from .rbac import requires
+from . import schemas
+from .schemas import validate
+from .unit_of_work import transactional
+from .upsert import insert_unique, update_returning
 
 auth_bp = Blueprint("auth", __name__)
 
 
-@auth_bp.route("/login", methods=["GET", "POST"])
+@auth_bp.route("/login", methods=["POST"])
+@validate(schemas.CREDENTIALS)
 def login():
     """
     Handle the login functionality.
@@ -22,11 +31,12 @@ def login():
         to the dashboard. Otherwise, it renders the login.html template.
 
     """
-    data = request.json
+    data = g.data
     email = data["email"]
     password = data["password"]
 
-    user = User.query.filter_by(email=email).first()
+    # Emails are unique across tenants, so look the user up in all of them
+    user = User.query.execution_options(all_tenants=True).filter_by(email=email).first()
     if not user or not check_password_hash(user.password, password):
         return jsonify({"message": "Invalid username or password"}), 401
 
@@ -55,15 +65,78 @@ def logout():
     return "Successfully logged out!", 200
 
 
+@auth_bp.route("/token", methods=["POST"])
+@validate(schemas.CREDENTIALS)
+def issue_token():
+    """
+    Exchange an email and password for API tokens.
+
+    The access token is sent as ``Authorization: Bearer <token>`` and is
+    checked without a database lookup; the refresh token gets a new pair from
+    ``/auth/token/refresh`` once it expires.
+
+    Returns:
+        A JSON response containing the access and refresh tokens, or an error
+        message with status code 401.
+    """
+    data = g.data
+    user = User.query.execution_options(all_tenants=True).filter_by(email=data["email"]).first()
+    if not user or not check_password_hash(user.password, data["password"]):
+        return jsonify({"message": "Invalid username or password"}), 401
+    return jsonify(issue_tokens(user)), 200
+
+
+@auth_bp.route("/token/refresh", methods=["POST"])
+@validate(schemas.REFRESH)
+def refresh_token():
+    """
+    Exchange a refresh token for a new token pair.
+
+    The refresh token is single-use: it is revoked once exchanged. The user is
+    reloaded, so role changes take effect and deleted users are locked out.
+
+    Returns:
+        A JSON response containing the new tokens, or an error message with status code 401.
+    """
+    claims = validate_token(g.data["refresh_token"], REFRESH)
+    user = claims and User.query.execution_options(all_tenants=True).filter_by(id=claims["sub"]).first()
+    if not user:
+        return jsonify({"message": "Invalid refresh token"}), 401
+    revoke_token(claims)
+    return jsonify(issue_tokens(user)), 200
+
+
+@auth_bp.route("/token/revoke", methods=["POST"])
+@validate(schemas.REVOKE)
+def revoke():
+    """
+    Revoke an access or refresh token before it expires.
+
+    Returns:
+        A JSON response containing a success message.
+    """
+    token = g.data["token"]
+    claims = validate_token(token) or validate_token(token, REFRESH)
+    if claims:
+        revoke_token(claims)
+    # Unknown and already invalid tokens are "revoked" too
+    return jsonify({"message": "Token revoked"}), 200
+
+
 @auth_bp.route("/all-users", methods=["GET"])
+@requires("users:read")
 def allUsers():
     """
     Retrieve all users from the database and return them as a JSON response.
 
+    Resumes are left out unless requested with ``?include=resume``.
+
     Returns:
         A JSON response containing a list of dictionaries, where each dictionary represents a user.
     """
-    return jsonify([user.to_dict() for user in User.query.all()]), 200
+    include_resume = "resume" in request.args.getlist("include")
+    users = User.query.options(selectinload(User.applications), selectinload(User.jobs)).all()
+    return jsonify_rows([user.to_dict(include_resume=include_resume) for user in users]), 200
 
 
 @auth_bp.route("/get-current-user", methods=["GET"])
@@ -86,7 +159,34 @@ def get_current_user():
     )
 
 
+@auth_bp.route("/users/<int:user_id>/role", methods=["PUT"])
+@requires("users:role")
+@validate(schemas.ROLE_CHANGE)
+@transactional
+def change_role(user_id):
+    """
+    Change a user's role, e.g. to appoint an admin.
+
+    Registration only offers the student and manager roles, so admins are
+    appointed by an existing admin. The new permissions apply from the
+    user's next request (and their next access token).
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        A JSON response containing the user's id, username, email and role,
+        or an error message with status code 404.
+    """
+    user = update_returning(User, user_id, {"role": g.data["role"]}, [User.id, User.username, User.email, User.role])
+    if user is None:
+        return jsonify({"message": "User not found"}), 404
+    return jsonify(user), 200
+
+
 @auth_bp.route("/register", methods=["POST"])
+@validate(schemas.REGISTRATION)
+@transactional
 def register():
     """
     Register a new user.
@@ -98,27 +198,18 @@ def register():
         A JSON response with a success message if the user is created successfully,
         or an error message if the email is already taken.
     """
-    data = request.json
-    email = data["email"]
-    first_name = data["firstName"]
-    last_name = data["lastName"]
-    password = data["password"]
-    user_role = data["userType"]
-    student_id = data["studentId"]
-
-    user = User.query.filter_by(email=email).first()
-    if user:
+    data = g.data
+    # Emails (and usernames, which are the email) are unique across tenants;
+    # the unique constraints reject a taken one without a lookup first
+    created = insert_unique(User, {
+        "username": data["email"],
+        "email": data["email"],
+        "role": data["userType"],
+        "first_name": data["firstName"],
+        "last_name": data["lastName"],
+        "password": generate_password_hash(data["password"]),
+    }, returning=[User.id])
+    if created is None:
         return jsonify({"message": "Email already taken"}), 409
 
-    new_user = User(
-        username=email,
-        email=email,
-        role=user_role,
-        first_name=first_name,
-        last_name=last_name,
-    )
-    new_user.set_password(password)
-    db.session.add(new_user)
-    db.session.commit()
-
     return jsonify({"message": "User created successfully"}), 201
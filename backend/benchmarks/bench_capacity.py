@@ -0,0 +1,138 @@
+"""
+Stress benchmark of job capacity enforcement.
+
+Worker processes (like WSGI workers) accept applications concurrently with
+``PUT /applications/<id>`` against a file-backed SQLite database in the
+production mode, over a few jobs with fewer seats than applicants. Reports
+the review throughput, the acceptances and refusals (``409``), failed
+requests, and checks that no job accepted more than ``max_students`` and that
+every job's ``accepted_count`` matches its accepted applications. For
+comparison, the same requests are timed rejecting instead, which takes no seat.
+
+Usage:
+    python -m backend.benchmarks.bench_capacity [--workers 4] [--applications 2000] [--jobs 5] [--seats 100]
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+
+from sqlalchemy import func
+from werkzeug.security import generate_password_hash
+
+from backend import create_app, db
+from backend.models import Application, Job, User
+from backend.sqlite import writer_engine
+
+
+def populate(args):
+    db.session.execute(db.insert(User), [
+        {"username": f"user{i}", "password": "x", "first_name": "U", "last_name": str(i),
+         "email": f"user{i}@example.com", "role": "Student"}
+        for i in range(args.applications)
+    ])
+    admin = User(username="admin", password=generate_password_hash("pw", method="pbkdf2:sha256:1"), first_name="A",
+                 last_name="D", email="admin@example.com", role="admin")
+    db.session.add(admin)
+    db.session.flush()
+    db.session.add_all(
+        Job(employer_id=admin.id, title=f"Job {i}", department="Library", manager_name="M",
+            manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1, max_students=args.seats,
+            role_location="SF", type_of_work="Admin", brief_description="Desk work", application_deadline="2030-01-01")
+        for i in range(args.jobs)
+    )
+    db.session.flush()
+    job_ids = list(db.session.execute(db.select(Job.id)).scalars())
+    student_ids = db.session.execute(db.select(User.id).where(User.role == "Student")).scalars().all()
+    db.session.execute(db.insert(Application), [
+        {"student_id": student_id, "job_id": job_ids[i % len(job_ids)], "email_address": "a@example.com",
+         "year_of_graduation": 2027, "candidate_statement": "Hi", "term": "Fall 2026", "status": "pending"}
+        for i, student_id in enumerate(student_ids)
+    ])
+    db.session.commit()
+    return list(db.session.execute(db.select(Application.id)).scalars())
+
+
+def worker(settings, status, application_ids, results):
+    app = create_app("testing", **settings)
+    client = app.test_client()
+    client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+    counts = Counter()
+    for application_id in application_ids:
+        try:
+            code = client.put(f"/applications/{application_id}", json={"status": status}).status_code
+        except Exception:
+            code = "error"
+        counts[code] += 1
+    results.put(counts)
+
+
+def run(status, args):
+    directory = tempfile.mkdtemp()
+    settings = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(directory, 'bench.db')}",
+        "LOG_LEVEL": "CRITICAL",
+    }
+    try:
+        app = create_app("testing", **settings)
+        with app.app_context():
+            db.create_all()
+            application_ids = populate(args)
+            for engine in {db.engine, writer_engine()}:
+                engine.dispose()
+
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        processes = [
+            context.Process(target=worker, args=(settings, status, application_ids[i::args.workers], results))
+            for i in range(args.workers)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        counts = Counter()
+        for _ in processes:
+            counts.update(results.get())
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        with app.app_context():
+            accepted = dict(
+                db.session.query(Application.job_id, func.count(Application.id))
+                .filter(Application.status == "accepted").group_by(Application.job_id)
+            )
+            jobs = db.session.query(Job.id, Job.max_students, Job.accepted_count).all()
+            consistent = all(
+                accepted.get(job_id, 0) <= max_students and accepted.get(job_id, 0) == accepted_count
+                for job_id, max_students, accepted_count in jobs
+            )
+            db.session.remove()
+            for engine in {db.engine, writer_engine()}:
+                engine.dispose()
+        return counts, elapsed, consistent
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--applications", type=int, default=2000)
+    parser.add_argument("--jobs", type=int, default=5)
+    parser.add_argument("--seats", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers, {args.applications} applications to {args.jobs} jobs of {args.seats} seats")
+    for status in ("accepted", "rejected"):
+        counts, elapsed, consistent = run(status, args)
+        print(f"  {status:>8}: {args.applications / elapsed:7.1f} reviews/s  {counts[200]:5d} ok  "
+              f"{counts[409]:5d} full  {counts['error'] + counts[500]:3d} failed  "
+              f"capacity {'respected' if consistent else 'VIOLATED'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark of the in-process team and job catalog.
+
+Fills an in-memory database with synthetic teams and jobs, then reports the
+memory taken by the loaded rows as ORM instances and as catalog records, and
+the latency of a job lookup through the ORM (fresh session, as in a new
+request), through the catalog (including its version check) and from the
+catalog's memory alone.
+
+Usage:
+    python -m backend.benchmarks.bench_catalog [--teams 200] [--jobs 5000] [--lookups 2000]
+"""
+import argparse
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+
+from flask import g
+
+from backend import create_app, db
+from backend.catalog import Catalog
+from backend.models import Job, Team, User
+from backend.tenancy import DEFAULT_TENANT_ID
+
+
+def populate(teams, jobs):
+    employer = User(username="boss", password="x", first_name="B", last_name="Oss",
+                    email="boss@example.com", role="Employer")
+    db.session.add(employer)
+    db.session.flush()
+    db.session.add_all(
+        Team(name=f"Team {i}", manager="M", email="m@example.com", max_students=3, priority="High",
+             contact="Slack", recruiting_for="Fall 2026")
+        for i in range(teams)
+    )
+    db.session.add_all(
+        Job(employer_id=employer.id, title=f"Job {i}", department="Library", manager_name="M",
+            manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1, max_students=3,
+            role_location="SF", type_of_work="Admin", brief_description="Desk work " * 10,
+            application_deadline="2030-01-01")
+        for i in range(jobs)
+    )
+    db.session.commit()
+    db.session.remove()
+
+
+def allocated(load):
+    """Return what ``load()`` returns and the bytes it keeps allocated."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = load()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, after - before
+
+
+def load_catalog():
+    catalog = Catalog()
+    catalog.refresh(DEFAULT_TENANT_ID)
+    return catalog
+
+
+def per_lookup(lookup, ids):
+    timings = []
+    for job_id in ids:
+        start = time.perf_counter()
+        lookup(job_id)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--teams", type=int, default=200)
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    with app.app_context():
+        db.create_all()
+        populate(args.teams, args.jobs)
+
+        orm, orm_bytes = allocated(lambda: (Team.query.all(), Job.query.all()))
+        del orm
+        db.session.remove()
+        catalog, catalog_bytes = allocated(load_catalog)
+
+        ids = [random.randint(1, args.jobs) for _ in range(args.lookups)]
+
+        def orm_lookup(job_id):
+            db.session.remove()
+            return db.session.get(Job, job_id).to_dict()
+
+        def catalog_lookup(job_id):
+            catalog.refresh(DEFAULT_TENANT_ID)
+            return catalog.job(job_id).to_dict()
+
+        with app.test_request_context():
+            g.tenant_id = DEFAULT_TENANT_ID
+            orm_latency = per_lookup(orm_lookup, ids)
+            checked_latency = per_lookup(catalog_lookup, ids)
+            memory_latency = per_lookup(lambda job_id: catalog.job(job_id).to_dict(), ids)
+
+        rows = args.teams + args.jobs
+        print(f"{args.teams} teams + {args.jobs} jobs")
+        print(f"  ORM instances:   {orm_bytes / 1024:8.0f} KiB  ({orm_bytes / rows:5.0f} B per row)")
+        print(f"  catalog records: {catalog_bytes / 1024:8.0f} KiB  ({catalog_bytes / rows:5.0f} B per row)")
+        print("Job lookup (median)")
+        print(f"  ORM, fresh session:       {orm_latency:7.1f} us")
+        print(f"  catalog + version check:  {checked_latency:7.1f} us")
+        print(f"  catalog, in memory:       {memory_latency:7.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark of response encodings for the large list endpoints.
+
+Fills an in-memory database with synthetic users, jobs and tracker rows, then
+requests ``/auth/all-users``, ``/admin/jobs`` and ``/ws-position-tracker`` in
+each encoding and reports bytes on the wire and time per request.
+
+Usage:
+    python -m backend.benchmarks.bench_encoding [--rows 2000] [--repeat 5]
+"""
+import argparse
+import random
+import time
+
+from werkzeug.security import generate_password_hash
+
+from backend import create_app, db
+from backend.encoding import COLUMNAR_MIMETYPE, brotli
+from backend.models import Application, Job, User, WSTracker
+
+WORDS = "library desk research assistant tutoring python data events admissions outreach".split()
+ENDPOINTS = ("/auth/all-users", "/admin/jobs", "/ws-position-tracker")
+
+
+def populate(rows, rng):
+    admin = User(username="admin", password=generate_password_hash("pw"), first_name="A",
+                 last_name="Admin", email="admin@example.com", role="admin")
+    db.session.add(admin)
+    students = [
+        User(username=f"student{i}", password="x", first_name=f"First{i}", last_name=f"Last{i}",
+             email=f"student{i}@example.com", role="Student", education_level="Undergraduate",
+             resume=" ".join(rng.choices(WORDS, k=300)))
+        for i in range(rows)
+    ]
+    db.session.add_all(students)
+    db.session.flush()
+    jobs = [
+        Job(employer_id=admin.id, title=f"Job {i}", department=rng.choice(["Library", "IT", "Admissions"]),
+            manager_name="M", manager_email="m@example.com", hiring_semesters="Fall 2026",
+            min_students=1, max_students=3, role_location="SF", type_of_work="Admin",
+            brief_description=" ".join(rng.choices(WORDS, k=40)), application_deadline="2030-01-01")
+        for i in range(rows // 10)
+    ]
+    db.session.add_all(jobs)
+    db.session.flush()
+    db.session.add_all(
+        Application(student_id=student.id, job_id=rng.choice(jobs).id, email_address=student.email,
+                    year_of_graduation=2027, candidate_statement=" ".join(rng.choices(WORDS, k=60)))
+        for student in students
+    )
+    db.session.add_all(
+        WSTracker(student_id=f"S{i}", minerva_email=f"student{i}@example.com", full_name=f"First{i} Last{i}",
+                  expected_grad_year=2027, ws_eligible=True, role="Assistant", manager_name="M",
+                  manager_email="m@example.com", department_name="Library", paycom_id=f"P{i}",
+                  contractor_status="Active", notes=" ".join(rng.choices(WORDS, k=10)))
+        for i in range(rows)
+    )
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    variants = [("json", "identity"), ("json", "gzip"), ("columnar", "identity"), ("columnar", "gzip")]
+    if brotli is not None:
+        variants += [("json", "br"), ("columnar", "br")]
+
+    with app.app_context():
+        db.create_all()
+        populate(args.rows, random.Random(args.seed))
+        client = app.test_client()
+        client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+        for endpoint in ENDPOINTS:
+            print(endpoint)
+            for body, encoding in variants:
+                headers = {"Accept-Encoding": encoding}
+                if body == "columnar":
+                    headers["Accept"] = COLUMNAR_MIMETYPE
+                timings = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    response = client.get(endpoint, headers=headers)
+                    timings.append((time.perf_counter() - start) * 1000)
+                print(f"  {body:>8} {encoding:>8}: {len(response.data):>10,} bytes  {min(timings):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
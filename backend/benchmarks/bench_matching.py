@@ -0,0 +1,82 @@
+"""
+Offline benchmark for the student-job matching engine.
+
+Builds a synthetic corpus of jobs and measures vectorization time and the
+latency of scoring + ranking every job for a student.
+
+Usage:
+    python -m backend.benchmarks.bench_matching [--jobs 10000] [--students 200]
+"""
+import argparse
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+from backend.matching import MatchingEngine, student_features
+
+WORDS = (
+    "python sql excel research writing design figma marketing social media data analysis "
+    "statistics tutoring teaching community outreach events logistics finance accounting "
+    "budget video editing photography web react javascript support operations admissions "
+    "library archive translation spanish mandarin german coordination scheduling customer"
+).split()
+WORK_TYPES = ["Research", "Administrative", "Technical", "Creative", "Outreach", "Other"]
+SEMESTERS = ["Fall 2026", "Spring 2027", "Fall 2027", "Spring 2028"]
+LEVELS = ["Freshman", "Sophomore", "Junior", "Senior"]
+
+
+def make_job(job_id, rng):
+    return SimpleNamespace(
+        id=job_id,
+        title=" ".join(rng.sample(WORDS, 3)),
+        department=rng.choice(WORK_TYPES) + " Office",
+        prerequisites=" ".join(rng.sample(LEVELS, 2)),
+        brief_description=" ".join(rng.choices(WORDS, k=30)),
+        more_details=" ".join(rng.choices(WORDS, k=60)),
+        type_of_work=rng.choice(WORK_TYPES),
+        hiring_semesters=",".join(rng.sample(SEMESTERS, 2)),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [make_job(job_id, rng) for job_id in range(1, args.jobs + 1)]
+
+    engine = MatchingEngine()
+    start = time.perf_counter()
+    engine.load(jobs)
+    print(f"vectorized {args.jobs} jobs in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    for job in rng.sample(jobs, min(100, len(jobs))):
+        engine.upsert(job)
+    print(f"incremental update: {(time.perf_counter() - start) * 10:.3f} ms/job")
+
+    job_ids = [job.id for job in jobs]
+    latencies = []
+    for _ in range(args.students):
+        features = student_features(
+            rng.choice(LEVELS),
+            " ".join(rng.choices(WORDS, k=200)),
+            rng.sample(WORK_TYPES, 2),
+        )
+        start = time.perf_counter()
+        engine.rank(job_ids, features, graduation_year=rng.choice([2026, 2027, 2028]))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    print(
+        f"rank {args.jobs} jobs: p50 {statistics.median(latencies):.2f} ms, "
+        f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms, max {latencies[-1]:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark for the batch placement optimizer.
+
+Generates a realistic pending-application pool (each student applies to a few
+jobs, popular jobs attract more applicants) and times the solve.
+
+Usage:
+    python -m backend.benchmarks.bench_placement [--students 3000] [--jobs 400] [--teams 60]
+"""
+import argparse
+import random
+import time
+
+from backend.placement import solve
+
+
+def make_problem(n_students, n_jobs, n_teams, applications_per_student, rng):
+    teams = {
+        team_id: (rng.randint(5, 40), rng.choice([1.0, 0.5, 0.0]))
+        for team_id in range(1, n_teams + 1)
+    }
+    jobs = {}
+    for job_id in range(1, n_jobs + 1):
+        max_students = rng.randint(1, 10)
+        jobs[job_id] = (rng.choice([*teams, None]), max_students, rng.randint(0, min(2, max_students)))
+
+    popularity = [rng.paretovariate(1.5) for _ in jobs]
+    job_ids = list(jobs)
+    applications = []
+    application_id = 0
+    for student_id in range(1, n_students + 1):
+        chosen = set()
+        while len(chosen) < applications_per_student:
+            chosen.add(rng.choices(job_ids, weights=popularity)[0])
+        for rank, job_id in enumerate(chosen):
+            application_id += 1
+            applications.append((application_id, student_id, job_id, rank))
+    return applications, jobs, teams
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=3000)
+    parser.add_argument("--jobs", type=int, default=400)
+    parser.add_argument("--teams", type=int, default=60)
+    parser.add_argument("--per-student", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    applications, jobs, teams = make_problem(args.students, args.jobs, args.teams, args.per_student, rng)
+
+    start = time.perf_counter()
+    result = solve(applications, jobs, teams)
+    elapsed = time.perf_counter() - start
+
+    placed = len(result["assignments"])
+    capacity = sum(slots for _, slots, _ in jobs.values())
+    print(
+        f"{len(applications)} applications, {args.students} students, {args.jobs} jobs "
+        f"({capacity} slots), {args.teams} teams"
+    )
+    print(f"placed {placed} students, objective {result['objective']}, solved in {elapsed:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
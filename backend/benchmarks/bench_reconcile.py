@@ -0,0 +1,129 @@
+"""
+Benchmark of the WS tracker reconciliation.
+
+Fills an in-memory database with synthetic students, accepted and pending
+applications and tracker rows (exact emails, hand-typed emails, reordered
+names, typos and strangers), then reports the time of a first reconciliation
+(which writes every row), of a rerun (which writes nothing) and the time a
+nested-loop comparison of every row with every student would take,
+extrapolated from a sample.
+
+Usage:
+    python -m backend.benchmarks.bench_reconcile [--students 10000] [--rows 10000] [--sample 100]
+"""
+import argparse
+import random
+import string
+import time
+from collections import Counter
+from difflib import SequenceMatcher
+
+from backend import create_app, db
+from backend.models import Application, Job, User, WSTracker
+from backend.reconcile import FUZZY_THRESHOLD, name_key, reconcile
+from backend.tenancy import DEFAULT_TENANT_ID
+
+FIRST = ["Ana", "Bo", "Kai", "Maria", "Jonathan", "Aiyana", "Chen", "Dmitri", "Fatima", "Lucas", "Priya", "Tomás"]
+
+
+def word(rng):
+    return rng.choice(string.ascii_uppercase) + "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 8)))
+
+
+def typo(rng, name):
+    i = rng.randrange(1, len(name) - 1)
+    return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+
+
+def populate(students, rows, rng):
+    db.session.execute(db.insert(User), [
+        {"username": f"s{i}", "password": "x", "first_name": rng.choice(FIRST), "last_name": word(rng),
+         "email": f"s{i}@uni.edu", "role": "Student"}
+        for i in range(students)
+    ])
+    employer = User(username="boss", password="x", first_name="B", last_name="Oss", email="boss@example.com",
+                    role="Employer")
+    db.session.add(employer)
+    db.session.flush()
+    job = Job(employer_id=employer.id, title="Desk", department="Library", manager_name="M",
+              manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1, max_students=3,
+              role_location="SF", type_of_work="Admin", brief_description="Work", application_deadline="2030-01-01")
+    db.session.add(job)
+    db.session.flush()
+    users = db.session.execute(db.select(User.id, User.email, User.first_name, User.last_name)
+                               .where(User.role == "Student")).all()
+    db.session.execute(db.insert(Application), [
+        {"student_id": user_id, "job_id": job.id, "status": rng.choice(["accepted", "pending"]),
+         "email_address": email, "year_of_graduation": 2027, "candidate_statement": "Hi", "term": "Fall 2026"}
+        for user_id, email, _, _ in rng.sample(users, int(len(users) * 0.6))
+    ])
+
+    tracker = []
+    for i in range(rows):
+        user_id, email, first_name, last_name = rng.choice(users)
+        kind = rng.random()
+        if kind < 0.5:
+            values = (f"M{i}", email.upper(), f"{first_name} {last_name}")
+        elif kind < 0.7:
+            values = (f"M{i}", "", f"{last_name}, {first_name}")
+        elif kind < 0.85:
+            values = (f"M{i}", "", f"{first_name} {typo(rng, last_name)}")
+        else:
+            values = (f"M{i}", f"new{i}@uni.edu", f"{word(rng)} {word(rng)}")
+        tracker.append(dict(zip(("student_id", "minerva_email", "full_name"), values), expected_grad_year=2027))
+    db.session.execute(db.insert(WSTracker), tracker)
+    db.session.commit()
+
+
+def nested_loop(rows, students):
+    """Compare each row with every student, as the ad-hoc scripts did."""
+    for email, full_name in rows:
+        key = name_key(full_name)
+        for student_email, student_key in students:
+            if email.casefold() == student_email or SequenceMatcher(None, key, student_key).ratio() >= FUZZY_THRESHOLD:
+                break
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--sample", type=int, default=100)
+    args = parser.parse_args()
+
+    app = create_app("testing", LOG_LEVEL="CRITICAL")
+    with app.app_context():
+        db.create_all()
+        rng = random.Random(0)
+        populate(args.students, args.rows, rng)
+
+        start = time.perf_counter()
+        result = reconcile(DEFAULT_TENANT_ID)
+        db.session.commit()
+        first = time.perf_counter() - start
+        methods = Counter(change["method"] for change in result["changes"])
+
+        start = time.perf_counter()
+        rerun = reconcile(DEFAULT_TENANT_ID)
+        db.session.commit()
+        second = time.perf_counter() - start
+
+        students = [(email, name_key(f"{first_name} {last_name}")) for email, first_name, last_name in
+                    db.session.execute(db.select(User.email, User.first_name, User.last_name)
+                                       .where(User.role == "Student"))]
+        sample = rng.sample(list(db.session.execute(db.select(WSTracker.minerva_email, WSTracker.full_name))),
+                            args.sample)
+        start = time.perf_counter()
+        nested_loop(sample, students)
+        naive = (time.perf_counter() - start) / args.sample * args.rows
+
+    print(f"{args.rows} tracker rows, {args.students} students")
+    print(f"  statuses: {result['statuses']}")
+    print(f"  matched by: {dict(methods)}")
+    print(f"  first run (writes {len(result['changes'])} rows): {first * 1000:9.0f} ms")
+    print(f"  rerun (writes {len(rerun['changes'])} rows):      {second * 1000:9.0f} ms")
+    print(f"  nested loop (extrapolated):     {naive * 1000:9.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark of the job board snapshot.
+
+Fills an in-memory database with synthetic jobs, then times a cold snapshot
+build (every file written), a rebuild after editing one job (only the files
+containing it rewritten) and a rebuild with nothing changed, and compares
+``GET /jobs`` served from the database and from the snapshot.
+
+Usage:
+    python -m backend.benchmarks.bench_snapshots [--rows 10000] [--requests 50]
+"""
+import argparse
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from werkzeug.security import generate_password_hash
+
+from backend import create_app, db
+from backend.models import Job, User
+from backend.snapshots import build_snapshot, snapshot_directory
+
+DEPARTMENTS = ["Library", "Admissions", "Research", "Events", "IT", "Outreach", "Finance", "Other"]
+LOCATIONS = ["SF", "Berlin", "Buenos Aires", "Seoul", "Hyderabad", "Taipei", "Remote"]
+
+
+def populate(rows, rng):
+    admin = User(username="admin", password=generate_password_hash("pw"), first_name="A",
+                 last_name="Admin", email="admin@example.com", role="admin")
+    db.session.add(admin)
+    db.session.flush()
+    db.session.add_all(
+        Job(employer_id=admin.id, title=f"Job {i}", department=rng.choice(DEPARTMENTS), manager_name="M",
+            manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1, max_students=3,
+            role_location=rng.choice(LOCATIONS), type_of_work="Admin", brief_description="Desk work " * 10,
+            application_deadline=f"20{rng.choice(['20', '30'])}-0{rng.randint(1, 9)}-15")
+        for i in range(rows)
+    )
+    db.session.commit()
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def measure(client, requests):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        client.get("/jobs?open_only=true")
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=50)
+    args = parser.parse_args()
+
+    app = create_app("testing")
+    root = tempfile.mkdtemp()
+    try:
+        with app.app_context():
+            db.create_all()
+            populate(args.rows, random.Random(0))
+            client = app.test_client()
+            client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+            database = measure(client, args.requests)
+
+            app.config["SNAPSHOT_DIR"] = root
+            directory = snapshot_directory(1)
+            manifest, cold = timed(lambda: build_snapshot(directory, 1))
+            db.session.execute(Job.__table__.update().where(Job.id == 1).values(title="Edited"))
+            db.session.expire_all()
+            _, one_changed = timed(lambda: build_snapshot(directory, 1))
+            _, unchanged = timed(lambda: build_snapshot(directory, 1))
+
+            client.get("/jobs")  # Loads the manifest
+            snapshot = measure(client, args.requests)
+
+            files = len(manifest["details"]) + 2 * (1 + len(manifest["departments"]) + len(manifest["locations"]))
+            print(f"{args.rows} jobs, {files} files")
+            print(f"  cold build:            {cold:8.1f} ms")
+            print(f"  rebuild, 1 job edited: {one_changed:8.1f} ms")
+            print(f"  rebuild, unchanged:    {unchanged:8.1f} ms")
+            print(f"GET /jobs?open_only=true from the database: {database:7.2f} ms")
+            print(f"GET /jobs?open_only=true from the snapshot: {snapshot:7.2f} ms")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Concurrency benchmark of the SQLite production mode.
+
+Runs applicant processes (each ``POST /apply`` by its own student) alongside
+reader processes (``GET /jobs?keyword=...``), like WSGI workers, against a
+file-backed SQLite database for a fixed time, with ``SQLITE_TUNING`` off and
+on, and reports sustained applies and reads per second and the requests that
+failed (e.g. "database is locked").
+
+Usage:
+    python -m backend.benchmarks.bench_sqlite [--writers 4] [--readers 8] [--seconds 10]
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import Counter
+
+from werkzeug.security import generate_password_hash
+
+from backend import create_app, db
+from backend.models import Job, User
+from backend.sqlite import writer_engine
+
+
+def populate(writers, readers, jobs):
+    users = [
+        User(username=f"user{i}", password=generate_password_hash("pw"), first_name="U", last_name=str(i),
+             email=f"user{i}@example.com", role="Student")
+        for i in range(writers + readers)
+    ]
+    db.session.add_all(users)
+    db.session.flush()
+    db.session.add_all(
+        Job(employer_id=users[0].id, title=f"Job {i}", department="Library", manager_name="M",
+            manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1, max_students=3,
+            role_location="SF", type_of_work="Admin", brief_description="Desk work", application_deadline="2030-01-01")
+        for i in range(jobs)
+    )
+    db.session.commit()
+    return [user.email for user in users]
+
+
+def worker(settings, email, kind, job_ids, seconds, results):
+    app = create_app("testing", **settings)
+    client = app.test_client()
+    client.post("/auth/login", json={"email": email, "password": "pw"})
+    counts = Counter()
+    deadline = time.perf_counter() + seconds
+    index = 0
+    while time.perf_counter() < deadline:
+        try:
+            if kind == "apply":
+                response = client.post("/apply", data={"jobId": job_ids[index % len(job_ids)],
+                                                       "emailAddress": "a@example.com",
+                                                       "yearOfGraduation": 2027, "candidateStatement": "Hi"})
+                ok = response.status_code in (201, 409)
+            else:
+                ok = client.get("/jobs?keyword=Job 1").status_code == 200
+        except Exception:
+            ok = False
+        counts[kind if ok else "error"] += 1
+        index += 1
+    results.put(counts)
+
+
+def run(tuning, args):
+    directory = tempfile.mkdtemp()
+    settings = {
+        "SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(directory, 'bench.db')}",
+        "SQLITE_TUNING": tuning,
+        "LOG_LEVEL": "CRITICAL",
+    }
+    try:
+        app = create_app("testing", **settings)
+        with app.app_context():
+            db.create_all()
+            emails = populate(args.writers, args.readers, args.jobs)
+            job_ids = list(db.session.execute(db.select(Job.id)).scalars())
+            for engine in {db.engine, writer_engine()}:
+                engine.dispose()
+
+        # One process per client, like WSGI workers, so the GIL doesn't serialize them
+        context = multiprocessing.get_context("fork")
+        results = context.Queue()
+        kinds = ["apply"] * args.writers + ["read"] * args.readers
+        processes = [
+            context.Process(target=worker, args=(settings, email, kind, job_ids, args.seconds, results))
+            for email, kind in zip(emails, kinds)
+        ]
+        for process in processes:
+            process.start()
+        counts = Counter()
+        for _ in processes:
+            counts.update(results.get())
+        for process in processes:
+            process.join()
+        return counts
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.writers} applicants, {args.readers} readers, {args.seconds:g} s each")
+    for name, tuning in (("default", False), ("tuned", True)):
+        counts = run(tuning, args)
+        print(f"{name:>8}: {counts['apply'] / args.seconds:7.1f} applies/s  "
+              f"{counts['read'] / args.seconds:7.1f} reads/s  {counts['error']:5d} failed")
+
+
+if __name__ == "__main__":
+    main()
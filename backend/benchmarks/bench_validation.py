@@ -0,0 +1,50 @@
+"""
+Benchmark of request body validation.
+
+Runs the compiled schemas of the busiest write endpoints over valid and
+invalid payloads and reports the overhead per request in microseconds.
+
+Usage:
+    python -m backend.benchmarks.bench_validation [--repeat 100000]
+"""
+import argparse
+import time
+
+from backend import schemas
+
+PAYLOADS = {
+    "JOB": (schemas.JOB, {
+        "positionTitle": "Library Assistant", "department": "Library", "managerName": "M",
+        "managerEmail": "m@example.com", "hiringSemester": ["Fall 2026", "Spring 2027"], "minStudents": "1",
+        "maxStudents": "3", "roleLocation": "SF", "typeOfWork": "Admin", "prerequisites": "",
+        "briefDescription": "Help at the front desk. " * 20, "applicationDeadline": "2030-01-01",
+    }),
+    "APPLICATION": (schemas.APPLICATION, {
+        "jobId": "12", "emailAddress": "student@example.com", "yearOfGraduation": "2027",
+        "candidateStatement": "I would love to work here. " * 40,
+    }),
+    "POSITION": (schemas.POSITION, {
+        "student_id": "S1", "minerva_email": "s@example.com", "full_name": "Sam Student",
+        "expected_grad_year": 2027, "ws_eligible": "Yes", "role": "Assistant", "notes": "",
+    }),
+    "POSITION (invalid)": (schemas.POSITION, {"student_id": "S1", "expected_grad_year": "soon"}),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=100_000)
+    args = parser.parse_args()
+
+    for name, (schema, payload) in PAYLOADS.items():
+        timings = []
+        for _ in range(5):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                schema(payload)
+            timings.append((time.perf_counter() - start) / args.repeat * 1e6)
+        print(f"{name:>20}: {min(timings):6.2f} µs per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark of the WS tracker grid API.
+
+Fills an in-memory database with synthetic tracker rows, then reports the
+median latency of ``GET /ws-position-tracker`` (every row, as the browser
+grid loads today) and of grid pages: the first and a deep page of the
+default sort, filtered and searched pages, and each total count mode.
+
+Usage:
+    python -m backend.benchmarks.bench_ws_grid [--rows 50000] [--repeat 20]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from werkzeug.security import generate_password_hash
+
+from backend import create_app, db
+from backend.models import User, WSTracker
+
+DEPARTMENTS = ["Library", "Admissions", "Student Life", "Registrar", "IT", "Dean's Office", None]
+STATUSES = ["Merged", "Pending", "Failed", None]
+WORDS = ["visa", "I-9", "returning", "late", "paycom", "transfer", "remote"]
+
+
+def populate(rows):
+    db.session.add(User(username="admin", password=generate_password_hash("pw"), first_name="Ad",
+                        last_name="Min", email="admin@example.com", role="admin"))
+    random.seed(0)
+    db.session.execute(db.insert(WSTracker), [
+        {
+            "student_id": f"S{i:06d}",
+            "minerva_email": f"student{i}@uni.edu",
+            "full_name": f"Student {random.randrange(rows)}",
+            "expected_grad_year": random.choice([2025, 2026, 2027, 2028]),
+            "ws_eligible": random.random() < 0.7,
+            "department_name": random.choice(DEPARTMENTS),
+            "contractor_status": random.choice(["Employee", "Contractor", None]),
+            "merge_status": random.choice(STATUSES),
+            "notes": " ".join(random.sample(WORDS, 2)) if random.random() < 0.3 else None,
+        }
+        for i in range(rows)
+    ])
+    db.session.commit()
+
+
+def median_ms(client, url, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.get_json()
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = create_app("testing", LOG_LEVEL="CRITICAL")
+    with app.app_context():
+        db.create_all()
+        populate(args.rows)
+        client = app.test_client()
+        client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+        # A cursor about 80% of the way through the default sort
+        after = None
+        for _ in range(8):
+            after = client.get(f"/ws-position-tracker/grid?limit=500&count=none"
+                               f"{'&after=' + after if after else ''}").get_json()["next"]
+        grid = "/ws-position-tracker/grid?"
+        cases = [
+            ("GET /ws-position-tracker (all rows)", "/ws-position-tracker", max(3, args.repeat // 5)),
+            ("grid, first page", grid, args.repeat),
+            ("grid, page after 4000 rows", f"{grid}after={after}", args.repeat),
+            ("grid, department + sort by year", f"{grid}department_name=Library&sort=-expected_grad_year,full_name",
+             args.repeat),
+            ("grid, status filter, NULLs sort", f"{grid}merge_status=Pending&merge_status=Failed&sort=department_name",
+             args.repeat),
+            ("grid, search", f"{grid}q=visa", args.repeat),
+            ("grid, count=exact", f"{grid}count=exact", args.repeat),
+            ("grid, count=estimated", f"{grid}count=estimated", args.repeat),
+            ("grid, count=none", f"{grid}count=none", args.repeat),
+        ]
+        print(f"{args.rows} tracker rows, median of {args.repeat} requests")
+        for name, url, repeat in cases:
+            print(f"  {name:<36} {median_ms(client, url, repeat):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Job capacity: no job accepts more applications than its ``max_students``.
+
+``Job.accepted_count`` counts each job's accepted applications. It only
+changes through conditional ``UPDATE`` statements in the same transaction as
+the status change, e.g. to take a seat::
+
+    UPDATE job SET accepted_count = accepted_count + 1
+    WHERE id = :job_id AND accepted_count + 1 <= max_students
+
+The database checks and increments in one statement under the row's write
+lock, so concurrent acceptances can't overfill a job, in one worker or many,
+and a transaction holds the lock only until it commits (no count-then-update
+under a table lock). Status changes are conditional as well
+(``WHERE status != 'accepted'``), so accepting an application twice takes one
+seat, and un-accepting it twice gives one back.
+
+Applications are always updated before their job, so concurrent
+transactions take the row locks in the same order.
+"""
+from sqlalchemy import case, delete, or_, update
+
+from . import db
+from .audit import record_deletes, record_updates
+from .models import Application, Job
+
+ACCEPTED = "accepted"
+
+# Loaded instances are synchronized with what the database actually matched
+FETCH = {"synchronize_session": "fetch"}
+
+
+def _not_accepted():
+    return or_(Application.status.is_(None), Application.status != ACCEPTED)
+
+
+def reserve(job_id, seats=1):
+    """
+    Take seats on a job if it has that many left.
+
+    Args:
+        job_id (int): The job.
+        seats (int): The number of seats.
+
+    Returns:
+        bool: Whether the seats were taken.
+    """
+    result = db.session.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.accepted_count + seats <= Job.max_students)
+        # The counter isn't served, so taking a seat isn't a change for delta syncs
+        .values(accepted_count=Job.accepted_count + seats, updated_at=Job.updated_at),
+        execution_options=FETCH,
+    )
+    return result.rowcount == 1
+
+
+def release(job_id, seats=1):
+    """
+    Give seats on a job back.
+
+    Args:
+        job_id (int): The job.
+        seats (int): The number of seats.
+    """
+    db.session.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(
+            accepted_count=case((Job.accepted_count > seats, Job.accepted_count - seats), else_=0),
+            updated_at=Job.updated_at,
+        ),
+        execution_options=FETCH,
+    )
+
+
+def resize(job, max_students):
+    """
+    Change a job's ``max_students``, unless it has already accepted more applications.
+
+    The check and the change are one conditional ``UPDATE``, so a concurrent
+    acceptance can't slip in between. Doesn't commit.
+
+    Args:
+        job (Job): The job.
+        max_students (int): The new number of seats.
+
+    Returns:
+        bool: Whether the job was resized.
+    """
+    previous = job.max_students
+    if max_students == previous:
+        return True
+    result = db.session.execute(
+        update(Job).where(Job.id == job.id, Job.accepted_count <= max_students).values(max_students=max_students),
+        execution_options=FETCH,
+    )
+    if result.rowcount != 1:
+        return False
+    # Core updates bypass the audit listener
+    record_updates("job", [(job.id, job.tenant_id, {"max_students": [previous, max_students]})])
+    return True
+
+
+def set_status(application, status):
+    """
+    Change the status of an application, taking or giving back its seat.
+
+    Doesn't commit. When the job is full nothing is reserved, but the caller
+    must roll the transaction back, which undoes the status change.
+
+    Args:
+        application (Application): The application.
+        status (str): The new status.
+
+    Returns:
+        bool: False if the application was being accepted and its job is full.
+    """
+    if status == ACCEPTED:
+        accepted = db.session.execute(
+            update(Application).where(Application.id == application.id, _not_accepted()).values(status=status),
+            execution_options=FETCH,
+        ).rowcount
+        return not accepted or reserve(application.job_id)
+
+    unaccepted = db.session.execute(
+        update(Application).where(Application.id == application.id, Application.status == ACCEPTED)
+        .values(status=status),
+        execution_options=FETCH,
+    ).rowcount
+    if unaccepted:
+        release(application.job_id)
+    else:
+        db.session.execute(
+            update(Application).where(Application.id == application.id).values(status=status),
+            execution_options=FETCH,
+        )
+    return True
+
+
+def delete_application(application):
+    """
+    Delete an application, giving its seat back if it was accepted.
+
+    Doesn't commit.
+
+    Args:
+        application (Application): The application.
+    """
+    logged = [(application.id, application.tenant_id, application.to_dict())]
+    deleted = db.session.execute(
+        delete(Application).where(Application.id == application.id, Application.status == ACCEPTED),
+        execution_options=FETCH,
+    ).rowcount
+    if deleted:
+        release(application.job_id)
+    else:
+        deleted = db.session.execute(
+            delete(Application).where(Application.id == application.id), execution_options=FETCH
+        ).rowcount
+    if deleted:
+        # Core deletes bypass the audit listener
+        record_deletes("application", logged)
+
+
+def accept_in_bulk(application_ids):
+    """
+    Accept pending applications, all of a job's or none.
+
+    A job without enough seats left for all of its applications (e.g. after
+    concurrent acceptances) accepts none of them, and they stay pending.
+    Doesn't commit.
+
+    Args:
+        application_ids (list): The applications.
+
+    Returns:
+        list: The IDs of the applications accepted.
+    """
+    pending = or_(Application.status == "pending", Application.status.is_(None))
+    rows = db.session.execute(
+        update(Application)
+        .where(Application.id.in_(application_ids), pending)
+        .values(status=ACCEPTED)
+        .returning(Application.id, Application.job_id),
+        execution_options={"synchronize_session": False},
+    ).all()
+    by_job = {}
+    for application_id, job_id in rows:
+        by_job.setdefault(job_id, []).append(application_id)
+
+    accepted = []
+    for job_id, ids in by_job.items():
+        if reserve(job_id, len(ids)):
+            accepted += ids
+        else:
+            # Our own uncommitted rows, still locked by this transaction
+            db.session.execute(
+                update(Application).where(Application.id.in_(ids)).values(status="pending"),
+                execution_options={"synchronize_session": False},
+            )
+    return accepted
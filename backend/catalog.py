@@ -0,0 +1,201 @@
+"""
+In-process, read-only catalog of the teams and jobs.
+
+Both tables are small and read on nearly every page, so each tenant's rows
+are kept in memory as ``__slots__`` records: no per-instance ``__dict__``, no
+identity map or instance state. The records render exactly like the models'
+``to_dict()``.
+
+Every write to these tables leaves a change log entry (``backend.audit``) or
+a tombstone (``backend.sync``), so the catalog checks their newest IDs once
+per lookup, a single primary-key query, and reloads only the rows changed
+since. IDs are allocated before their transaction commits, so the same query
+also checks the recent IDs that were missing when the catalog last read the
+logs (see ``audit.missing_ids``). A write is therefore visible from the next
+request on, in every process.
+"""
+import threading
+
+from flask import current_app
+from sqlalchemy import bindparam, func, select
+
+from . import db
+from .audit import missing_ids
+from .models import ChangeLog, Job, Team, Tombstone
+from .tenancy import TenantNamespaces, tenant_default
+
+# Above this many changed rows a refresh reloads the whole tenant
+RELOAD_THRESHOLD = 500
+
+# Built once: the newest log IDs, and how many of the missing IDs have committed since
+_VERSION = select(
+    select(func.coalesce(func.max(ChangeLog.id), 0)).scalar_subquery(),
+    select(func.count(ChangeLog.id)).where(ChangeLog.id.in_(bindparam("log_gaps", expanding=True))).scalar_subquery(),
+    select(func.coalesce(func.max(Tombstone.id), 0)).scalar_subquery(),
+    select(func.count(Tombstone.id)).where(Tombstone.id.in_(bindparam("tombstone_gaps", expanding=True)))
+    .scalar_subquery(),
+).execution_options(all_tenants=True)
+
+
+class Record:
+    """
+    A read-only row, with one slot per column.
+
+    Args:
+        row (Row): The column values, in ``__slots__`` order.
+    """
+    __slots__ = ()
+
+    def __init__(self, row):
+        for name, value in zip(self.__slots__, row):
+            setattr(self, name, value)
+
+    @classmethod
+    def columns(cls):
+        return [getattr(cls.model, name) for name in cls.__slots__]
+
+
+class TeamRecord(Record):
+    __slots__ = ("id", "name", "manager", "email", "max_students", "contact", "priority", "recruiting_for")
+    model = Team
+    to_dict = Team.to_dict
+
+
+class JobRecord(Record):
+    __slots__ = (
+        "id", "employer_id", "title", "department", "manager_name", "manager_email", "hiring_semesters",
+        "min_students", "max_students", "role_location", "type_of_work", "prerequisites", "brief_description",
+        "more_details", "application_deadline",
+    )
+    model = Job
+    to_dict = Job.to_dict
+
+
+class Catalog:
+    """
+    One tenant's teams and (live) jobs, by ID.
+    """
+    RECORDS = {"team": TeamRecord, "job": JobRecord}
+
+    def __init__(self):
+        self.rows = {table: {} for table in self.RECORDS}
+        self.version = None
+        # The log IDs behind the version that may still commit
+        self.gaps = {ChangeLog: set(), Tombstone: set()}
+        self._ordered = {}
+        self._lock = threading.Lock()
+
+    def teams(self):
+        """
+        Return the teams, ordered by ID.
+        """
+        ordered = self._ordered.get("team")
+        if ordered is None:
+            ordered = self._ordered["team"] = sorted(self.rows["team"].values(), key=lambda team: team.id)
+        return ordered
+
+    def job(self, job_id):
+        """
+        Return a live job, or None if there is no such job.
+        """
+        return self.rows["job"].get(job_id)
+
+    def jobs(self):
+        """
+        Return the live jobs, by ID.
+
+        The dict is replaced rather than changed when jobs are written, and
+        unchanged jobs keep their records, so callers can tell what changed.
+        """
+        return self.rows["job"]
+
+    def refresh(self, tenant_id):
+        """
+        Bring the catalog up to date with the database.
+
+        Args:
+            tenant_id (int): The catalog's tenant.
+        """
+        if self._newer() is None:
+            return
+        with self._lock:
+            version = self._newer()
+            if version is None:
+                return
+            if self.version is None:
+                changed = None
+                for model, until in zip((ChangeLog, Tombstone), version):
+                    self.gaps[model] = missing_ids(model, 0, (), until)
+            else:
+                changed = self._changed(tenant_id, version)
+            if changed is None or sum(map(len, changed.values())) > RELOAD_THRESHOLD:
+                for table, record in self.RECORDS.items():
+                    self.rows[table] = self._load(record, tenant_id)
+                self._ordered.clear()
+            else:
+                for table, row_ids in changed.items():
+                    if not row_ids:
+                        continue
+                    # Swapped in whole, so concurrent readers never see a row missing
+                    rows = {row_id: row for row_id, row in self.rows[table].items() if row_id not in row_ids}
+                    rows.update(self._load(self.RECORDS[table], tenant_id, row_ids))
+                    self.rows[table] = rows
+                    self._ordered.pop(table, None)
+            self.version = version
+
+    def _newer(self):
+        # The newest log IDs, or None if they and the missing IDs are as the catalog last saw them
+        newest_log, late_logs, newest_tombstone, late_tombstones = db.session.execute(
+            _VERSION, {"log_gaps": list(self.gaps[ChangeLog]), "tombstone_gaps": list(self.gaps[Tombstone])}
+        ).one()
+        version = (newest_log, newest_tombstone)
+        if version == self.version and not late_logs and not late_tombstones:
+            return None
+        return version
+
+    def _changed(self, tenant_id, version):
+        # The IDs of the rows written or deleted since the catalog's version,
+        # or behind it by transactions that committed late
+        changed = {table: set() for table in self.RECORDS}
+        for model, since, until in ((ChangeLog, self.version[0], version[0]), (Tombstone, self.version[1], version[1])):
+            gaps = self.gaps[model]
+            if since == until and not gaps:
+                continue
+            missing = missing_ids(model, since, gaps, until)
+            rows = db.session.execute(
+                select(model.table_name, model.row_id)
+                .where((model.id > since) | model.id.in_(gaps), model.id <= until, model.tenant_id == tenant_id,
+                       model.table_name.in_(self.RECORDS))
+                .execution_options(all_tenants=True)
+            )
+            for table, row_id in rows:
+                changed[table].add(row_id)
+            self.gaps[model] = missing
+        return changed
+
+    def _load(self, record, tenant_id, row_ids=None):
+        statement = select(*record.columns()).where(record.model.tenant_id == tenant_id)
+        if row_ids is not None:
+            statement = statement.where(record.model.id.in_(row_ids))
+        rows = db.session.execute(statement.execution_options(all_tenants=True))
+        return {row[0]: record(row) for row in rows}
+
+
+def get_catalog():
+    """
+    Return the current tenant's catalog, refreshed.
+    """
+    tenant_id = tenant_default()
+    catalog = current_app.extensions["catalog"].get(tenant_id)
+    catalog.refresh(tenant_id)
+    return catalog
+
+
+def init_app(app):
+    """
+    Attach the catalogs to the application, one per tenant.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    app.extensions["catalog"] = TenantNamespaces(Catalog)
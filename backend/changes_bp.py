@@ -0,0 +1,39 @@
+from flask import Blueprint, request, jsonify
+from .audit import CursorError, read_changes
+from .rbac import requires
+
+changes_bp = Blueprint("changes", __name__)
+
+MAX_LIMIT = 1000
+
+
+@changes_bp.route("/changes", methods=["GET"])
+@requires("changes:read")
+def get_changes():
+    """
+    Page through the change log for incremental syncs.
+
+    Query parameters:
+        since (str): The cursor returned by the previous call (0 to start from the beginning).
+        limit (int): The maximum number of changes to return, at most 1000.
+        table (str): Only return changes to this table, e.g. "ws_tracker".
+
+    Changes are not always committed in ID order, so the cursor also lists
+    the recent IDs still missing, and a later call returns them if they
+    commit. Treat it as opaque and always pass the latest one.
+
+    Returns:
+        JSON response containing the changes, oldest first, and the cursor to
+        pass as ``since`` next time, or 400 for a malformed cursor or a limit below 1.
+    """
+    limit = min(request.args.get("limit", 100, type=int), MAX_LIMIT)
+    if limit < 1:
+        return jsonify({"message": "limit must be at least 1"}), 400
+    try:
+        changes, cursor = read_changes(request.args.get("since", "0"), limit, request.args.get("table"))
+    except CursorError as error:
+        return jsonify({"message": str(error)}), 400
+    return jsonify({
+        "changes": [change.to_dict() for change in changes],
+        "next": cursor,
+    }), 200
@@ -0,0 +1,83 @@
+import re
+from datetime import datetime, time
+
+from flask import current_app, has_app_context
+
+# Formats seen in submitted deadlines, tried in order
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%d %b %Y",
+    "%d %B %Y",
+    "%b %d %Y",
+    "%B %d %Y",
+    "%m/%d/%Y",
+)
+DATETIME_FORMATS = (
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M",
+)
+
+
+def parse_deadline(value):
+    """
+    Parse a free-form application deadline.
+
+    Accepts ISO dates and datetimes, "06 Sept 2024", "September 6, 2024" and
+    US-style "12/31/2024". A bare date means the end of that day.
+
+    Args:
+        value (str): The deadline as submitted.
+
+    Returns:
+        datetime | None: The (naive) deadline, or None if it can't be parsed.
+    """
+    if not value:
+        return None
+    text = " ".join(value.replace(",", " ").split())
+    # "Sept" is a common abbreviation strptime doesn't know
+    text = re.sub(r"\bSept\b", "Sep", text, flags=re.I)
+    if text.endswith("Z"):
+        text = text[:-1]
+
+    for date_format in DATETIME_FORMATS:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.combine(datetime.strptime(text, date_format).date(), time.max.replace(microsecond=0))
+        except ValueError:
+            continue
+    return None
+
+
+def term_for(moment):
+    """
+    Return the academic term a moment falls in.
+
+    Args:
+        moment (datetime | date): The moment.
+
+    Returns:
+        str: "Spring <year>" for January-June, "Fall <year>" for July-December.
+    """
+    return f"{'Spring' if moment.month <= 6 else 'Fall'} {moment.year}"
+
+
+def current_term():
+    """
+    Return the current academic term.
+
+    The ``CURRENT_TERM`` setting, when set, overrides the calendar (e.g. to keep
+    accepting applications for a term that has technically ended).
+
+    Returns:
+        str: The term name, e.g. "Fall 2026".
+    """
+    if has_app_context() and current_app.config.get("CURRENT_TERM"):
+        return current_app.config["CURRENT_TERM"]
+    return term_for(datetime.now())
@@ -0,0 +1,144 @@
+import gzip
+import zlib
+
+from flask import current_app, jsonify, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+COLUMNAR_MIMETYPE = "application/vnd.workstudy.columnar+json"
+
+# Responses of these types are compressed (plus any "+json" type)
+COMPRESSIBLE = {
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/csv",
+    "text/html",
+    "text/plain",
+}
+
+
+def jsonify_rows(rows):
+    """
+    Serialize a list of records, as columns if the client asked for them.
+
+    Clients sending ``Accept: application/vnd.workstudy.columnar+json`` get
+    ``{"columns": [...], "rows": [[...], ...]}``: field names once, then one
+    array of values per record (``null`` where a record lacks a field).
+    Everyone else gets the usual list of objects.
+
+    Args:
+        rows (list): The records, as dictionaries.
+
+    Returns:
+        Response: The JSON response.
+    """
+    if request.accept_mimetypes.best_match(["application/json", COLUMNAR_MIMETYPE]) != COLUMNAR_MIMETYPE:
+        return jsonify(rows)
+
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key)
+    columns = list(columns)
+    response = jsonify({"columns": columns, "rows": [[row.get(column) for column in columns] for row in rows]})
+    response.mimetype = COLUMNAR_MIMETYPE
+    return response
+
+
+def _compressible(response):
+    mimetype = response.mimetype or ""
+    return mimetype in COMPRESSIBLE or mimetype.endswith("+json")
+
+
+def _negotiate():
+    offered = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(offered)
+
+
+def _compressor(encoding, config):
+    """
+    Return the ``(compress, flush, finish)`` callables of a streaming compressor.
+    """
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=config["COMPRESS_BROTLI_QUALITY"])
+        return compressor.process, compressor.flush, compressor.finish
+    # wbits=31 writes a gzip header and trailer
+    compressor = zlib.compressobj(config["COMPRESS_LEVEL"], zlib.DEFLATED, 31)
+    return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+
+def _compress_stream(chunks, encoding, config):
+    compress, flush, finish = _compressor(encoding, config)
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode()
+            # Flush per chunk so streamed responses keep arriving incrementally
+            yield compress(chunk) + flush()
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def compress_response(response):
+    """
+    Compress a response for clients that accept it (an ``after_request`` hook).
+
+    Brotli is preferred when the ``brotli`` package is installed, gzip
+    otherwise. Buffered responses smaller than ``COMPRESS_MIN_SIZE`` bytes are
+    left alone; streamed responses are compressed chunk by chunk, except
+    server-sent event streams, which proxies and browsers expect unencoded.
+
+    Args:
+        response (Response): The outgoing response.
+
+    Returns:
+        Response: The (possibly) compressed response.
+    """
+    config = current_app.config
+    if (
+        not config["COMPRESS_ENABLED"]
+        or request.method == "HEAD"
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or not _compressible(response)
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = _negotiate()
+    if encoding is None:
+        return response
+
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, encoding, config)
+        response.headers.pop("Content-Length", None)
+    else:
+        data = response.get_data()
+        if len(data) < config["COMPRESS_MIN_SIZE"]:
+            return response
+        if encoding == "br":
+            data = brotli.compress(data, quality=config["COMPRESS_BROTLI_QUALITY"])
+        else:
+            data = gzip.compress(data, config["COMPRESS_LEVEL"], mtime=0)
+        response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def init_app(app):
+    """
+    Register response compression.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    app.after_request(compress_response)
@@ -0,0 +1,196 @@
+import itertools
+import json
+from abc import ABC, abstractmethod
+import queue
+import threading
+from collections import deque
+
+from flask import current_app
+from werkzeug.utils import import_string
+
+from .tenancy import tenant_default
+
+
+def jobs_channel(tenant_id):
+    """
+    Return the name of a tenant's public job channel.
+
+    Args:
+        tenant_id (int): The ID of the tenant.
+
+    Returns:
+        str: The channel name.
+    """
+    return f"jobs:{tenant_id}"
+
+
+def user_channel(user_id):
+    """
+    Return the name of a user's private channel.
+
+    Args:
+        user_id (int): The ID of the user.
+
+    Returns:
+        str: The channel name.
+    """
+    return f"user:{user_id}"
+
+
+class Subscription:
+    """
+    A consumer's view of a set of channels, backed by a bounded queue.
+    """
+
+    def __init__(self, broker, channels, maxsize):
+        self.broker = broker
+        self.channels = frozenset(channels)
+        self.queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+
+    def deliver(self, event):
+        # Publishers may deliver concurrently (e.g. from on_commit callbacks),
+        # so only one at a time can drop an event to make room
+        with self._lock:
+            try:
+                self.queue.put_nowait(event)
+            except queue.Full:
+                # Slow consumer: drop the oldest event rather than block publishers
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self.queue.put_nowait(event)
+
+    def get(self, timeout):
+        """
+        Wait for the next event.
+
+        Args:
+            timeout (float): Seconds to wait.
+
+        Returns:
+            dict | None: The event, or None on timeout.
+        """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class Broker(ABC):
+    """
+    Interface of the pub/sub backend behind ``/events``.
+
+    The default ``InMemoryBroker`` only fans out within one process. Deployments
+    running several workers can set ``EVENT_BROKER`` to the import path of a
+    class implementing ``publish``/``subscribe``/``unsubscribe`` on top of a
+    shared transport (e.g. Redis pub/sub or Postgres LISTEN/NOTIFY).
+    """
+
+    @abstractmethod
+    def publish(self, channel, event):
+        """Deliver an event to a channel's subscribers and return its id."""
+
+    @abstractmethod
+    def subscribe(self, channels, last_event_id=None):
+        """Return a ``Subscription`` to the channels, replaying events after ``last_event_id``."""
+
+    @abstractmethod
+    def unsubscribe(self, subscription):
+        """Stop delivering events to a subscription."""
+
+
+class InMemoryBroker(Broker):
+    """
+    In-process fan-out with a short replay buffer for reconnecting clients.
+    """
+
+    def __init__(self, queue_size=100, replay_size=256):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._subscribers = {}  # channel -> set of subscriptions
+        self._history = deque(maxlen=replay_size)
+        self._queue_size = queue_size
+
+    def publish(self, channel, event):
+        with self._lock:
+            event = dict(event, id=next(self._ids))
+            self._history.append((channel, event))
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.deliver(event)
+        return event["id"]
+
+    def subscribe(self, channels, last_event_id=None):
+        subscription = Subscription(self, channels, self._queue_size)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+            if last_event_id is not None:
+                for channel, event in self._history:
+                    if event["id"] > last_event_id and channel in subscription.channels:
+                        subscription.deliver(event)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+
+def init_app(app):
+    """
+    Attach the configured event broker to the application.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    broker = app.config.get("EVENT_BROKER", InMemoryBroker)
+    if isinstance(broker, str):
+        broker = import_string(broker)
+    app.extensions["event_broker"] = broker()
+
+
+def get_broker():
+    return current_app.extensions["event_broker"]
+
+
+def publish(event_type, data, user_ids=(), broadcast=False):
+    """
+    Publish an event to the given users and/or every connected client.
+
+    Call after the change has been committed.
+
+    Args:
+        event_type (str): e.g. "application.updated".
+        data (dict): The JSON-serializable payload.
+        user_ids (iterable): Users whose private channel receives the event.
+        broadcast (bool): Also publish on the current tenant's public jobs channel.
+    """
+    broker = get_broker()
+    event = {"type": event_type, "data": data}
+    for user_id in {user_id for user_id in user_ids if user_id is not None}:
+        broker.publish(user_channel(user_id), event)
+    if broadcast:
+        broker.publish(jobs_channel(tenant_default()), event)
+
+
+def format_sse(event):
+    """
+    Encode an event in the text/event-stream wire format.
+
+    Args:
+        event (dict): The event.
+
+    Returns:
+        str: The SSE frame.
+    """
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
@@ -0,0 +1,42 @@
+from flask import Blueprint, Response, current_app, request
+from flask_login import current_user, login_required
+from .events import format_sse, get_broker, jobs_channel, user_channel
+
+events_bp = Blueprint("events", __name__)
+
+
+@events_bp.route("/events", methods=["GET"])
+@login_required
+def stream_events():
+    """
+    Stream application and job changes to the current user as server-sent events.
+
+    The stream carries the user's private events (status changes and withdrawals
+    of their applications, or of applications to their jobs) and public job
+    create/update/delete events. Clients reconnecting with ``Last-Event-ID``
+    receive the recent events they missed.
+
+    Returns:
+        A text/event-stream response.
+    """
+    keepalive = current_app.config.get("EVENTS_KEEPALIVE", 15)
+    last_event_id = request.headers.get("Last-Event-ID", type=int)
+    # Subscribe now rather than inside the generator so no event published
+    # after this request is accepted can be missed
+    channels = [user_channel(current_user.id), jobs_channel(current_user.tenant_id)]
+    subscription = get_broker().subscribe(channels, last_event_id)
+
+    def stream():
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                event = subscription.get(keepalive)
+                yield format_sse(event) if event else ": keepalive\n\n"
+        finally:
+            subscription.close()
+
+    return Response(
+        stream(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,232 @@
+"""
+Server-side sorting, filtering, search and keyset pagination for spreadsheet-like grids.
+
+A ``Grid`` lists the columns of a model that can be sorted, filtered and
+searched, and turns the query string of a request into one page of rows:
+
+- ``sort``: comma-separated columns, ``-`` for descending, e.g.
+  ``-expected_grad_year,full_name``. The primary key is always the last sort
+  key, so the order is total and pages never overlap or skip rows. NULLs come
+  last ascending and first descending, as on PostgreSQL.
+- one parameter per filterable column, repeated for "any of", e.g.
+  ``?merge_status=Pending&merge_status=Failed``.
+- ``q``: words that must each appear in one of the searchable columns.
+- ``limit`` and ``after``: the page size and the cursor returned as ``next``
+  by the previous page. A page seeks past the cursor's sort key instead of
+  skipping ``OFFSET`` rows, so the last page costs as little as the first.
+- ``count``: ``estimated`` (default), ``exact`` or ``none``. An estimated
+  total counts at most ``GRID_COUNT_CAP`` rows; larger totals come from the
+  query planner on PostgreSQL and are reported as the cap elsewhere, flagged
+  ``"estimated": true`` either way.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import and_, false, func, inspect, or_, select, tuple_
+
+from . import db
+from .schemas import CONVERTERS, Invalid
+from .tenancy import TenantScoped, current_tenant_id
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+COUNT_MODES = ("estimated", "exact", "none")
+
+
+class GridError(ValueError):
+    """Raised for query strings a grid can't serve, with the message reported to the client."""
+
+
+def _nullable(column):
+    return column.expression.nullable
+
+
+def _dump(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class Grid:
+    """
+    The sortable, filterable and searchable columns of a model.
+
+    Args:
+        model (type): The model class.
+        sortable (list): Names of the columns rows can be sorted by.
+        filters (list): Names of the columns rows can be filtered on.
+        searchable (list): Names of the columns ``q`` searches.
+        default_sort (str): The ``sort`` used when the request has none.
+    """
+
+    def __init__(self, model, sortable, filters, searchable, default_sort):
+        self.model = model
+        self.key = getattr(model, inspect(model).primary_key[0].key)
+        self.sortable = {name: getattr(model, name) for name in sortable}
+        self.filters = {name: getattr(model, name) for name in filters}
+        self.searchable = [getattr(model, name) for name in searchable]
+        self.default_sort = default_sort
+
+    def _sort(self, value):
+        keys = []
+        for name in value.split(","):
+            name = name.strip()
+            descending = name.startswith("-")
+            column = self.sortable.get(name.lstrip("-"))
+            if column is None:
+                raise GridError(f"Cannot sort by {name.lstrip('-')!r}")
+            keys.append((column, descending))
+        keys.append((self.key, False))
+        return keys
+
+    def _criteria(self, args):
+        criteria = []
+        for name, column in self.filters.items():
+            values = args.getlist(name)
+            if not values:
+                continue
+            try:
+                values = [CONVERTERS[column.type.python_type](value) for value in values]
+            except Invalid as error:
+                raise GridError(f"{name} {error}") from None
+            criteria.append(column.in_(values))
+        for word in args.get("q", "").split():
+            criteria.append(or_(*(column.icontains(word, autoescape=True) for column in self.searchable)))
+        return criteria
+
+    def _decode(self, cursor, sort, keys):
+        try:
+            cursor_sort, values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except (binascii.Error, ValueError, TypeError):
+            raise GridError("Invalid cursor") from None
+        if cursor_sort != sort or not isinstance(values, list) or len(values) != len(keys):
+            raise GridError("The cursor belongs to a different sort")
+        decoded = []
+        for (column, _), value in zip(keys, values):
+            python_type = column.type.python_type
+            if value is not None and python_type is datetime:
+                try:
+                    value = datetime.fromisoformat(value)
+                except (TypeError, ValueError):
+                    raise GridError("Invalid cursor") from None
+            elif value is not None and not isinstance(value, python_type):
+                raise GridError("Invalid cursor")
+            decoded.append(value)
+        return decoded
+
+    @staticmethod
+    def _encode(sort, keys, row):
+        values = [_dump(getattr(row, column.key)) for column, _ in keys]
+        return base64.urlsafe_b64encode(json.dumps([sort, values]).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _after(keys, values):
+        """
+        The rows after the cursor's sort key.
+
+        Keys all in one direction and never NULL compare as one row value, which
+        the database can seek an index with; otherwise each key is compared in
+        turn: ``a > :a OR (a = :a AND (b > :b OR ...))``.
+        """
+        nullable = any(_nullable(column) for column, _ in keys)
+        if not nullable and len({descending for _, descending in keys}) == 1:
+            columns = tuple_(*(column for column, _ in keys))
+            return columns < tuple_(*values) if keys[0][1] else columns > tuple_(*values)
+
+        predicate = false()
+        for (column, descending), value in reversed(list(zip(keys, values))):
+            if value is None:
+                # NULLs come last ascending, first descending
+                later = false() if not descending else column.is_not(None)
+                equal = column.is_(None)
+            else:
+                later = column < value if descending else column > value
+                if _nullable(column) and not descending:
+                    later = or_(later, column.is_(None))
+                equal = column == value
+            predicate = or_(later, and_(equal, predicate))
+        return predicate
+
+    def page(self, args):
+        """
+        Return the page of rows a grid request asks for.
+
+        Args:
+            args (MultiDict): The request's query string.
+
+        Returns:
+            dict: ``rows`` (model instances), ``next`` (the cursor of the next
+            page, or None on the last), ``total`` (None with ``count=none``) and
+            ``estimated`` (whether ``total`` is an estimate).
+
+        Raises:
+            GridError: If the query string is invalid.
+        """
+        sort = args.get("sort") or self.default_sort
+        keys = self._sort(sort)
+        criteria = self._criteria(args)
+        limit = args.get("limit", DEFAULT_LIMIT, type=int)
+        if not 1 <= limit <= MAX_LIMIT:
+            raise GridError(f"limit must be between 1 and {MAX_LIMIT}")
+        count = args.get("count", "estimated")
+        if count not in COUNT_MODES:
+            raise GridError(f"count must be one of {', '.join(COUNT_MODES)}")
+
+        statement = select(self.model).where(*criteria)
+        if args.get("after"):
+            statement = statement.where(self._after(keys, self._decode(args["after"], sort, keys)))
+        order = []
+        for column, descending in keys:
+            if _nullable(column):
+                order.append(column.desc().nulls_first() if descending else column.asc().nulls_last())
+            else:
+                order.append(column.desc() if descending else column.asc())
+        rows = db.session.execute(statement.order_by(*order).limit(limit + 1)).scalars().all()
+
+        more = len(rows) > limit
+        rows = rows[:limit]
+        total, estimated = self.count(criteria, count)
+        return {
+            "rows": rows,
+            "next": self._encode(sort, keys, rows[-1]) if more else None,
+            "total": total,
+            "estimated": estimated,
+        }
+
+    def count(self, criteria, mode):
+        """
+        Count the rows matching the filters.
+
+        Args:
+            criteria (list): The filter and search conditions.
+            mode (str): "exact", "estimated" or "none".
+
+        Returns:
+            tuple: The total (None for "none") and whether it is an estimate.
+        """
+        if mode == "none":
+            return None, False
+        if mode == "exact":
+            return db.session.scalar(select(func.count(self.key)).select_from(self.model).where(*criteria)), False
+
+        cap = current_app.config["GRID_COUNT_CAP"]
+        capped = select(self.key).select_from(self.model).where(*criteria).limit(cap).subquery()
+        total = db.session.scalar(select(func.count()).select_from(capped))
+        if total < cap:
+            return total, False
+        if db.session.get_bind().dialect.name == "postgresql":
+            total = max(total, self._planned_rows(criteria))
+        return total, True
+
+    def _planned_rows(self, criteria):
+        statement = select(self.key).select_from(self.model).where(*criteria)
+        if issubclass(self.model, TenantScoped):
+            # Compiled by hand, so the session's tenant scoping doesn't apply
+            statement = statement.where(self.model.tenant_id == current_tenant_id())
+        connection = db.session.connection()
+        compiled = statement.compile(dialect=connection.dialect)
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
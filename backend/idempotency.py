@@ -0,0 +1,145 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+from operator import itemgetter
+
+from flask import Response, current_app, jsonify, make_response, request
+from flask_login import current_user
+
+HEADER = "Idempotency-Key"
+
+# Bodies compared by their fields rather than their bytes
+FORM_MIMETYPES = {"multipart/form-data", "application/x-www-form-urlencoded"}
+
+
+class IdempotencyStore:
+    """
+    Short-lived in-memory store of responses keyed by ``Idempotency-Key``.
+
+    Keys are scoped per user and expire after ``ttl`` seconds. A key whose
+    request is still running is reserved, so a concurrent retry is told to
+    back off instead of performing the write twice.
+    """
+
+    def __init__(self, ttl=3600):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}  # (scope, key) -> (expires_at, fingerprint, response or None)
+
+    def _prune(self, now):
+        expired = [key for key, (expires_at, _, _) in self._entries.items() if expires_at <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def reserve(self, key, fingerprint):
+        """
+        Claim a key for a new request.
+
+        Returns:
+            tuple: ``(reserved, fingerprint, response)``. ``reserved`` is True if
+            the caller should run the request; otherwise the stored fingerprint
+            and response (None while the first request is in flight) are returned.
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._prune(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                return False, entry[1], entry[2]
+            self._entries[key] = (now + self.ttl, fingerprint, None)
+            return True, fingerprint, None
+
+    def complete(self, key, fingerprint, response):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, fingerprint, response)
+
+    def release(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+def _file_digest(file):
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.stream.read(1 << 16), b""):
+        digest.update(chunk)
+    # Leave the upload readable for the view
+    file.stream.seek(0)
+    return digest.hexdigest()
+
+
+def _fingerprint():
+    """
+    Hash what a request asks for: its method, path and payload.
+
+    Form bodies are hashed by their fields and the contents of their files,
+    since a retried multipart upload is encoded with a new boundary.
+    """
+    parts = [request.method, request.path]
+    body = b""
+    if request.mimetype in FORM_MIMETYPES:
+        # Sorting by name only keeps the order of a repeated field's values
+        parts += [f"{name}={value}" for name, value in sorted(request.form.items(multi=True), key=itemgetter(0))]
+        parts += [
+            f"{name}:{file.filename}:{_file_digest(file)}"
+            for name, file in sorted(request.files.items(multi=True), key=itemgetter(0))
+        ]
+    else:
+        body = request.get_data()
+    return hashlib.sha256(b"\0".join([*(part.encode() for part in parts), body])).hexdigest()
+
+
+def init_app(app):
+    """
+    Attach an idempotency key store to the application.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    app.extensions["idempotency"] = IdempotencyStore(app.config.get("IDEMPOTENCY_TTL", 3600))
+
+
+def idempotent(view):
+    """
+    Make a write endpoint safe to retry with an ``Idempotency-Key`` header.
+
+    The first request with a given key runs normally and its response is
+    stored; retries with the same key and payload (for form posts, the same
+    fields and file contents) get the stored response back. Reusing a key for
+    a different payload is rejected with 422. Requests without the header are
+    not affected.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        key = request.headers.get(HEADER)
+        if not key:
+            return view(*args, **kwargs)
+
+        store = current_app.extensions["idempotency"]
+        scope = current_user.get_id() if current_user.is_authenticated else request.remote_addr
+        entry_key = (scope, key)
+        fingerprint = _fingerprint()
+
+        reserved, stored_fingerprint, stored = store.reserve(entry_key, fingerprint)
+        if not reserved:
+            if stored_fingerprint != fingerprint:
+                return jsonify({"message": f"{HEADER} was already used for a different request"}), 422
+            if stored is None:
+                return jsonify({"message": "A request with this Idempotency-Key is in progress"}), 409
+            status, mimetype, body = stored
+            response = Response(body, status=status, mimetype=mimetype)
+            response.headers["Idempotent-Replayed"] = "true"
+            return response
+
+        try:
+            response = make_response(view(*args, **kwargs))
+        except Exception:
+            store.release(entry_key)
+            raise
+        if response.status_code >= 500:
+            store.release(entry_key)
+        else:
+            store.complete(entry_key, fingerprint, (response.status_code, response.mimetype, response.get_data()))
+        return response
+
+    return wrapper
@@ -1,9 +1,21 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, g, jsonify
+from flask_login import current_user
 from .models import db, User, Job
+from .events import publish
+from .rbac import permissions_for, requires, scope
+from . import schemas
+from .schemas import validate
+from .unit_of_work import on_commit, transactional
+from .upsert import update_returning
 
 jobs_bp = Blueprint("jobs", __name__)
 
+PROFILE_COLUMNS = [User.id, User.username, User.first_name, User.last_name, User.email, User.role]
+
 @jobs_bp.route("/edit/<int:employer_id>", methods=["PUT"])
+@requires("profiles:edit")
+@validate(schemas.PROFILE)
+@transactional
 def edit_employer_profile(employer_id):
     """
     Edit the profile of an employer.
@@ -12,35 +24,43 @@ def edit_employer_profile(employer_id):
         employer_id (int): The ID of the employer to edit.
 
     Returns:
-        dict: A JSON response containing the updated employer's information.
+        dict: A JSON response containing the updated employer's profile fields,
+        or 409 if the new email is taken.
 
     Raises:
-        404: If the employer with the given ID is not found.
+        404: If the employer with the given ID is not found, or is another
+            user and the current user may only edit their own profile.
     """
-    employer = db.session.get(User, employer_id)
-    if not employer:
+    if scope(User.query, User).filter(User.id == employer_id).with_entities(User.id).first() is None:
         return jsonify({"message": "Employer not found"}), 404
-
-    data = request.json
-
-    employer.first_name = data.get("first_name", employer.first_name)
-    employer.last_name = data.get("last_name", employer.last_name)
-    employer.email = data.get("email", employer.email)
-    db.session.commit()
-    return jsonify(employer.to_dict()), 200
+    values = {key: g.data[key] for key in ("first_name", "last_name", "email") if key in g.data}
+    employer = update_returning(User, employer_id, values, PROFILE_COLUMNS)
+    if employer is None:
+        return jsonify({"message": "Employer not found"}), 404
+    return jsonify(employer), 200
 
 @jobs_bp.route("/post-job", methods=["POST"])
+@requires("jobs:create")
+@validate(schemas.POSTED_JOB)
+@transactional
 def post_job():
     """
     Post a new job.
 
+    The job belongs to the current user unless ``employer_id`` names another
+    employer, which only users who may edit every job can do.
+
     Returns:
-        dict: A JSON response containing the created job's information.
+        dict: A JSON response containing the created job's information, or
+        an error message with status code 403.
     """
-    data = request.json
+    data = g.data
+    employer_id = data.get('employer_id', current_user.id)
+    if employer_id != current_user.id and "jobs:edit" not in permissions_for(current_user.role):
+        return jsonify({"message": "Unauthorized"}), 403
 
     new_job = Job(
-        employer_id=data['employer_id'],  # Assuming you have the employer_id available
+        employer_id=employer_id,
         title=data['title'],
         department=data['department'],
         manager_name=data['managerName'],
@@ -50,13 +70,15 @@ def post_job():
         max_students=data['maxStudents'],
         role_location=data['roleLocation'],
         type_of_work=data['typeOfWork'],
-        prerequisites=data.get('prerequisites', ''),  # Optional field
+        prerequisites=data['prerequisites'],
         brief_description=data['briefDescription'],
-        more_details=data.get('moreDetails', ''),  # Optional field
+        more_details=data['moreDetails'],
         application_deadline=data['applicationDeadline']
     )
 
     db.session.add(new_job)
-    db.session.commit()
+    db.session.flush()
 
-    return jsonify(new_job.to_dict()), 201
+    job_data = new_job.to_dict()
+    on_commit(publish, "job.created", job_data, broadcast=True)
+    return jsonify(job_data), 201
@@ -0,0 +1,195 @@
+import re
+from datetime import datetime, timedelta
+
+import click
+from sqlalchemy import func, literal, or_, select, text, true
+
+from . import db
+from .audit import record_deletes
+from .capacity import ACCEPTED
+from .dates import current_term
+from .models import Application, ApplicationArchive, Job, JobArchive, job_semester
+from .sync import record_deletions
+
+
+def now():
+    """
+    Return the current time as compared with job deadlines.
+
+    Deadlines are entered as local calendar dates, so this is the server's
+    local time rather than UTC.
+    """
+    return datetime.now()
+
+
+def open_jobs_filter(at=None):
+    """
+    Build the filter matching jobs still accepting applications.
+
+    Jobs whose deadline couldn't be parsed are considered open.
+
+    Args:
+        at (datetime, optional): The reference time. Defaults to now.
+
+    Returns:
+        ColumnElement: The filter expression.
+    """
+    return or_(Job.deadline_at.is_(None), Job.deadline_at >= (at or now()))
+
+
+def archive_expired_jobs(grace_days=0, at=None):
+    """
+    Move expired job postings into the ``job_archive`` cold table.
+
+    Only jobs that no live application refers to are moved, so application
+    foreign keys stay valid; jobs with applications follow once their
+    applications have been rolled into the archive.
+
+    Args:
+        grace_days (int): Keep jobs in the hot table this many days past their deadline.
+        at (datetime, optional): The reference time. Defaults to now.
+
+    Returns:
+        list: The IDs of the archived jobs.
+    """
+    from .snapshots import mark_changed
+
+    at = at or now()
+    job = Job.__table__
+    referenced = select(Application.job_id).where(Application.job_id.is_not(None))
+    expired = db.session.execute(
+        select(job).where(job.c.deadline_at < at - timedelta(days=grace_days), job.c.id.not_in(referenced))
+    ).all()
+    if not expired:
+        return []
+    job_ids = [row.id for row in expired]
+
+    columns = [column.name for column in JobArchive.__table__.columns if column.name != "archived_at"]
+    db.session.execute(
+        JobArchive.__table__.insert().from_select(
+            [*columns, "archived_at"],
+            select(*(job.c[name] for name in columns), literal(at, db.DateTime)).where(job.c.id.in_(job_ids)),
+        )
+    )
+    db.session.execute(job_semester.delete().where(job_semester.c.job_id.in_(job_ids)))
+    db.session.execute(job.delete().where(job.c.id.in_(job_ids)))
+    # Core deletes bypass the audit and tombstone listeners
+    record_deletes("job", [(row.id, row.tenant_id, row._mapping) for row in expired])
+    record_deletions("job", [(row.id, row.tenant_id) for row in expired])
+    mark_changed({row.tenant_id for row in expired})
+    db.session.commit()
+    return job_ids
+
+
+def term_scopes(term=None):
+    """
+    Return where to read the applications of a term from.
+
+    Without a term only the current term is read, from the live
+    ``application`` table (through its tenant and term index), so reads don't
+    grow with the terms that haven't been rolled yet. ``term="all"`` reads
+    everything.
+
+    Args:
+        term (str, optional): e.g. "Fall 2025", or "all".
+
+    Returns:
+        list: ``(model, criterion)`` pairs to query and union.
+    """
+    if not term:
+        return [(Application, Application.term == current_term())]
+    if term == "all":
+        return [(Application, true()), (ApplicationArchive, true())]
+    return [(Application, Application.term == term), (ApplicationArchive, ApplicationArchive.term == term)]
+
+
+def find_job(job_id):
+    """
+    Look a job up in the live table, then in the archive.
+
+    Args:
+        job_id (int): The ID of the job.
+
+    Returns:
+        Job | JobArchive | None: The job.
+    """
+    return db.session.get(Job, job_id) or db.session.get(JobArchive, job_id)
+
+
+def roll_term(term, at=None):
+    """
+    Move the applications of a term from the live table into cold storage.
+
+    On PostgreSQL the term gets its own partition of ``application_archive``.
+
+    Args:
+        term (str): The term to roll, e.g. "Fall 2025".
+        at (datetime, optional): The archive timestamp. Defaults to now.
+
+    Returns:
+        int: The number of applications moved.
+    """
+    at = at or now()
+    dialect = db.engine.dialect
+    if dialect.name == "postgresql":
+        partition = "application_archive_" + re.sub(r"\W+", "_", term.lower()).strip("_")
+        bound = literal(term).compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        db.session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition} PARTITION OF application_archive FOR VALUES IN ({bound})"
+        ))
+
+    application = Application.__table__
+    # Archived acceptances no longer hold seats (see backend.capacity)
+    job = Job.__table__
+    accepted = (application.c.term == term, application.c.status == ACCEPTED)
+    db.session.execute(
+        job.update()
+        .where(job.c.id.in_(select(application.c.job_id).where(*accepted)))
+        .values(
+            accepted_count=job.c.accepted_count
+            - select(func.count()).where(application.c.job_id == job.c.id, *accepted).scalar_subquery(),
+            updated_at=job.c.updated_at,
+        )
+    )
+
+    columns = [column.name for column in ApplicationArchive.__table__.columns if column.name != "archived_at"]
+    db.session.execute(
+        ApplicationArchive.__table__.insert().from_select(
+            [*columns, "archived_at"],
+            select(*(application.c[name] for name in columns), literal(at, db.DateTime))
+            .where(application.c.term == term),
+        )
+    )
+    # Core deletes bypass the audit listener; resumes stay out of the log
+    rolled = db.session.execute(
+        select(*(column for column in application.c if column.name != "resume")).where(application.c.term == term)
+    ).all()
+    record_deletes("application", [(row.id, row.tenant_id, row._mapping) for row in rolled])
+    moved = db.session.execute(application.delete().where(application.c.term == term)).rowcount
+    db.session.commit()
+    return moved
+
+
+def init_app(app):
+    """
+    Register the data lifecycle commands.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    @app.cli.command("archive-expired-jobs")
+    @click.option("--grace-days", default=0, show_default=True, help="Days past the deadline to keep a job listed.")
+    def archive_expired_jobs_command(grace_days):
+        """Move expired job postings into the job_archive table (run it from cron)."""
+        job_ids = archive_expired_jobs(grace_days)
+        click.echo(f"Archived {len(job_ids)} job(s).")
+
+    @app.cli.command("roll-term")
+    @click.argument("term")
+    @click.option("--force", is_flag=True, help="Allow rolling the current term.")
+    def roll_term_command(term, force):
+        """Move the applications of TERM (e.g. "Fall 2025") into the archive."""
+        if term == current_term() and not force:
+            raise click.UsageError(f"{term} is the current term; pass --force to roll it anyway.")
+        moved = roll_term(term)
+        click.echo(f"Archived {moved} application(s) from {term}.")
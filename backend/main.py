@@ -1,15 +1,37 @@
-from flask import Blueprint, request, jsonify
-from .models import db, Job, Application, User, Team, WSTracker
-from flask_login import current_user, login_required
-from werkzeug.utils import secure_filename
-import os
+import logging
+
+from flask import Blueprint, abort, g, request, jsonify
+from sqlalchemy.orm import defer, joinedload
+from .models import db, Job, JobArchive, Application, User, Team, WSTracker, Semester, Department, RoleLocation
+from .resume_index import get_index
+from .matching import recommend
+from .taxonomy import lookup_id
+from .events import publish
+from .dates import parse_deadline
+from .lifecycle import find_job, open_jobs_filter, term_scopes
+from .idempotency import idempotent
+from .upsert import insert_or_get
+from .audit import record_inserts
+from .unit_of_work import on_commit, transactional
+from .sync import sync_response
+from .encoding import jsonify_rows
+from .snapshots import serve_listing
+from .catalog import get_catalog
+from .capacity import delete_application, resize, set_status
+from .rbac import requires, scope
+from . import schemas
+from .schemas import validate
+from flask_login import current_user
 
 main = Blueprint("main", __name__)
+logger = logging.getLogger(__name__)
 
 
 # Jobs Endpoints
 @main.route("/employers", methods=["GET", "POST"])
-@login_required
+@requires({"GET": "jobs:read", "POST": "jobs:create"})
+@validate(schemas.JOB)
+@transactional
 def manage_jobs():
     """
     Endpoint for managing jobs.
@@ -24,7 +46,7 @@ def manage_jobs():
         JSON response containing the job(s) and the corresponding status code.
     """
     if request.method == "POST":
-        data = request.json
+        data = g.data
         new_job = Job(
             employer_id=current_user.id,
             title=data["positionTitle"],
@@ -32,26 +54,30 @@ def manage_jobs():
             manager_name=data["managerName"],
             manager_email=data["managerEmail"],
             hiring_semesters=','.join(data["hiringSemester"]),
-            min_students=int(data["minStudents"]),
-            max_students=int(data["maxStudents"]),
+            min_students=data["minStudents"],
+            max_students=data["maxStudents"],
             role_location=data["roleLocation"],
             type_of_work=data["typeOfWork"],
-            prerequisites=data.get("prerequisites", ""),
+            prerequisites=data["prerequisites"],
             brief_description=data["briefDescription"],
-            more_details=data.get("moreDetails", ""),
+            more_details=data["moreDetails"],
             application_deadline=data["applicationDeadline"]
         )
 
         db.session.add(new_job)
-        db.session.commit()
-        return jsonify(new_job.to_dict()), 201
+        db.session.flush()
+        job_data = new_job.to_dict()
+        on_commit(publish, "job.created", job_data, broadcast=True)
+        return jsonify(job_data), 201
 
     jobs = Job.query.all()
     return jsonify([job.to_dict() for job in jobs]), 200
 
 #Endpoints for getting jobs posted by a specific employer
 @main.route("/jobs/<int:job_id>", methods=["GET", "PUT", "DELETE"])
-@login_required
+@requires({"GET": "jobs:read", "PUT": "jobs:edit", "DELETE": "jobs:delete"})
+@validate(schemas.JOB.partial())
+@transactional
 def handle_job(job_id):
     """
     Handle GET, PUT, and DELETE requests for a specific job.
@@ -63,35 +89,44 @@ def handle_job(job_id):
         JSON response: The job details in JSON format.
 
     Raises:
-        404: If the job with the specified ID does not exist.
+        404: If the job with the specified ID does not exist, or belongs to
+            another employer when editing or deleting it.
+        409: If ``maxStudents`` is below the applications it has already accepted.
     """
-    job = Job.query.get_or_404(job_id)
-
     if request.method == "GET":
-        # Simply return the job details in JSON format
+        # Every role reads every job, so reads are answered from the in-memory catalog
+        job = get_catalog().job(job_id)
+        if job is None:
+            abort(404)
         return jsonify(job.to_dict()), 200
 
+    job = scope(Job.query, Job).filter(Job.id == job_id).first_or_404()
+
     if request.method == "PUT":
-        data = request.json
+        data = g.data
+        if "maxStudents" in data and not resize(job, data["maxStudents"]):
+            return jsonify({"message": "This job has already accepted more students than that"}), 409
         job.title = data.get("positionTitle", job.title)
         job.department = data.get("department", job.department)
         job.manager_name = data.get("managerName", job.manager_name)
         job.manager_email = data.get("managerEmail", job.manager_email)
-        job.hiring_semesters = ','.join(data.get("hiringSemester", job.hiring_semesters))
+        if "hiringSemester" in data:
+            job.hiring_semesters = ','.join(data["hiringSemester"])
         job.min_students = data.get("minStudents", job.min_students)
-        job.max_students = data.get("maxStudents", job.max_students)
         job.role_location = data.get("roleLocation", job.role_location)
         job.type_of_work = data.get("typeOfWork", job.type_of_work)
         job.prerequisites = data.get("prerequisites", job.prerequisites)
         job.brief_description = data.get("briefDescription", job.brief_description)
         job.more_details = data.get("moreDetails", job.more_details)
         job.application_deadline = data.get("applicationDeadline", job.application_deadline)
-        db.session.commit()
-        return jsonify(job.to_dict()), 200
+        db.session.flush()
+        job_data = job.to_dict()
+        on_commit(publish, "job.updated", job_data, broadcast=True)
+        return jsonify(job_data), 200
 
     elif request.method == "DELETE":
         db.session.delete(job)
-        db.session.commit()
+        on_commit(publish, "job.deleted", {"id": job_id}, broadcast=True)
         return jsonify({"message": "Job deleted successfully"}), 200
 
     return jsonify(job.to_dict()), 200
@@ -99,7 +134,10 @@ def handle_job(job_id):
 
 # Applications Endpoints
 @main.route('/apply', methods=['POST'])
-@login_required
+@requires("applications:create")
+@idempotent
+@validate(schemas.APPLICATION, source="form")
+@transactional
 def apply_for_job():
     """
     Endpoint for submitting a job application.
@@ -107,56 +145,69 @@ def apply_for_job():
     This endpoint allows users to apply for a job by submitting their application details,
     including the job ID, email address, year of graduation, candidate statement, and resume.
 
+    Retries are safe: an ``Idempotency-Key`` header replays the first response,
+    and applying to the same job twice returns the existing application with 409.
+
     Returns:
         A JSON response containing the newly created application details and a status code of 201.
     """
+    resume = None
     if 'resume' in request.files:
         resume_file = request.files['resume']
         if resume_file.filename != '':
-            filename = secure_filename(resume_file.filename)
-            resume_file.save(os.path.join('path/to/save', filename))
-
-    data = request.form
-    new_application = Application(
-        # Assume student_id is handled appropriately (e.g., from session)
-        job_id=data.get('jobId'),
-        email_address=data.get('emailAddress'),
-        year_of_graduation=data.get('yearOfGraduation'),
-        candidate_statement=data.get('candidateStatement'),
-        student_id=current_user.id,
-        # Handle resume data as needed
-    )
+            resume = resume_file.read()
 
-    db.session.add(new_application)
-    db.session.commit()
+    data = g.data
+    application, created = insert_or_get(Application, {
+        "job_id": data['jobId'],
+        "email_address": data['emailAddress'],
+        "year_of_graduation": data['yearOfGraduation'],
+        "candidate_statement": data['candidateStatement'],
+        "student_id": current_user.id,
+        "resume": resume,
+    }, ["student_id", "job_id"])
+    if not created:
+        return jsonify({"message": "You have already applied for this job", "application": application.to_dict()}), 409
 
-    return jsonify(new_application.to_dict()), 201
+    # Core inserts bypass the audit listener; the entry also tells the resume index to pick it up
+    record_inserts("application", [(application.id, application.tenant_id, application.to_dict())])
+
+    return jsonify(application.to_dict()), 201
 
 
 
 #Endpoints for getting applications for a specific user
 @main.route('/user-applications', methods=['GET'])
-@login_required
+@requires("applications:read")
 def get_user_applications():
     """
     Retrieves the applications of the current user.
 
+    Only the current term is returned unless ``?term=`` names another term
+    or is "all".
+
     Returns:
         A JSON response containing the applications data and a status code.
     """
     # Assume user_id is obtained from the session or authentication system
     user_id = current_user.id
+    term = request.args.get('term')
 
     # Fetch applications from the database where the student_id matches the user_id
-    applications = Application.query.filter_by(student_id=user_id).all()
+    applications = []
+    for model, in_term in term_scopes(term):
+        applications += model.query.filter(model.student_id == user_id, in_term).all()
 
     # Convert applications to a dictionary format to be JSON serializable
     applications_data = []
 
+    catalog = get_catalog()
     for application in applications:
         application_data = application.to_dict()
-        job_id = application_data['job_id']
-        job = Job.query.get_or_404(job_id)
+        # Archived jobs aren't in the catalog
+        job = catalog.job(application_data['job_id']) or find_job(application_data['job_id'])
+        if job is None:
+            continue
         application_data['job'] = job.to_dict()
         applications_data.append(application_data)
     
@@ -171,7 +222,8 @@ def get_job_posting(job_id):
 
 # Endpoints for withdrawing an application
 @main.route('/user-applications/<int:application_id>', methods=['DELETE'])
-@login_required
+@requires("applications:withdraw")
+@transactional
 def withdraw_application(application_id):
     """
     Withdraws an application by deleting it from the database.
@@ -183,13 +235,16 @@ def withdraw_application(application_id):
         tuple: A tuple containing the JSON response and the HTTP status code.
             The JSON response contains a message indicating the success of the operation.
     """
-    application = Application.query.get_or_404(application_id)
-    db.session.delete(application)
-    db.session.commit()
+    application = scope(Application.query, Application).filter(Application.id == application_id).first_or_404()
+    recipients = [application.student_id, application.job.employer_id if application.job else None]
+    delete_application(application)
+    on_commit(publish, "application.withdrawn", {"id": application_id}, user_ids=recipients)
     return jsonify({"message": "Application deleted successfully"}), 200
 
 @main.route("/applications/<int:application_id>", methods=["GET", "PUT", "DELETE"])
-@login_required
+@requires({"GET": "applications:read", "PUT": "applications:review", "DELETE": "applications:delete"})
+@validate(schemas.APPLICATION_REVIEW)
+@transactional
 def handle_application(application_id):
     """
     Handle GET, PUT, and DELETE requests for a specific application.
@@ -201,50 +256,116 @@ def handle_application(application_id):
         JSON response: The application details or a success message.
 
     Raises:
-        404: If the application with the given ID does not exist.
+        404: If the application with the given ID does not exist or isn't
+            visible to the current user (see ``backend.rbac.OWNERSHIP``).
+        409: If accepting it would exceed its job's ``max_students``.
     """
-    application = Application.query.get_or_404(application_id)
+    application = scope(Application.query, Application).filter(Application.id == application_id).first_or_404()
 
     if request.method == "PUT":
-        data = request.json
-        application.status = data.get("status", application.status)
-        db.session.commit()
-        return jsonify(application.to_dict()), 200
+        data = g.data
+        if "status" in data and not set_status(application, data["status"]):
+            return jsonify({"message": "This job has accepted as many students as it can take"}), 409
+        application_data = application.to_dict()
+        on_commit(
+            publish,
+            "application.updated",
+            application_data,
+            user_ids=[application.student_id, application.job.employer_id if application.job else None],
+        )
+        return jsonify(application_data), 200
 
     elif request.method == "DELETE":
-        db.session.delete(application)
-        db.session.commit()
+        recipients = [application.student_id, application.job.employer_id if application.job else None]
+        delete_application(application)
+        on_commit(publish, "application.withdrawn", {"id": application_id}, user_ids=recipients)
         return jsonify({"message": "Application deleted successfully"}), 200
 
     return jsonify(application.to_dict()), 200
 
 #endpoint for getting all applications
 @main.route("/applications", methods=["GET"])
-@login_required
+@requires("applications:read")
 def get_applications():
     """
     Endpoint for retrieving all applications.
 
+    Only the current term is returned unless ``?term=`` names another term
+    or is "all".
+
     Returns:
         JSON response containing a list of applications.
     """
     employer_id = current_user.id
+    term = request.args.get('term')
     # jobs the employer posted
-    jobs = Job.query.filter_by(employer_id=employer_id).all()
+    job_ids = [job_id for (job_id,) in db.session.query(Job.id).filter_by(employer_id=employer_id)]
+    if term:
+        job_ids += [job_id for (job_id,) in db.session.query(JobArchive.id).filter_by(employer_id=employer_id)]
 
     # applications for the jobs the employer posted
     applications = []
-    for job in jobs:
-        for application in job.applications:
-            student = get_student_from_application(application)
-            application_data = {
+    for model, in_term in term_scopes(term):
+        rows = (
+            db.session.query(model, User.first_name, User.last_name)
+            .join(User, User.id == model.student_id)
+            .filter(model.job_id.in_(job_ids), in_term)
+            .order_by(model.job_id, model.id)
+        )
+        for application, first_name, last_name in rows:
+            applications.append({
                 "application": application.to_dict(),
-                "student_name": f"{student['first_name']} {student['last_name']}",
-            }
-            applications.append(application_data)
+                "student_name": f"{first_name} {last_name}",
+            })
 
     return jsonify(applications), 200
 
+@main.route("/applications/search", methods=["GET"])
+@requires("applications:read")
+def search_applications():
+    """
+    Search the applicants of the current employer's jobs by keyword.
+
+    Query parameters:
+        q (str): The keywords to match against resumes and candidate statements.
+        limit (int, optional): The maximum number of results. Defaults to 20.
+
+    Returns:
+        JSON response containing the matching applications, best match first.
+    """
+    keywords = request.args.get("q", "")
+    limit = min(request.args.get("limit", 20, type=int), 100)
+
+    index = get_index()
+    if index is None:
+        return jsonify({"message": "Applicants are still being indexed, try again shortly"}), 503, {"Retry-After": "5"}
+
+    job_ids = {job_id for (job_id,) in db.session.query(Job.id).filter_by(employer_id=current_user.id)}
+    hits = index.search(keywords, job_ids, limit)
+    if not hits:
+        return jsonify([]), 200
+
+    rows = (
+        db.session.query(Application, User.first_name, User.last_name)
+        .join(User, User.id == Application.student_id)
+        .filter(Application.id.in_([application_id for application_id, _ in hits]))
+        .options(defer(Application.resume))
+        .all()
+    )
+    by_id = {application.id: (application, first_name, last_name) for application, first_name, last_name in rows}
+
+    results = []
+    for application_id, score in hits:
+        if application_id not in by_id:
+            continue
+        application, first_name, last_name = by_id[application_id]
+        results.append({
+            "application": application.to_dict(),
+            "student_name": f"{first_name} {last_name}",
+            "score": round(score, 4),
+        })
+    return jsonify(results), 200
+
 def get_student_from_application(application):
     student_id = application.student_id
     student = User.query.get_or_404(student_id)
@@ -252,7 +373,9 @@ def get_student_from_application(application):
 
 # Students Endpoints
 @main.route("/students", methods=["GET", "POST"])
-@login_required
+@requires({"GET": "users:read", "POST": "users:create"})
+@validate(schemas.NEW_USER)
+@transactional
 def manage_students():
     """
     Endpoint for managing students.
@@ -265,18 +388,18 @@ def manage_students():
         - For POST: A JSON response containing the newly created student object.
     """
     if request.method == "POST":
-        data = request.json
+        data = g.data
         new_student = User(
             username=data["username"],
             password=data["password"],
             first_name=data["first_name"],
             last_name=data["last_name"],
             email=data["email"],
-            education_level=data.get("education_level", ""),
-            resume=data.get("resume", ""),
+            education_level=data["education_level"],
+            resume=data["resume"],
         )
         db.session.add(new_student)
-        db.session.commit()
+        db.session.flush()
         return jsonify(new_student.to_dict()), 201
 
     students = User.query.all()
@@ -285,7 +408,9 @@ def manage_students():
 
 # Employers Endpoints
 @main.route("/employers", methods=["GET", "POST"])
-@login_required
+@requires({"GET": "users:read", "POST": "users:create"})
+@validate(schemas.NEW_USER)
+@transactional
 def manage_employers():
     """
     Endpoint for managing employers.
@@ -300,17 +425,17 @@ def manage_employers():
         JSON response containing employers data and status code.
     """
     if request.method == "POST":
-        data = request.json
+        data = g.data
         new_employer = User(
             username=data["username"],
             password=data["password"],
             first_name=data["first_name"],
             last_name=data["last_name"],
-            role=data["role"],
+            role=data.get("role"),
             email=data["email"],
         )
         db.session.add(new_employer)
-        db.session.commit()
+        db.session.flush()
         return jsonify(new_employer.to_dict()), 201
 
     employers = User.query.all()
@@ -318,19 +443,43 @@ def manage_employers():
 
 
 @main.route('/jobs', methods=['GET'])
-@login_required
+@requires("jobs:read")
 def get_jobs():
     """
     Retrieve jobs based on filter parameters from the query string.
 
+    Passing ``sort=recommended`` orders the jobs by how well they match the
+    current student (see ``backend.matching``) and ``sort=deadline`` by closing
+    date. ``semester`` may be repeated to match jobs hiring in any of the given
+    semesters. ``open_only=true`` keeps the jobs still accepting applications and
+    ``closing_before=<date>`` those closing on or before that date.
+
+    ``since=<sync_token>`` switches to a delta sync: only the jobs changed since
+    the token are returned, with the IDs of deleted jobs and a new token (see
+    ``backend.sync``). Pass an empty ``since=`` for the initial full sync. Jobs
+    that stop matching the filters aren't reported, so clients delta-syncing a
+    filtered list should filter locally instead.
+
+    Listings filtered by at most a department or a location (plus
+    ``open_only``) are served from the job board snapshot when it's fresh (see
+    ``backend.snapshots``).
+
     Returns:
         A JSON response containing a list of job objects matching the filter criteria.
     """
-    jobs = Job.query.all()
     # Retrieve filter parameters from query string
     keyword = request.args.get('keyword')
     location = request.args.get('location')
     department = request.args.get('department')
+    semesters = request.args.getlist('semester')
+    open_only = request.args.get('open_only', '').lower() in ('1', 'true', 'yes')
+    closing_before = request.args.get('closing_before')
+    sort = request.args.get('sort')
+
+    if not (keyword or semesters or closing_before or sort or 'since' in request.args):
+        response = serve_listing(department if department != 'Other' else None, location, open_only)
+        if response is not None:
+            return response
 
     # Start with a base query
     query = Job.query
@@ -339,15 +488,50 @@ def get_jobs():
     if keyword:
         query = query.filter(Job.title.ilike(f'%{keyword}%'))  # Adjust the filter field and method as needed
     if location:
-        query = query.filter_by(role_location=location)  # Adjust the filter field as needed
+        query = query.filter(Job.role_location_id == lookup_id(RoleLocation, location))
     if department and department != 'Other':  # Assuming 'Other' means no department filter
-        query = query.filter_by(department=department)  # Adjust the filter field as needed
+        query = query.filter(Job.department_id == lookup_id(Department, department))
+    if semesters:
+        query = query.filter(Job.semesters.any(Semester.name.in_(semesters)))
+    query, error = filter_by_deadline(query, open_only, closing_before)
+    if error:
+        return error
+    if 'since' in request.args:
+        return sync_response(query, Job, request.args['since'])
+    if sort == 'deadline':
+        query = query.order_by(Job.deadline_at.is_(None), Job.deadline_at, Job.id)
 
     # Execute the query and return results
     jobs = query.all()
+    if sort == 'recommended':
+        by_id = {job.id: job for job in jobs}
+        jobs = [by_id[job_id] for job_id in recommend(current_user, list(by_id))]
     return jsonify([job.to_dict() for job in jobs]), 200
 
+def filter_by_deadline(query, open_only, closing_before):
+    """
+    Apply the open-jobs and closing-date filters to a job query.
+
+    Args:
+        query (Query): The job query.
+        open_only (bool): Keep only jobs still accepting applications.
+        closing_before (str): Keep only jobs closing on or before this date.
+
+    Returns:
+        tuple: The filtered query and an error response (or None).
+    """
+    if open_only:
+        query = query.filter(open_jobs_filter())
+    if closing_before:
+        cutoff = parse_deadline(closing_before)
+        if cutoff is None:
+            return query, (jsonify({"message": "Invalid closing_before date"}), 400)
+        query = query.filter(Job.deadline_at <= cutoff)
+    return query, None
+
 @main.route('/job-search', methods=['POST'])
+@requires("jobs:read")
+@validate(schemas.JOB_SEARCH)
 def search_jobs():
     """
     Search for jobs based on the provided filters.
@@ -361,14 +545,21 @@ def search_jobs():
     Raises:
         None
     """
-    data = request.json
+    data = g.data
+
+    # Without a keyword, semesters or closing date the listing is in the snapshot
+    if not (data['keyword'] or data.get('semesters') or data.get('closingBefore')):
+        response = serve_listing(data['department'] if data['department'] != 'Other' else None,
+                                 data['location'], data.get('openOnly'))
+        if response is not None:
+            return response
 
     # Start with a query that will get all Job records
     query = Job.query
 
     # If a department is specified and it's not 'Other', filter jobs by that department
     if data['department'] and data['department'] != 'Other':
-        query = query.filter_by(department=data['department'])
+        query = query.filter(Job.department_id == lookup_id(Department, data['department']))
 
     # If a keyword is provided, filter jobs where the title contains the keyword (case-insensitive)
     if data['keyword']:
@@ -376,7 +567,16 @@ def search_jobs():
 
     # If a location is provided, filter jobs by the provided location
     if data['location']:
-        query = query.filter_by(role_location=data['location'])
+        query = query.filter(Job.role_location_id == lookup_id(RoleLocation, data['location']))
+
+    # If semesters are provided, keep the jobs hiring in any of them
+    if data.get('semesters'):
+        query = query.filter(Job.semesters.any(Semester.name.in_(data['semesters'])))
+
+    # Optionally keep only open jobs and/or jobs closing by a date
+    query, error = filter_by_deadline(query, data.get('openOnly'), data.get('closingBefore'))
+    if error:
+        return error
 
     # Execute the query and retrieve all matching records    
     jobs = query.all()
@@ -391,21 +591,37 @@ def home():
     return jsonify({"message": "Welcome to the Work Study Platform API"}), 200
 
 @main.route('/admin/jobs', methods=['GET'])
-@login_required
+@requires("jobs:overview")
 def admin_view_all_jobs():
-    if current_user.role != 'admin':
-        return jsonify({"message": "Unauthorized"}), 403
+    """
+    List every job with its manager and applications.
 
+    Only the current term's applications are included unless ``?term=`` names
+    another term or is "all", in which case archived jobs are listed too.
+    """
+    term = request.args.get('term')
     jobs = Job.query.all()
+    if term:
+        jobs += JobArchive.query.all()
+
+    applications_by_job = {}
+    for model, in_term in term_scopes(term):
+        for application in model.query.options(joinedload(model.student)).filter(in_term):
+            applications_by_job.setdefault(application.job_id, []).append(application)
+
+    employers = {user.id: user for user in User.query.filter(User.id.in_({job.employer_id for job in jobs}))}
     jobs_data = []
     for job in jobs:
+        employer = employers.get(job.employer_id)
+        applications = applications_by_job.get(job.id, [])
+        if term and isinstance(job, JobArchive) and not applications:
+            continue
         job_data = job.to_dict()
         job_data['manager'] = {
-            "id": job.employer.id,
-            "name": f"{job.employer.first_name} {job.employer.last_name}",
-            "email": job.employer.email,
+            "id": job.employer_id,
+            "name": f"{employer.first_name} {employer.last_name}" if employer else None,
+            "email": employer.email if employer else None,
         }
-        applications = Application.query.filter_by(job_id=job.id).all()
         job_data['applications'] = [
             {
                 "id": application.id,
@@ -419,13 +635,21 @@ def admin_view_all_jobs():
         ]
         jobs_data.append(job_data)
 
-    return jsonify(jobs_data), 200
+    return jsonify_rows(jobs_data), 200
 
 
 @main.route('/teams', methods=['GET', 'POST'])
+@requires({"POST": "teams:write"})
+@validate(schemas.TEAM)
+@transactional
 def manage_teams():
+    """
+    List the teams or create one.
+
+    ``GET ?since=<sync_token>`` returns only the changes since the token (see ``get_jobs``).
+    """
     if request.method == 'POST':
-        data = request.json
+        data = g.data
         new_team = Team(
             name=data['name'],
             manager=data['manager'],
@@ -436,20 +660,24 @@ def manage_teams():
             recruiting_for=data['recruitingFor'],
         )
         db.session.add(new_team)
-        db.session.commit()
+        db.session.flush()
         return jsonify(new_team.to_dict()), 201
 
-    teams = Team.query.all()
+    if 'since' in request.args:
+        return sync_response(Team.query, Team, request.args['since'])
+    teams = get_catalog().teams()
     return jsonify([team.to_dict() for team in teams]), 200
 
 
 @main.route('/teams/<int:team_id>', methods=['PUT', 'DELETE'])
-@login_required
+@requires("teams:write")
+@validate(schemas.TEAM.partial())
+@transactional
 def handle_team(team_id):
     team = Team.query.get_or_404(team_id)
 
     if request.method == 'PUT':
-        data = request.json
+        data = g.data
         team.name = data.get('name', team.name)
         team.manager = data.get('manager', team.manager)
         team.email = data.get('email', team.email)
@@ -457,53 +685,45 @@ def handle_team(team_id):
         team.contact = data.get('contact', team.contact)
         team.priority = data.get('priority', team.priority)
         team.recruiting_for = data.get('recruitingFor', team.recruiting_for)
-        db.session.commit()
+        db.session.flush()
         return jsonify(team.to_dict()), 200
 
     elif request.method == 'DELETE':
         db.session.delete(team)
-        db.session.commit()
         return jsonify({"message": "Team deleted successfully"}), 200
 
 @main.route('/ws-position-tracker', methods=['GET', 'POST'])
+@requires({"GET": "tracker:read", "POST": "tracker:write"})
+@validate(schemas.POSITION)
+@transactional
 def manage_ws_positions():
-    if request.method == 'POST':
-        try:
-            data = request.json
-            print("Received data:", data)  # Debug incoming data
-            new_position = WSTracker(
-                student_id=data['student_id'],
-                minerva_email=data['minerva_email'],
-                full_name=data['full_name'],
-                expected_grad_year=data['expected_grad_year'],
-                ws_eligible=data['ws_eligible'],
-                role=data['role'],
-                manager_name=data['manager_name'],
-                paycom_manager=data['paycom_manager'],
-                manager_email=data['manager_email'],
-                department_name=data['department_name'],
-                paycom_id=data['paycom_id'],
-                contractor_status=data['contractor_status'],
-                notes=data['notes'],
-                merge_status=data['merge_status'],
-            )
-            db.session.add(new_position)
-            db.session.commit()
-            return jsonify(new_position.to_dict()), 201
-        except Exception as e:
-            print("Error processing POST request:", e)  # Log error
-            return jsonify({"error": str(e)}), 400
+    """
+    List the work-study positions or create one.
 
+    ``GET ?since=<sync_token>`` returns only the changes since the token (see ``get_jobs``).
+    """
+    if request.method == 'POST':
+        new_position = WSTracker(**g.data)
+        db.session.add(new_position)
+        db.session.flush()
+        on_commit(logger.info, "Created WS position %s", new_position.id, extra={"position_id": new_position.id})
+        return jsonify(new_position.to_dict()), 201
+
+    if 'since' in request.args:
+        return sync_response(WSTracker.query, WSTracker, request.args['since'])
     positions = WSTracker.query.all()
-    return jsonify([position.to_dict() for position in positions]), 200
+    return jsonify_rows([position.to_dict() for position in positions]), 200
 
 
 @main.route('/ws-position-tracker/<int:position_id>', methods=['PUT', 'DELETE'])
+@requires("tracker:write")
+@validate(schemas.POSITION.partial())
+@transactional
 def handle_ws_position(position_id):
     position = WSTracker.query.get_or_404(position_id)
 
     if request.method == 'PUT':
-        data = request.json
+        data = g.data
         position.student_id = data.get('student_id', position.student_id)
         position.minerva_email = data.get('minerva_email', position.minerva_email)
         position.full_name = data.get('full_name', position.full_name)
@@ -518,32 +738,9 @@ def handle_ws_position(position_id):
         position.contractor_status = data.get('contractor_status', position.contractor_status)
         position.notes = data.get('notes', position.notes)
         position.merge_status = data.get('merge_status', position.merge_status)
-        db.session.commit()
+        db.session.flush()
         return jsonify(position.to_dict()), 200
 
     elif request.method == 'DELETE':
         db.session.delete(position)
-        db.session.commit()
         return jsonify({"message": "WS Position deleted successfully"}), 200
-
-@main.route('/teams/<int:team_id>', methods=['PUT'])
-@login_required
-def update_team(team_id):
-    auth_header = request.headers.get("Authorization")
-    if not auth_header or not validate_token(auth_header.split(" ")[1]):
-        return jsonify({"error": "Unauthorized"}), 401
-
-    team = Team.query.get_or_404(team_id)
-    data = request.json
-
-    # Update team fields
-    team.name = data.get('name', team.name)
-    team.manager = data.get('manager', team.manager)
-    team.email = data.get('email', team.email)
-    team.max_students = data.get('maxStudents', team.max_students)
-    team.contact = data.get('contact', team.contact)
-    team.priority = data.get('priority', team.priority)
-    team.recruiting_for = data.get('recruitingFor', team.recruiting_for)
-
-    db.session.commit()
-    return jsonify(team.to_dict()), 200
\ No newline at end of file
@@ -0,0 +1,335 @@
+import math
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+from flask import current_app
+from scipy import sparse
+
+from . import db
+from .catalog import get_catalog
+from .models import Application, Job
+from .tenancy import TenantNamespaces
+from .text import normalize, tokenize
+
+_YEAR_RE = re.compile(r"\b(20\d\d)\b")
+
+# Structured features count for more than a single word of free text
+WORK_WEIGHT = 3.0
+EDUCATION_WEIGHT = 2.0
+
+
+def job_features(job):
+    """
+    Build the raw (term frequency) feature counts of a job.
+
+    Args:
+        job: A ``Job`` or any object with the same attributes.
+
+    Returns:
+        Counter: Feature -> count.
+    """
+    features = Counter(tokenize(" ".join(filter(None, (
+        job.title, job.department, job.prerequisites, job.brief_description, job.more_details,
+    )))))
+    if job.type_of_work:
+        features["work:" + normalize(job.type_of_work)] += WORK_WEIGHT
+    for term in tokenize(job.prerequisites or ""):
+        features["edu:" + term] += 1
+    return features
+
+
+def student_features(education_level, resume, type_of_work_history=()):
+    """
+    Build the feature vector of a student.
+
+    Args:
+        education_level (str): The student's education level.
+        resume (str): The student's resume text.
+        type_of_work_history (iterable): ``type_of_work`` of jobs applied to before.
+
+    Returns:
+        Counter: Feature -> weight.
+    """
+    features = Counter(tokenize(resume or ""))
+    for term in tokenize(education_level or ""):
+        features[term] += 1
+        features["edu:" + term] += EDUCATION_WEIGHT
+    for type_of_work in type_of_work_history:
+        if type_of_work:
+            features["work:" + normalize(type_of_work)] += WORK_WEIGHT
+    return features
+
+
+def hiring_years(hiring_semesters):
+    """
+    Return the calendar years mentioned in a job's hiring semesters.
+
+    Args:
+        hiring_semesters (str): e.g. "Fall 2026,Spring 2027".
+
+    Returns:
+        set: The years, empty if the semesters don't name any.
+    """
+    return {int(year) for year in _YEAR_RE.findall(hiring_semesters or "")}
+
+
+class MatchingEngine:
+    """
+    Scores jobs for a student with cosine similarity over TF-IDF vectors.
+
+    Job vectors are L2-normalized rows of a SciPy CSR matrix that is built once
+    and cached, so scoring every job for a student is a single sparse
+    matrix-vector product. Changed jobs are kept in a small overlay (their old
+    row is masked out) and folded back into the matrix, with fresh IDF weights,
+    once the overlay exceeds ``REBUILD_DRIFT`` of the corpus.
+
+    ``sync`` follows the jobs of the catalog (``backend.catalog``), which reads
+    the change log, so jobs written by any process are scored from the next
+    request on.
+    """
+
+    REBUILD_DRIFT = 0.1
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._features = {}  # job_id -> Counter
+        self._years = {}  # job_id -> earliest hiring year (0 if unknown)
+        self._df = Counter()
+        self._columns = {}  # feature -> column
+        self._idf = []  # column -> idf
+        self._row_ids = np.zeros(0, dtype=np.int64)  # row -> job_id
+        self._rows = {}  # job_id -> row
+        self._row_years = np.zeros(0, dtype=np.int64)
+        self._matrix = sparse.csr_matrix((0, 0))
+        self._masked = np.zeros(0, dtype=bool)
+        self._overlay = {}  # job_id -> {column: weight} for jobs changed since the last rebuild
+        self._source = None  # The catalog's jobs the corpus was last synced with
+        self.loaded = False
+
+    def load(self, jobs):
+        """
+        Replace the corpus with the given jobs.
+
+        Args:
+            jobs (iterable): ``Job`` instances or lookalikes.
+        """
+        with self._lock:
+            self._features.clear()
+            self._years.clear()
+            self._df.clear()
+            for job in jobs:
+                self._add(job)
+            self._rebuild()
+            self.loaded = True
+
+    def sync(self, jobs):
+        """
+        Bring the corpus in line with the catalog's jobs.
+
+        Only the jobs whose records changed since the last sync are refreshed,
+        and the corpus is rebuilt when more than ``REBUILD_DRIFT`` of it changed.
+
+        Args:
+            jobs (dict): job_id -> record (see ``backend.catalog.Catalog.jobs``).
+        """
+        with self._lock:
+            previous = self._source
+            if jobs is previous:
+                return
+            if previous is None:
+                changed, removed = list(jobs.values()), ()
+            else:
+                changed = [job for job_id, job in jobs.items() if previous.get(job_id) is not job]
+                removed = previous.keys() - jobs.keys()
+            if previous is None or len(changed) + len(removed) >= self.REBUILD_DRIFT * max(len(jobs), 10):
+                self.load(jobs.values())
+            else:
+                for job_id in removed:
+                    self.remove(job_id)
+                for job in changed:
+                    self.upsert(job)
+            self._source = jobs
+
+    def upsert(self, job):
+        """
+        Add or refresh a single job.
+
+        Args:
+            job: The ``Job`` instance.
+        """
+        with self._lock:
+            self._drop(job.id)
+            self._add(job)
+            if len(self._overlay) >= self.REBUILD_DRIFT * max(len(self._rows), 10):
+                self._rebuild()
+            else:
+                self._overlay[job.id] = self._vectorize(self._features[job.id], grow=True)
+
+    def remove(self, job_id):
+        """
+        Remove a job from the corpus.
+
+        Args:
+            job_id (int): The ID of the job.
+        """
+        with self._lock:
+            self._drop(job_id)
+
+    def _add(self, job):
+        features = job_features(job)
+        self._features[job.id] = features
+        self._years[job.id] = min(hiring_years(job.hiring_semesters), default=0)
+        self._df.update(features.keys())
+
+    def _drop(self, job_id):
+        features = self._features.pop(job_id, None)
+        self._years.pop(job_id, None)
+        if features is None:
+            return
+        self._df.subtract(features.keys())
+        self._overlay.pop(job_id, None)
+        row = self._rows.get(job_id)
+        if row is not None:
+            self._masked[row] = True
+
+    def _rebuild(self):
+        count = len(self._features)
+        live = [feature for feature, df in self._df.items() if df > 0]
+        self._columns = {feature: column for column, feature in enumerate(live)}
+        self._idf = [math.log((1 + count) / (1 + self._df[feature])) + 1 for feature in live]
+
+        job_ids = list(self._features)
+        indptr, indices, data = [0], [], []
+        for job_id in job_ids:
+            vector = self._vectorize(self._features[job_id])
+            indices.extend(vector)
+            data.extend(vector.values())
+            indptr.append(len(indices))
+        self._matrix = sparse.csr_matrix(
+            (np.array(data, dtype=float), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(job_ids), len(live)),
+        )
+        self._row_ids = np.array(job_ids, dtype=np.int64)
+        self._rows = {job_id: row for row, job_id in enumerate(job_ids)}
+        self._row_years = np.array([self._years[job_id] for job_id in job_ids], dtype=np.int64)
+        self._masked = np.zeros(len(job_ids), dtype=bool)
+        self._overlay.clear()
+
+    def _vectorize(self, features, grow=False):
+        """
+        Turn feature counts into an L2-normalized {column: weight} dict.
+
+        Unknown features are dropped, unless ``grow`` is set, in which case they
+        are appended to the vocabulary (beyond the matrix's columns, so only
+        overlay jobs carry them until the next rebuild).
+        """
+        weights = {}
+        for feature, tf in features.items():
+            column = self._columns.get(feature)
+            if column is None and grow:
+                column = self._columns[feature] = len(self._idf)
+                self._idf.append(math.log((1 + len(self._features)) / (1 + self._df[feature])) + 1)
+            if column is not None and tf > 0:
+                weights[column] = (1 + math.log(tf)) * self._idf[column]
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        return {column: weight / norm for column, weight in weights.items()}
+
+    def score(self, features, graduation_year=None):
+        """
+        Score every job in the corpus for a student.
+
+        Args:
+            features (Counter): The student's features (see ``student_features``).
+            graduation_year (int, optional): Jobs hiring only after this year score 0.
+
+        Returns:
+            dict: job_id -> cosine similarity for jobs with a non-zero score.
+        """
+        with self._lock:
+            query = self._vectorize(features)
+            width = self._matrix.shape[1]
+            vector = np.zeros(width)
+            for column, weight in query.items():
+                if column < width:
+                    vector[column] = weight
+            scores = self._matrix @ vector
+            scores[self._masked] = 0.0
+            if graduation_year:
+                scores[self._row_years > graduation_year] = 0.0
+            nonzero = np.flatnonzero(scores)
+            result = dict(zip(self._row_ids[nonzero].tolist(), scores[nonzero].tolist()))
+
+            for job_id, job_vector in self._overlay.items():
+                if graduation_year and self._years[job_id] > graduation_year:
+                    continue
+                value = sum(weight * job_vector.get(column, 0.0) for column, weight in query.items())
+                if value:
+                    result[job_id] = value
+        return result
+
+    def rank(self, job_ids, features, graduation_year=None):
+        """
+        Order job IDs by descending score, ties broken by ID.
+
+        Args:
+            job_ids (list): The jobs to order.
+            features (Counter): The student's features.
+            graduation_year (int, optional): The student's graduation year.
+
+        Returns:
+            list: The ordered job IDs.
+        """
+        scores = self.score(features, graduation_year)
+        ids = np.array(job_ids, dtype=np.int64)
+        values = np.array([scores.get(job_id, 0.0) for job_id in job_ids])
+        return ids[np.lexsort((ids, -values))].tolist()
+
+
+def init_app(app):
+    """
+    Attach the matching engines to the application, one per tenant.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    app.extensions["matching"] = TenantNamespaces(MatchingEngine)
+
+
+def get_engine():
+    """
+    Return the current tenant's matching engine, synced with the catalog.
+
+    Returns:
+        MatchingEngine: The up-to-date engine.
+    """
+    engine = current_app.extensions["matching"].get()
+    engine.sync(get_catalog().jobs())
+    return engine
+
+
+def recommend(student, job_ids):
+    """
+    Order jobs by how well they match a student.
+
+    Uses the student's education level and resume, the graduation year from
+    their latest application and the type of work of jobs they applied to.
+
+    Args:
+        student (User): The student.
+        job_ids (list): The jobs to order.
+
+    Returns:
+        list: The job IDs, best match first.
+    """
+    history = (
+        db.session.query(Application.year_of_graduation, Job.type_of_work)
+        .join(Job, Job.id == Application.job_id)
+        .filter(Application.student_id == student.id)
+        .order_by(Application.id.desc())
+        .all()
+    )
+    graduation_year = history[0][0] if history else None
+    features = student_features(student.education_level, student.resume, [row[1] for row in history])
+    return get_engine().rank(job_ids, features, graduation_year)
@@ -0,0 +1,271 @@
+from datetime import datetime
+
+import click
+from sqlalchemy import bindparam, inspect, text
+
+from . import db
+from .dates import current_term, parse_deadline
+from .models import Semester, WSTracker, job_semester
+from .sqlite import writer_engine
+from .tenancy import DEFAULT_TENANT_ID, TenantScoped
+from .taxonomy import LOOKUPS, resolve, split_semesters
+
+MIGRATIONS = []
+
+
+def migration(func):
+    """
+    Register a schema/data migration.
+
+    Migrations run once each, in the order they are defined, every time
+    ``upgrade`` is called. They must be written so that they also succeed on a
+    database freshly created by ``db.create_all()``.
+    """
+    MIGRATIONS.append(func)
+    return func
+
+
+def has_column(connection, table, column):
+    return column in {info["name"] for info in inspect(connection).get_columns(table)}
+
+
+def add_column(connection, table, column, ddl):
+    """
+    Add a column to an existing table unless it is already there.
+
+    Args:
+        connection (Connection): The migration connection.
+        table (str): The table name.
+        column (str): The column name.
+        ddl (str): The column type and constraints, e.g. "INTEGER REFERENCES department (id)".
+    """
+    if not has_column(connection, table, column):
+        table = connection.dialect.identifier_preparer.quote(table)
+        connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def create_index(connection, name, table, columns, unique=False):
+    """
+    Create an index unless one with the same name exists.
+
+    Args:
+        connection (Connection): The migration connection.
+        name (str): The index name.
+        table (str): The table name.
+        columns (list): The indexed columns, in order.
+        unique (bool): Whether to create a unique index.
+    """
+    if name not in {info["name"] for info in inspect(connection).get_indexes(table)}:
+        unique = "UNIQUE " if unique else ""
+        table = connection.dialect.identifier_preparer.quote(table)
+        connection.execute(text(f"CREATE {unique}INDEX {name} ON {table} ({', '.join(columns)})"))
+
+
+@migration
+def normalize_job_taxonomy(connection):
+    """
+    Move job departments, locations, types of work and semesters into lookup tables.
+    """
+    add_column(connection, "job", "department_id", "INTEGER REFERENCES department (id)")
+    add_column(connection, "job", "role_location_id", "INTEGER REFERENCES role_location (id)")
+    add_column(connection, "job", "type_of_work_id", "INTEGER REFERENCES work_type (id)")
+    for column in ("department_id", "role_location_id", "type_of_work_id"):
+        create_index(connection, f"ix_job_{column}", "job", [column])
+
+    rows = connection.execute(
+        text("SELECT id, department, role_location, type_of_work, hiring_semesters FROM job")
+    ).mappings().all()
+    if not rows:
+        return
+
+    for attribute, id_attribute, model in LOOKUPS:
+        ids = resolve(connection, model, [(row[attribute] or "").strip() for row in rows])
+        connection.execute(
+            text(f"UPDATE job SET {id_attribute} = :lookup_id WHERE id = :job_id"),
+            [{"lookup_id": ids.get((row[attribute] or "").strip()), "job_id": row["id"]} for row in rows],
+        )
+
+    semesters = {row["id"]: split_semesters(row["hiring_semesters"]) for row in rows}
+    ids = resolve(connection, Semester, [name for names in semesters.values() for name in names])
+    connection.execute(job_semester.delete())
+    links = [
+        {"job_id": job_id, "semester_id": ids[name]}
+        for job_id, names in semesters.items()
+        for name in names
+    ]
+    if links:
+        connection.execute(job_semester.insert(), links)
+
+
+@migration
+def type_job_deadlines(connection):
+    """
+    Parse the free-form job deadlines into the indexed ``deadline_at`` timestamp.
+    """
+    add_column(connection, "job", "deadline_at", "TIMESTAMP")
+    create_index(connection, "ix_job_deadline_at", "job", ["deadline_at"])
+
+    rows = connection.execute(text("SELECT id, application_deadline FROM job")).all()
+    if rows:
+        # Plain SQL: the model's later columns (and their onupdate hooks) may not exist yet
+        connection.execute(
+            text("UPDATE job SET deadline_at = :deadline WHERE id = :job_id")
+            .bindparams(bindparam("deadline", type_=db.DateTime)),
+            [{"job_id": job_id, "deadline": parse_deadline(deadline)} for job_id, deadline in rows],
+        )
+
+
+@migration
+def partition_applications_by_term(connection):
+    """
+    Tag applications with their term so past terms can be rolled into the archive.
+
+    Existing applications have no recorded term and are tagged with the current
+    one; re-tag them before rolling if they belong to earlier terms.
+    """
+    add_column(connection, "application", "term", "VARCHAR(20)")
+    connection.execute(text("UPDATE application SET term = :term WHERE term IS NULL"), {"term": current_term()})
+    for column in ("term", "job_id", "student_id"):
+        create_index(connection, f"ix_application_{column}", "application", [column])
+
+
+# How far along an application is; duplicates keep the furthest status
+STATUS_RANK = {"accepted": 2, "rejected": 1}
+
+
+@migration
+def deduplicate_applications(connection):
+    """
+    Merge duplicate applications of a student to the same job, then make them unique.
+
+    The earliest application of each pair is kept. It takes over the furthest
+    status any of its duplicates reached and a resume if it had none.
+    """
+    rows = connection.execute(text(
+        "SELECT id, student_id, job_id, status, resume FROM application "
+        "WHERE (student_id, job_id) IN ("
+        "SELECT student_id, job_id FROM application GROUP BY student_id, job_id HAVING COUNT(*) > 1"
+        ") ORDER BY id"
+    )).all()
+
+    groups = {}
+    for row in rows:
+        groups.setdefault((row.student_id, row.job_id), []).append(row)
+    for keeper, *duplicates in groups.values():
+        status = max((keeper, *duplicates), key=lambda row: STATUS_RANK.get(row.status, 0)).status
+        resume = keeper.resume
+        if resume is None:
+            resume = next((row.resume for row in duplicates if row.resume is not None), None)
+        connection.execute(
+            text("UPDATE application SET status = :status, resume = :resume WHERE id = :id"),
+            {"status": status, "resume": resume, "id": keeper.id},
+        )
+        connection.execute(
+            text("DELETE FROM application WHERE id IN :ids").bindparams(bindparam("ids", expanding=True)),
+            {"ids": [row.id for row in duplicates]},
+        )
+    create_index(connection, "uq_application_student_job", "application", ["student_id", "job_id"], unique=True)
+
+
+
+@migration
+def track_row_updates(connection):
+    """
+    Add the ``updated_at`` columns delta syncs filter on.
+
+    Existing rows are stamped with the migration time, so the first delta sync
+    after upgrading returns them all once.
+    """
+    now = datetime.utcnow()
+    for table in ("job", "team", "ws_tracker"):
+        add_column(connection, table, "updated_at", "TIMESTAMP")
+        connection.execute(
+            text(f"UPDATE {table} SET updated_at = :now WHERE updated_at IS NULL")
+            .bindparams(bindparam("now", type_=db.DateTime)),
+            {"now": now},
+        )
+        create_index(connection, f"ix_{table}_updated_at", table, ["updated_at"])
+
+
+
+@migration
+def add_tenants(connection):
+    """
+    Give every tenant-scoped table a ``tenant_id`` and its tenant-leading indexes.
+
+    Existing rows join the default tenant, which ``create_app`` creates. The
+    column is added without a foreign key: SQLite can't add a referencing
+    column with a non-NULL default; fresh databases get the key from the model.
+    """
+    tables = [mapper.local_table for mapper in db.Model.registry.mappers if issubclass(mapper.class_, TenantScoped)]
+    for table in tables:
+        add_column(connection, table.name, "tenant_id", f"INTEGER NOT NULL DEFAULT {DEFAULT_TENANT_ID}")
+        for index in table.indexes:
+            columns = [column.name for column in index.columns]
+            if columns[0] == "tenant_id":
+                create_index(connection, index.name, table.name, columns, unique=index.unique)
+    # Superseded by its tenant-leading replacement
+    connection.execute(text("DROP INDEX IF EXISTS ix_tombstone_table_name_deleted_at"))
+
+
+@migration
+def index_tracker_grid(connection):
+    """
+    Add the indexes the WS tracker grid sorts and filters with.
+    """
+    for index in WSTracker.__table__.indexes:
+        create_index(connection, index.name, "ws_tracker", [column.name for column in index.columns])
+
+
+@migration
+def count_accepted_applications(connection):
+    """
+    Add ``job.accepted_count`` (see ``backend.capacity``), counted from the accepted applications.
+    """
+    add_column(connection, "job", "accepted_count", "INTEGER NOT NULL DEFAULT 0")
+    connection.execute(text(
+        "UPDATE job SET accepted_count = ("
+        "SELECT COUNT(*) FROM application WHERE application.job_id = job.id AND application.status = 'accepted')"
+    ))
+
+
+def upgrade():
+    """
+    Create missing tables and run the migrations that haven't run yet.
+
+    Returns:
+        list: The names of the migrations that ran.
+    """
+    db.create_all()
+    with writer_engine().begin() as connection:
+        connection.execute(text(
+            "CREATE TABLE IF NOT EXISTS schema_migration (name VARCHAR(100) PRIMARY KEY, applied_at TIMESTAMP)"
+        ))
+        applied = set(connection.execute(text("SELECT name FROM schema_migration")).scalars())
+
+    ran = []
+    for func in MIGRATIONS:
+        if func.__name__ in applied:
+            continue
+        with writer_engine().begin() as connection:
+            func(connection)
+            connection.execute(
+                text("INSERT INTO schema_migration (name, applied_at) VALUES (:name, :applied_at)"),
+                {"name": func.__name__, "applied_at": datetime.utcnow()},
+            )
+        ran.append(func.__name__)
+    return ran
+
+
+def init_app(app):
+    """
+    Register the ``flask upgrade-db`` command.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    @app.cli.command("upgrade-db")
+    def upgrade_db_command():
+        """Create missing tables and run pending data migrations."""
+        ran = upgrade()
+        click.echo(f"Applied {len(ran)} migration(s): {', '.join(ran)}" if ran else "Database is up to date.")
@@ -1,10 +1,23 @@
+from datetime import datetime
+
 from . import db, login_manager
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy.orm import backref
+from sqlalchemy.orm import backref, validates
+from .dates import current_term, parse_deadline
+from .tenancy import TenantScoped
+
+
+class Tenant(db.Model):
+    """
+    A campus or program sharing the deployment. Every ``TenantScoped`` row belongs to one.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    slug = db.Column(db.String(50), nullable=False, unique=True)
+    name = db.Column(db.String(100), nullable=False)
 
 
-class User(db.Model, UserMixin):
+class User(TenantScoped, db.Model, UserMixin):
     """
     Represents a user in the system.
 
@@ -20,7 +33,9 @@ class User(db.Model, UserMixin):
         resume (str): The resume of the user (only applicable for students).
         jobs (list): The list of jobs posted by the user (only applicable for employers).
         applications (list): The list of applications submitted by the user (only applicable for students).
+        tenant_id (int): The campus or program the user belongs to. Emails are unique across tenants.
     """
+    __table_args__ = (db.Index("ix_user_tenant_id_role", "tenant_id", "role"),)
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(100), nullable=False, unique=True)
@@ -57,7 +72,7 @@ class User(db.Model, UserMixin):
     def check_password(self, password):
         return check_password_hash(self.password, password)
 
-    def to_dict(self):
+    def to_dict(self, include_resume=True):
         user_dict = {
             "id": self.id,
             "username": self.username,
@@ -71,9 +86,10 @@ class User(db.Model, UserMixin):
         if self.role == "Student":
             user_dict.update({
                 "education_level": self.education_level,
-                "resume": self.resume,
                 "applications": [app.to_dict() for app in self.applications],
             })
+            if include_resume:
+                user_dict["resume"] = self.resume
         elif self.role == "Employer":
             user_dict.update({
                 "jobs": [job.to_dict() for job in self.jobs]
@@ -82,10 +98,61 @@ class User(db.Model, UserMixin):
         return user_dict
 
 
-class Job(db.Model):
+class Semester(db.Model):
+    """
+    Lookup table of hiring semesters (e.g. "Fall 2026").
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+
+class Department(db.Model):
+    """
+    Lookup table of job departments.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+
+class RoleLocation(db.Model):
+    """
+    Lookup table of job locations.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+
+class WorkType(db.Model):
+    """
+    Lookup table of job types of work.
+    """
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False, unique=True)
+
+
+job_semester = db.Table(
+    "job_semester",
+    db.Column("job_id", db.Integer, db.ForeignKey("job.id", ondelete="CASCADE"), primary_key=True),
+    db.Column("semester_id", db.Integer, db.ForeignKey("semester.id"), primary_key=True),
+    # Semester filters look jobs up by semester first
+    db.Index("ix_job_semester_semester_id_job_id", "semester_id", "job_id"),
+)
+
+
+class Job(TenantScoped, db.Model):
     """
     Represents a job in the system.
+
+    The ``department``, ``role_location``, ``type_of_work`` and
+    ``hiring_semesters`` strings are kept as submitted; their normalized
+    lookup ids and semester associations are maintained by ``backend.taxonomy``.
     """
+    __table_args__ = (
+        db.Index("ix_job_tenant_id_deadline_at", "tenant_id", "deadline_at"),
+        db.Index("ix_job_tenant_id_department_id", "tenant_id", "department_id"),
+        db.Index("ix_job_tenant_id_updated_at", "tenant_id", "updated_at"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     employer_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
     title = db.Column(db.String(100), nullable=False)
@@ -95,13 +162,27 @@ class Job(db.Model):
     hiring_semesters = db.Column(db.String(100), nullable=False)
     min_students = db.Column(db.Integer, nullable=False)
     max_students = db.Column(db.Integer, nullable=False)
+    # Accepted applications; only changed through backend.capacity so it never exceeds max_students
+    accepted_count = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     role_location = db.Column(db.String(100), nullable=False)
     type_of_work = db.Column(db.String(100), nullable=False)
     prerequisites = db.Column(db.String(200))
     brief_description = db.Column(db.Text, nullable=False)
     more_details = db.Column(db.Text)
     application_deadline = db.Column(db.String(100), nullable=False)
+    department_id = db.Column(db.Integer, db.ForeignKey("department.id"), index=True)
+    role_location_id = db.Column(db.Integer, db.ForeignKey("role_location.id"), index=True)
+    type_of_work_id = db.Column(db.Integer, db.ForeignKey("work_type.id"), index=True)
+    # Parsed from application_deadline; NULL when it can't be parsed (treated as open)
+    deadline_at = db.Column(db.DateTime, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     applications = db.relationship("Application", backref="job", lazy=True)
+    semesters = db.relationship("Semester", secondary=job_semester, lazy=True)
+
+    @validates("application_deadline")
+    def _parse_application_deadline(self, key, value):
+        self.deadline_at = parse_deadline(value)
+        return value
 
     def to_dict(self):
         return {
@@ -123,18 +204,121 @@ class Job(db.Model):
         }
 
 
-class Application(db.Model):
+class JobArchive(TenantScoped, db.Model):
+    """
+    Cold storage for job postings whose deadline has long passed.
+
+    Rows keep the id they had in the ``job`` table.
+    """
+    __tablename__ = "job_archive"
+    __table_args__ = (db.Index("ix_job_archive_tenant_id_archived_at", "tenant_id", "archived_at"),)
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    employer_id = db.Column(db.Integer, nullable=False)
+    title = db.Column(db.String(100), nullable=False)
+    department = db.Column(db.String(100), nullable=False)
+    manager_name = db.Column(db.String(100), nullable=False)
+    manager_email = db.Column(db.String(100), nullable=False)
+    hiring_semesters = db.Column(db.String(100), nullable=False)
+    min_students = db.Column(db.Integer, nullable=False)
+    max_students = db.Column(db.Integer, nullable=False)
+    role_location = db.Column(db.String(100), nullable=False)
+    type_of_work = db.Column(db.String(100), nullable=False)
+    prerequisites = db.Column(db.String(200))
+    brief_description = db.Column(db.Text, nullable=False)
+    more_details = db.Column(db.Text)
+    application_deadline = db.Column(db.String(100), nullable=False)
+    deadline_at = db.Column(db.DateTime)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "employer_id": self.employer_id,
+            "title": self.title,
+            "department": self.department,
+            "manager_name": self.manager_name,
+            "manager_email": self.manager_email,
+            "hiring_semesters": self.hiring_semesters,
+            "min_students": self.min_students,
+            "max_students": self.max_students,
+            "role_location": self.role_location,
+            "type_of_work": self.type_of_work,
+            "prerequisites": self.prerequisites,
+            "brief_description": self.brief_description,
+            "more_details": self.more_details,
+            "application_deadline": self.application_deadline,
+            "archived_at": self.archived_at.isoformat(),
+        }
+
+
+class Application(TenantScoped, db.Model):
     """
     Represents a job application made by a student.
+
+    Only applications of terms that haven't been rolled into
+    ``ApplicationArchive`` live here. A student applies to a job at most once.
     """
+    __table_args__ = (
+        db.Index("uq_application_student_job", "student_id", "job_id", unique=True),
+        db.Index("ix_application_tenant_id_job_id", "tenant_id", "job_id"),
+        db.Index("ix_application_tenant_id_student_id", "tenant_id", "student_id"),
+        db.Index("ix_application_tenant_id_term", "tenant_id", "term"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
-    student_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False)
-    job_id = db.Column(db.Integer, db.ForeignKey("job.id"))
+    student_id = db.Column(db.Integer, db.ForeignKey("user.id"), nullable=False, index=True)
+    job_id = db.Column(db.Integer, db.ForeignKey("job.id"), index=True)
     status = db.Column(db.String(100), default="pending")
     email_address = db.Column(db.String(100), nullable=False)
     year_of_graduation = db.Column(db.Integer, nullable=False)
     resume = db.Column(db.LargeBinary, nullable=True)
     candidate_statement = db.Column(db.Text, nullable=False)
+    term = db.Column(db.String(20), nullable=False, default=current_term, index=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "student_id": self.student_id,
+            "job_id": self.job_id,
+            "status": self.status,
+            "email_address": self.email_address,
+            "year_of_graduation": self.year_of_graduation,
+            "candidate_statement": self.candidate_statement,
+            "term": self.term,
+        }
+
+
+class ApplicationArchive(TenantScoped, db.Model):
+    """
+    Cold storage for the applications of past terms.
+
+    On PostgreSQL the table is partitioned by term (one partition per rolled
+    term); elsewhere it is a plain table indexed by term.
+    """
+    __tablename__ = "application_archive"
+    __table_args__ = (
+        db.Index("ix_application_archive_tenant_id_term", "tenant_id", "term"),
+        {"postgresql_partition_by": "LIST (term)"},
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    term = db.Column(db.String(20), primary_key=True)
+    student_id = db.Column(db.Integer, nullable=False, index=True)
+    job_id = db.Column(db.Integer, index=True)
+    status = db.Column(db.String(100))
+    email_address = db.Column(db.String(100), nullable=False)
+    year_of_graduation = db.Column(db.Integer, nullable=False)
+    resume = db.Column(db.LargeBinary, nullable=True)
+    candidate_statement = db.Column(db.Text, nullable=False)
+    archived_at = db.Column(db.DateTime, nullable=False)
+
+    # Archived applications keep their relationship to the student for display
+    student = db.relationship(
+        "User",
+        primaryjoin=lambda: User.id == db.foreign(ApplicationArchive.student_id),
+        viewonly=True,
+    )
 
     def to_dict(self):
         return {
@@ -145,13 +329,16 @@ class Application(db.Model):
             "email_address": self.email_address,
             "year_of_graduation": self.year_of_graduation,
             "candidate_statement": self.candidate_statement,
+            "term": self.term,
         }
 
 
-class Team(db.Model):
+class Team(TenantScoped, db.Model):
     """
     Represents a team in the system.
     """
+    __table_args__ = (db.Index("ix_team_tenant_id_updated_at", "tenant_id", "updated_at"),)
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     manager = db.Column(db.String(100), nullable=False)
@@ -160,6 +347,7 @@ class Team(db.Model):
     contact = db.Column(db.String(100), nullable=True)
     priority = db.Column(db.String(50), nullable=False)
     recruiting_for = db.Column(db.String(100), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     def to_dict(self):
         return {
@@ -174,10 +362,20 @@ class Team(db.Model):
         }
 
 
-class WSTracker(db.Model):
+class WSTracker(TenantScoped, db.Model):
     """
     Represents a work-study tracker in the system.
     """
+    __table_args__ = (
+        db.Index("ix_ws_tracker_tenant_id_updated_at", "tenant_id", "updated_at"),
+        # Grid sorts and filters (see ws_tracker_bp); the trailing id serves keyset pagination
+        db.Index("ix_ws_tracker_tenant_id_full_name", "tenant_id", "full_name", "id"),
+        db.Index("ix_ws_tracker_tenant_id_department_name", "tenant_id", "department_name", "full_name", "id"),
+        db.Index("ix_ws_tracker_tenant_id_expected_grad_year", "tenant_id", "expected_grad_year", "full_name", "id"),
+        db.Index("ix_ws_tracker_tenant_id_merge_status", "tenant_id", "merge_status", "full_name", "id"),
+        db.Index("ix_ws_tracker_tenant_id_contractor_status", "tenant_id", "contractor_status", "full_name", "id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     student_id = db.Column(db.String(100), nullable=False)
     minerva_email = db.Column(db.String(100), nullable=False)
@@ -193,6 +391,7 @@ class WSTracker(db.Model):
     contractor_status = db.Column(db.String(50), nullable=True)
     notes = db.Column(db.Text, nullable=True)
     merge_status = db.Column(db.String(50), nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
 
     def to_dict(self):
         return {
@@ -214,6 +413,52 @@ class WSTracker(db.Model):
         }
 
 
+
+class ChangeLog(TenantScoped, db.Model):
+    """
+    Outbox of row changes, appended by ``backend.audit`` in the same transaction.
+
+    ``id`` is the cursor change feeds page by. ``changes`` holds only the
+    columns that changed: ``{column: [old, new]}`` for updates and the row's
+    values for inserts and deletes.
+    """
+    __tablename__ = "change_log"
+    __table_args__ = (
+        db.Index("ix_change_log_table_name_row_id", "table_name", "row_id"),
+        db.Index("ix_change_log_tenant_id_id", "tenant_id", "id"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    operation = db.Column(db.String(10), nullable=False)  # insert, update or delete
+    changes = db.Column(db.JSON, nullable=False)
+    user_id = db.Column(db.Integer, nullable=True)
+    changed_at = db.Column(db.DateTime, nullable=False)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "table": self.table_name,
+            "row_id": self.row_id,
+            "operation": self.operation,
+            "changes": self.changes,
+            "user_id": self.user_id,
+            "changed_at": self.changed_at.isoformat(),
+        }
+
+
+class Tombstone(TenantScoped, db.Model):
+    """
+    Records a deleted row so delta syncs can tell clients to drop it.
+    """
+    __table_args__ = (db.Index("ix_tombstone_tenant_id_table_name_deleted_at", "tenant_id", "table_name", "deleted_at"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    table_name = db.Column(db.String(50), nullable=False)
+    row_id = db.Column(db.Integer, nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False)
+
 @login_manager.user_loader
 def load_user(user_id):
     return User.query.get(int(user_id))
@@ -0,0 +1,506 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import queue
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import current_app, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+
+from . import db
+from .sqlite import writer_engine
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+TRACEPARENT_HEADER = "traceparent"
+
+# OTLP span kinds
+INTERNAL, SERVER, CLIENT = 1, 2, 3
+# OTLP status codes
+STATUS_OK, STATUS_ERROR = 1, 2
+
+# Client-supplied IDs end up in logs and SQL comments, so only plain tokens are kept
+_SAFE_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span = contextvars.ContextVar("current_span", default=None)
+
+
+# Structured logging
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``
+_RECORD_ATTRIBUTES = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "trace_id", "span_id"}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format records as one JSON object per line, including the request and
+    trace IDs and any ``extra=`` fields.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("request_id", "trace_id", "span_id"):
+            if getattr(record, key, None):
+                entry[key] = getattr(record, key)
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """
+    Stamp records with the current request and trace IDs.
+
+    Runs in the request's thread before the record is queued, while the
+    request context is still available.
+    """
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get("request_id")
+        current = _current_span.get()
+        if current is not None:
+            record.trace_id = current.trace_id
+            record.span_id = current.span_id if current.sampled else None
+        return True
+
+
+class _StderrHandler(logging.StreamHandler):
+    # Looks up sys.stderr on every write so redirections (e.g. by test runners) are followed
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+class _StructuredQueueHandler(QueueHandler):
+    def prepare(self, record):
+        # Unlike QueueHandler's, keeps the record's fields for the listener's
+        # JsonFormatter; only the message and exception are resolved here,
+        # since their arguments may change once the request moves on
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(level="INFO", filename=None):
+    """
+    Send the ``backend`` loggers (``app.logger`` included) through a queue.
+
+    Request threads only enqueue records; a listener thread formats them as
+    JSON and writes them out, so slow stdout or disks never block a request.
+    Safe to call once per app: the handler is installed once per process.
+
+    Args:
+        level (str): The minimum level logged.
+        filename (str, optional): Log to this file instead of stderr.
+    """
+    root = logging.getLogger("backend")
+    root.setLevel(level)
+    if any(isinstance(handler, _StructuredQueueHandler) for handler in root.handlers):
+        return
+
+    output = logging.FileHandler(filename) if filename else _StderrHandler()
+    output.setFormatter(JsonFormatter())
+    records = queue.SimpleQueue()
+    handler = _StructuredQueueHandler(records)
+    handler.addFilter(ContextFilter())
+    listener = QueueListener(records, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root.addHandler(handler)
+    # Flask adds its own stderr handler to app.logger unless one is found here
+    root.propagate = False
+
+
+# Tracing
+
+def _attribute(key, value):
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+class Span:
+    """
+    A timed operation of a trace, in OpenTelemetry's data model.
+
+    Unsampled requests get a single unsampled root span that only carries
+    the trace ID for logs and propagation; no child spans are created for it.
+    """
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "sampled", "exporter",
+                 "start_ns", "end_ns", "attributes", "status", "message")
+
+    def __init__(self, name, trace_id, parent_id=None, sampled=True, exporter=None, kind=INTERNAL, attributes=None):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.exporter = exporter
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.attributes = attributes or {}
+        self.status = STATUS_OK
+        self.message = None
+
+    @property
+    def traceparent(self):
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def child(self, name, kind=INTERNAL, **attributes):
+        return Span(name, self.trace_id, self.span_id, True, self.exporter, kind, attributes)
+
+    def fail(self, error):
+        self.status = STATUS_ERROR
+        self.message = f"{type(error).__name__}: {error}"
+
+    def end(self):
+        self.end_ns = time.time_ns()
+        if self.sampled and self.exporter is not None:
+            self.exporter.export(self)
+
+    def to_otlp(self):
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_attribute(key, value) for key, value in self.attributes.items() if value is not None],
+            "status": {"code": self.status, **({"message": self.message} if self.message else {})},
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class FileSpanExporter:
+    """
+    Write finished spans to a file as OTLP/JSON, one export request per line.
+
+    The format is the one the OpenTelemetry Collector's ``otlpjsonfile``
+    receiver reads. Spans are batched by a background thread, so ending a
+    span only costs a queue put.
+
+    Args:
+        path (str): The file to append to.
+        service_name (str): The ``service.name`` resource attribute.
+        batch_size (int): The most spans written per line.
+        interval (float): Seconds between flushes of a partial batch.
+    """
+
+    def __init__(self, path, service_name="workstudy-backend", batch_size=512, interval=1.0):
+        self.path = path
+        self.resource = {"attributes": [_attribute("service.name", service_name)]}
+        self.batch_size = batch_size
+        self.interval = interval
+        self._spans = queue.SimpleQueue()
+        self._flushed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+    def export(self, span):
+        self._spans.put(span)
+
+    def flush(self, timeout=5):
+        """Write out every span ended so far."""
+        self._flushed.clear()
+        self._spans.put(None)
+        self._flushed.wait(timeout)
+
+    def _run(self):
+        batch = []
+        while True:
+            try:
+                span = self._spans.get(timeout=self.interval)
+            except queue.Empty:
+                span = None
+                flush_requested = False
+            else:
+                flush_requested = span is None
+            if span is not None:
+                batch.append(span)
+            if batch and (span is None or len(batch) >= self.batch_size):
+                self._write(batch)
+                batch = []
+            if flush_requested:
+                self._flushed.set()
+
+    def _write(self, spans):
+        line = json.dumps({"resourceSpans": [{
+            "resource": self.resource,
+            "scopeSpans": [{"scope": {"name": "backend"}, "spans": [span.to_otlp() for span in spans]}],
+        }]})
+        try:
+            with open(self.path, "a") as output:
+                output.write(line + "\n")
+        except OSError:
+            logger.exception("Could not export %d span(s) to %s", len(spans), self.path)
+
+
+class Tracer:
+    """
+    Starts the root span of each request, sampling a fraction of them.
+
+    Sampling is decided once per trace (head sampling): a request arriving
+    with a W3C ``traceparent`` header follows the caller's decision, any
+    other is sampled with probability ``sample_rate``. Unsampled requests
+    cost a random number and one small object.
+
+    Args:
+        exporter (FileSpanExporter | None): Where sampled spans go; None disables tracing.
+        sample_rate (float): The fraction of new traces to sample.
+    """
+
+    def __init__(self, exporter=None, sample_rate=0.01):
+        self.exporter = exporter
+        self.sample_rate = sample_rate if exporter is not None else 0.0
+
+    def start(self, name, traceparent=None, **attributes):
+        match = _TRACEPARENT.match(traceparent or "")
+        if match:
+            trace_id, parent_id, flags = match.groups()
+            sampled = self.exporter is not None and int(flags, 16) & 1 == 1
+        else:
+            trace_id, parent_id = secrets.token_hex(16), None
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        return Span(name, trace_id, parent_id, sampled, self.exporter, SERVER, attributes)
+
+
+def current_span():
+    """Return the active span, or None outside a traced request."""
+    return _current_span.get()
+
+
+@contextmanager
+def span(name, kind=INTERNAL, **attributes):
+    """
+    Time a block as a child of the active span, if the trace is sampled.
+
+    Args:
+        name (str): The span name, e.g. "serialize".
+        kind (int): INTERNAL, SERVER or CLIENT.
+        **attributes: Span attributes.
+
+    Yields:
+        Span | None: The span, or None when the trace isn't sampled.
+    """
+    parent = _current_span.get()
+    if parent is None or not parent.sampled:
+        yield None
+        return
+    child = parent.child(name, kind, **attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except Exception as error:
+        child.fail(error)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def traced(view, name):
+    """
+    Wrap a view function in a "handler" span.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return view(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_views(app):
+    """
+    Time every registered view as a "handler <endpoint>" span.
+
+    Args:
+        app (Flask): The Flask application, with its blueprints registered.
+    """
+    for endpoint, view in app.view_functions.items():
+        if endpoint != "static":
+            app.view_functions[endpoint] = traced(view, f"handler {endpoint}")
+
+
+class TracingJSONProvider(DefaultJSONProvider):
+    """
+    Flask's JSON provider, with serialization timed as its own span.
+    """
+
+    def dumps(self, obj, **kwargs):
+        with span("serialize"):
+            return super().dumps(obj, **kwargs)
+
+
+# Request hooks
+
+def _start_request():
+    request_id = request.headers.get(REQUEST_ID_HEADER, "")
+    g.request_id = request_id if _SAFE_ID.match(request_id) else secrets.token_hex(8)
+    g.request_started = time.perf_counter()
+
+    root = current_app.extensions["tracer"].start(
+        f"{request.method} {request.url_rule.rule if request.url_rule else request.path}",
+        request.headers.get(TRACEPARENT_HEADER),
+        **{"http.request.method": request.method, "url.path": request.path, "request.id": g.request_id},
+    )
+    g.span_token = _current_span.set(root)
+    g.root_span = root
+
+
+def _finish_request(response):
+    response.headers[REQUEST_ID_HEADER] = g.request_id
+    root = g.get("root_span")
+    if root is not None:
+        root.attributes["http.response.status_code"] = response.status_code
+        if response.status_code >= 500:
+            root.status = STATUS_ERROR
+        if root.sampled:
+            response.headers[TRACEPARENT_HEADER] = root.traceparent
+    if current_app.config["LOG_REQUESTS"] and logger.isEnabledFor(logging.INFO):
+        logger.info(
+            "%s %s %s", request.method, request.path, response.status_code,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": round((time.perf_counter() - g.request_started) * 1000, 2),
+            },
+        )
+    return response
+
+
+def _end_request(exception):
+    root = g.pop("root_span", None)
+    if root is None:
+        return
+    if exception is not None:
+        root.fail(exception)
+    try:
+        _current_span.reset(g.pop("span_token"))
+    except ValueError:  # The request ran in a copied context
+        _current_span.set(None)
+    root.end()
+
+
+# SQL instrumentation
+
+def _sql_comment():
+    """
+    Build the sqlcommenter-style comment tagging a statement with its request.
+    """
+    fields = []
+    if has_request_context() and g.get("request_id"):
+        fields.append(f"request_id='{g.request_id}'")
+    current = _current_span.get()
+    if current is not None:
+        fields.append(f"traceparent='{current.traceparent}'")
+    return f" /*{','.join(fields)}*/" if fields else ""
+
+
+def instrument_engine(engine, comments=True):
+    """
+    Tag SQL statements with the request ID and trace context, and time them as spans.
+
+    Comments let a slow query in the database's own logs be traced back to
+    the request that issued it. They make statement texts unique per request,
+    so drivers that cache prepared statements by text lose that cache.
+
+    Args:
+        engine (Engine): The engine to instrument.
+        comments (bool): Append the comment to statements.
+    """
+    @event.listens_for(engine, "before_cursor_execute", retval=True)
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        parent = _current_span.get()
+        if parent is not None and parent.sampled:
+            child = parent.child("db.query", CLIENT, **{
+                "db.system": engine.dialect.name,
+                "db.statement": statement[:2000],
+            })
+            conn.info.setdefault("observability.spans", []).append(child)
+        if comments:
+            statement += _sql_comment()
+        return statement, parameters
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        spans = conn.info.get("observability.spans")
+        if spans:
+            spans.pop().end()
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        spans = exception_context.connection.info.get("observability.spans") if exception_context.connection else None
+        if spans:
+            child = spans.pop()
+            child.fail(exception_context.original_exception)
+            child.end()
+
+
+def init_app(app):
+    """
+    Set up structured logging, request IDs, tracing and SQL comments.
+
+    Initialize it before the other extensions, so that its hooks run first
+    and every response (rejections included) carries a request ID. Handler
+    spans are added by ``trace_views`` once the blueprints are registered.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    config = app.config
+    configure_logging(config["LOG_LEVEL"], config.get("LOG_FILE"))
+
+    exporter = FileSpanExporter(config["TRACE_FILE"]) if config.get("TRACE_FILE") else None
+    app.extensions["tracer"] = Tracer(exporter, config["TRACE_SAMPLE_RATE"])
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.teardown_request(_end_request)
+    app.json = TracingJSONProvider(app)
+
+    with app.app_context():
+        for engine in {db.engine, writer_engine()}:
+            instrument_engine(engine, comments=config["SQL_COMMENTS"])
@@ -0,0 +1,217 @@
+from collections import defaultdict
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import Bounds, LinearConstraint, milp
+from sqlalchemy import update
+
+from . import db
+from .capacity import accept_in_bulk
+from .models import Application, Job, Team
+
+PENDING = "pending"
+
+# Relative weight of the objective terms. Filling a job up to its minimum is
+# worth more than any single preference, so understaffed jobs are served first.
+PREFERENCE_WEIGHT = 1.0
+PRIORITY_WEIGHT = 0.5
+MINIMUM_BONUS = 2.0
+
+PRIORITIES = {"high": 1.0, "medium": 0.5, "low": 0.0}
+
+
+def priority_score(priority):
+    """
+    Map a ``Team.priority`` value to [0, 1].
+
+    Accepts the "High"/"Medium"/"Low" labels or a numeric rank where 1 is the
+    highest priority.
+
+    Args:
+        priority (str): The team priority.
+
+    Returns:
+        float: The normalized priority.
+    """
+    label = (priority or "").strip().lower()
+    if label in PRIORITIES:
+        return PRIORITIES[label]
+    try:
+        return 1.0 / max(int(label), 1)
+    except ValueError:
+        return PRIORITIES["medium"]
+
+
+def solve(applications, jobs, teams):
+    """
+    Compute the placement maximizing preference and team priority.
+
+    The problem is a min-cost flow (student -> application -> job -> team)
+    written as an integer program and solved by HiGHS. Apart from the job
+    minimum counters its constraint matrix is a network matrix, so the LP
+    relaxation is (nearly always) integral and branch and bound ends at the root.
+
+    Args:
+        applications (list): ``(application_id, student_id, job_id, preference_rank)``
+            tuples, where rank 0 is the student's first choice.
+        jobs (dict): job_id -> ``(team_id or None, open_slots, min_students)``.
+        teams (dict): team_id -> ``(open_slots, priority)``.
+
+    Returns:
+        dict: ``assignments`` (list of ``(application_id, student_id, job_id, score)``)
+        and ``objective``.
+    """
+    applications = [application for application in applications if jobs.get(application[2], (None, 0))[1] > 0]
+    if not applications:
+        return {"assignments": [], "objective": 0.0}
+
+    job_ids = sorted({application[2] for application in applications})
+    job_rows = {job_id: row for row, job_id in enumerate(job_ids)}
+    student_rows = {}
+    team_rows = {}
+    for _, student_id, job_id, _ in applications:
+        student_rows.setdefault(student_id, len(student_rows))
+        team_id = jobs[job_id][0]
+        if team_id in teams:
+            team_rows.setdefault(team_id, len(team_rows))
+
+    n_apps, n_jobs = len(applications), len(job_ids)
+    n_students, n_teams = len(student_rows), len(team_rows)
+
+    # Variables: one per application, then one "minimum filled" counter per job.
+    # Rows: one per student, job and team (capacities), then one per job
+    # bounding its counter by the students placed there.
+    job_offset = n_students
+    team_offset = job_offset + n_jobs
+    minimum_offset = team_offset + n_teams
+    weights = np.empty(n_apps)
+    rows, cols, data = [], [], []
+    for column, (_, student_id, job_id, rank) in enumerate(applications):
+        team_id = jobs[job_id][0]
+        priority = teams[team_id][1] if team_id in team_rows else PRIORITIES["medium"]
+        weights[column] = PREFERENCE_WEIGHT / (1 + rank) + PRIORITY_WEIGHT * priority
+        rows += [student_rows[student_id], job_offset + job_rows[job_id], minimum_offset + job_rows[job_id]]
+        cols += [column] * 3
+        data += [1.0, 1.0, -1.0]
+        if team_id in team_rows:
+            rows.append(team_offset + team_rows[team_id])
+            cols.append(column)
+            data.append(1.0)
+    for row in range(n_jobs):
+        rows.append(minimum_offset + row)
+        cols.append(n_apps + row)
+        data.append(1.0)
+
+    n_rows = minimum_offset + n_jobs
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(n_rows, n_apps + n_jobs))
+    upper = np.concatenate([
+        np.ones(n_students),
+        [jobs[job_id][1] for job_id in job_ids],
+        np.zeros(n_teams),
+        np.zeros(n_jobs),
+    ])
+    for team_id, row in team_rows.items():
+        upper[team_offset + row] = max(teams[team_id][0], 0)
+
+    objective = np.concatenate([weights, np.full(n_jobs, MINIMUM_BONUS)])
+    result = milp(
+        -objective,
+        constraints=LinearConstraint(matrix, -np.inf, upper),
+        bounds=Bounds(0, np.concatenate([np.ones(n_apps), [min(jobs[job_id][2], jobs[job_id][1]) for job_id in job_ids]])),
+        integrality=np.ones(n_apps + n_jobs),
+    )
+    if result.x is None:
+        raise RuntimeError(f"Placement solver failed: {result.message}")
+
+    chosen = np.flatnonzero(result.x[:n_apps] > 0.5)
+    assignments = [
+        (applications[column][0], applications[column][1], applications[column][2], round(float(weights[column]), 4))
+        for column in chosen
+    ]
+    return {"assignments": assignments, "objective": round(float(-result.fun), 4)}
+
+
+def load_problem():
+    """
+    Load the pending applications and remaining capacities from the database.
+
+    Jobs belong to the team whose name matches their department. Capacities are
+    reduced by the applications already accepted (``Job.accepted_count``).
+
+    Returns:
+        tuple: ``(applications, jobs, teams)`` as expected by ``solve``.
+    """
+    teams_by_name = {}
+    teams = {}
+    for team_id, name, max_students, priority in db.session.query(Team.id, Team.name, Team.max_students, Team.priority):
+        teams_by_name[name.strip().lower()] = team_id
+        teams[team_id] = [max_students, priority_score(priority)]
+
+    jobs = {}
+    for job_id, department, min_students, max_students, filled in db.session.query(
+        Job.id, Job.department, Job.min_students, Job.max_students, Job.accepted_count
+    ):
+        team_id = teams_by_name.get((department or "").strip().lower())
+        jobs[job_id] = (team_id, max(max_students - filled, 0), max(min_students - filled, 0))
+        if team_id is not None:
+            teams[team_id][0] -= filled
+
+    ranks = defaultdict(int)
+    applications = []
+    pending = (
+        db.session.query(Application.id, Application.student_id, Application.job_id)
+        .filter(db.or_(Application.status == PENDING, Application.status.is_(None)))
+        .order_by(Application.student_id, Application.id)
+    )
+    for application_id, student_id, job_id in pending:
+        applications.append((application_id, student_id, job_id, ranks[student_id]))
+        ranks[student_id] += 1
+
+    return applications, jobs, {team_id: tuple(values) for team_id, values in teams.items()}
+
+
+def plan():
+    """
+    Compute the placement for the current database state without writing it.
+
+    Returns:
+        dict: The ``solve`` result plus the number of students left unplaced.
+    """
+    applications, jobs, teams = load_problem()
+    result = solve(applications, jobs, teams)
+    placed = {assignment[1] for assignment in result["assignments"]}
+    result["unplaced_students"] = len({application[1] for application in applications} - placed)
+    return result
+
+
+def commit(result, reject_others=False):
+    """
+    Write a placement in bulk.
+
+    Seats are reserved per job (see ``backend.capacity.accept_in_bulk``): if
+    other acceptances filled a job since the plan was computed, its assigned
+    applications stay pending. Doesn't commit.
+
+    Args:
+        result (dict): The output of ``plan``.
+        reject_others (bool): Also mark the other pending applications of placed
+            students as rejected.
+
+    Returns:
+        tuple: The IDs of the applications accepted and of those rejected (sets).
+    """
+    application_ids = [assignment[0] for assignment in result["assignments"]]
+    if not application_ids:
+        return set(), set()
+    accepted = set(accept_in_bulk(application_ids))
+    rejected = set()
+    if reject_others and accepted:
+        student_ids = {assignment[1] for assignment in result["assignments"] if assignment[0] in accepted}
+        rejected = set(db.session.execute(
+            update(Application)
+            .where(Application.student_id.in_(student_ids), Application.status == PENDING)
+            .values(status="rejected")
+            .returning(Application.id),
+            execution_options={"synchronize_session": False},
+        ).scalars())
+    return accepted, rejected
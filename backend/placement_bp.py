@@ -0,0 +1,78 @@
+from flask import Blueprint, request, jsonify
+from sqlalchemy.orm import joinedload
+from . import placement
+from .events import publish
+from .models import Application
+from .rbac import requires
+from .unit_of_work import on_commit, transactional
+
+placement_bp = Blueprint("placement", __name__)
+
+
+def _assignments(assignments):
+    return [
+        {"application_id": application_id, "student_id": student_id, "job_id": job_id, "score": score}
+        for application_id, student_id, job_id, score in assignments
+    ]
+
+
+def _serialize(result):
+    return {
+        "assignments": _assignments(result["assignments"]),
+        "objective": result["objective"],
+        "unplaced_students": result["unplaced_students"],
+    }
+
+
+@placement_bp.route("/placements/dry-run", methods=["POST"])
+@requires("placements:run")
+def dry_run():
+    """
+    Compute the optimal placement of pending applications without saving it.
+
+    Returns:
+        JSON response containing the proposed assignments, the objective value
+        and the number of students left unplaced.
+    """
+    return jsonify(_serialize(placement.plan())), 200
+
+
+@placement_bp.route("/placements/commit", methods=["POST"])
+@requires("placements:run")
+@transactional
+def commit():
+    """
+    Compute the optimal placement and accept the chosen applications in bulk.
+
+    Request body (optional):
+        rejectOthers (bool): Also reject the other pending applications of placed students.
+
+    Returns:
+        JSON response containing the accepted assignments, the number of
+        applications accepted, and the assignments skipped because their job
+        filled up since the placement was computed (they stay pending).
+    """
+    data = request.get_json(silent=True) or {}
+    result = placement.plan()
+    accepted, rejected = placement.commit(result, reject_others=bool(data.get("rejectOthers")))
+    # The bulk updates bypassed the session, so reload the changed applications
+    changed = (
+        Application.query.options(joinedload(Application.job)).populate_existing()
+        .filter(Application.id.in_(accepted | rejected))
+    )
+    for application in changed:
+        on_commit(
+            publish,
+            "application.updated",
+            application.to_dict(),
+            user_ids=[application.student_id, application.job.employer_id if application.job else None],
+        )
+    response = _serialize(result)
+    response["assignments"] = _assignments(
+        assignment for assignment in result["assignments"] if assignment[0] in accepted
+    )
+    response["skipped"] = _assignments(
+        assignment for assignment in result["assignments"] if assignment[0] not in accepted
+    )
+    response["accepted"] = len(accepted)
+    return jsonify(response), 200
@@ -0,0 +1,164 @@
+from functools import lru_cache, wraps
+
+from flask import g, jsonify, request
+from flask_login import current_user
+from sqlalchemy import false, select
+
+from . import login_manager
+from .models import Application, Job, User
+
+# Permissions are "<resource>:<action>". A role granted "<resource>:<action>:own"
+# may only act on the rows it owns (see OWNERSHIP).
+ROLE_GRANTS = {
+    "student": {
+        "jobs:read",
+        "applications:create",
+        "applications:read:own",
+        "applications:withdraw:own",
+        "profiles:edit:own",
+    },
+    "employer": {
+        "jobs:read",
+        "jobs:create",
+        "jobs:edit:own",
+        "jobs:delete:own",
+        "applications:read:own",
+        "applications:review:own",
+        "applications:delete:own",
+        "profiles:edit:own",
+    },
+    "admin": {
+        "jobs:read",
+        "jobs:create",
+        "jobs:edit",
+        "jobs:delete",
+        "jobs:overview",
+        "applications:create",
+        "applications:read",
+        "applications:review",
+        "applications:withdraw",
+        "applications:delete",
+        "users:read",
+        "users:create",
+        "users:role",
+        "profiles:edit",
+        "teams:write",
+        "tracker:read",
+        "tracker:write",
+        "placements:run",
+        "changes:read",
+    },
+}
+
+# Role names as stored over time (registration form, seed data, docs)
+ROLE_ALIASES = {
+    "student": "student",
+    "employer": "employer",
+    "manager": "employer",
+    "admin": "admin",
+}
+
+# How a role owns rows, as a filter folded into the main query
+OWNERSHIP = {
+    ("student", Application): lambda user_id: Application.student_id == user_id,
+    ("employer", Application): lambda user_id: Application.job_id.in_(
+        select(Job.id).where(Job.employer_id == user_id)
+    ),
+    ("employer", Job): lambda user_id: Job.employer_id == user_id,
+    ("student", User): lambda user_id: User.id == user_id,
+    ("employer", User): lambda user_id: User.id == user_id,
+}
+
+
+def _expand(grants):
+    # Holding a permission outright implies its ":own" variant
+    return frozenset(grants | {f"{permission}:own" for permission in grants if not permission.endswith(":own")})
+
+
+# Precomputed once; checking a permission is a set lookup
+PERMISSIONS = {role: _expand(grants) for role, grants in ROLE_GRANTS.items()}
+
+
+@lru_cache(maxsize=None)
+def permissions_for(role):
+    """
+    Return the permission set of a role.
+
+    Args:
+        role (str): The role as stored on the user, in any case or alias.
+
+    Returns:
+        frozenset: The role's permissions (empty for unknown roles).
+    """
+    return PERMISSIONS.get(ROLE_ALIASES.get((role or "").lower()), frozenset())
+
+
+def can(permission, user=None):
+    """
+    Check whether a user holds a permission, at least on their own rows.
+
+    Args:
+        permission (str): e.g. "jobs:edit".
+        user (User, optional): Defaults to the current user.
+
+    Returns:
+        bool: True if the user may perform the action on some rows.
+    """
+    user = user or current_user
+    return user.is_authenticated and f"{permission}:own" in permissions_for(user.role)
+
+
+def requires(policy):
+    """
+    Protect a view with a permission, or a permission per HTTP method.
+
+    Anonymous users get 401 and users lacking the permission 403. The granted
+    permission is remembered for ``scope``.
+
+    Args:
+        policy (str | dict): e.g. "jobs:read" or {"GET": "jobs:read", "PUT": "jobs:edit"}.
+            Methods missing from a dict stay public.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            permission = policy.get(request.method) if isinstance(policy, dict) else policy
+            if permission is None:
+                return view(*args, **kwargs)
+            if not current_user.is_authenticated:
+                return login_manager.unauthorized()
+            if not can(permission):
+                return jsonify({"message": "Unauthorized"}), 403
+            g.permission = permission
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def scope(query, model, permission=None):
+    """
+    Restrict a query to the rows the current user may act on.
+
+    Users holding the permission outright see every row; users holding only
+    its ":own" variant get the ownership filter added to the same query, so
+    the check costs no extra round-trip.
+
+    Args:
+        query (Query): The query over ``model``.
+        model: The mapped class being queried.
+        permission (str, optional): Defaults to the one checked by ``requires``.
+
+    Returns:
+        Query: The restricted query.
+    """
+    permission = permission or g.permission
+    permissions = permissions_for(current_user.role)
+    if permission in permissions:
+        return query
+    role = ROLE_ALIASES.get((current_user.role or "").lower())
+    owned = OWNERSHIP.get((role, model))
+    if f"{permission}:own" not in permissions or owned is None:
+        return query.filter(false())
+    return query.filter(owned(current_user.id))
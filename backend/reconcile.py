@@ -0,0 +1,262 @@
+"""
+Reconciliation of the WS tracker with registered students and their applications.
+
+Tracker rows are imported from spreadsheets: ``student_id`` is the school's
+ID, not ``User.id``, and emails and names are typed by hand. ``reconcile``
+links each row of a tenant to at most one student and sets its
+``merge_status``:
+
+- ``merged``: linked to a student with an accepted application;
+- ``unplaced``: linked to a student without one;
+- ``unmatched``: no student found;
+- ``ambiguous``: several students fit equally well.
+
+Rows are linked by the first rule that finds a student:
+
+1. email, against account emails and the contact emails of applications;
+2. ``student_id`` equal to a user ID, when the names also look alike;
+3. name, ignoring case, accents, punctuation and word order;
+4. fuzzy name (``difflib`` ratio of at least ``FUZZY_THRESHOLD``).
+
+Students are loaded once per run into hash indexes, so the first three rules
+are dictionary lookups. Fuzzy matching only compares a row with the students
+sharing the start, the end or the letters of a name word (blocking) rather than with
+every student, and ignores the large blocks of common names when the row has a
+more selective one. Only rows whose status changes are written, by one
+batched ``UPDATE``, with their change log entries.
+"""
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from difflib import SequenceMatcher
+
+import click
+from sqlalchemy import bindparam, select
+
+from . import db
+from .audit import record_updates
+from .capacity import ACCEPTED
+from .models import Application, Tenant, User, WSTracker
+from .rbac import ROLE_ALIASES
+from .text import normalize
+
+MERGED = "merged"
+UNPLACED = "unplaced"
+UNMATCHED = "unmatched"
+AMBIGUOUS = "ambiguous"
+
+FUZZY_THRESHOLD = 0.85
+FUZZY_MARGIN = 0.05  # A fuzzy match must beat the runner-up by this much
+ID_NAME_THRESHOLD = 0.6  # How alike the names of an ID match must be
+BLOCK_LETTERS = 3  # Students are blocked by the first and the last letters of each name word
+BLOCK_LIMIT = 100  # Larger blocks (common first names) are skipped when the row has a smaller one
+
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
+
+def name_key(name):
+    """
+    Reduce a name to the words compared: "García, Ana-María" -> "ana garcia maria".
+
+    Args:
+        name (str): The name as typed.
+
+    Returns:
+        str: The sorted, normalized words.
+    """
+    return " ".join(sorted(_WORD_RE.findall(normalize(name))))
+
+
+def _blocks(key):
+    blocks = set()
+    for word in key.split():
+        # Its start, its end, and its letters in any order (for swapped letters)
+        blocks.update((word[:BLOCK_LETTERS] + "^", "$" + word[-BLOCK_LETTERS:], "".join(sorted(word))))
+    return blocks
+
+
+def _similarity(a, b):
+    return SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+class StudentIndex:
+    """
+    The students of a tenant, indexed by email, ID and name.
+
+    Args:
+        students (iterable): ``(id, email, first_name, last_name)`` of each student.
+        applications (iterable): ``(id, student_id, email_address, status)`` of
+            each of their applications.
+    """
+
+    def __init__(self, students, applications):
+        self.names = {}
+        self.by_email = defaultdict(set)
+        self.by_name = defaultdict(set)
+        self.blocks = defaultdict(set)
+        self.accepted = defaultdict(list)
+        for user_id, email, first_name, last_name in students:
+            key = name_key(f"{first_name} {last_name}")
+            self.names[user_id] = key
+            self.by_email[email.strip().casefold()].add(user_id)
+            self.by_name[key].add(user_id)
+            for block in _blocks(key):
+                self.blocks[block].add(user_id)
+        for application_id, student_id, email_address, status in applications:
+            if student_id not in self.names:
+                continue
+            if email_address:
+                self.by_email[email_address.strip().casefold()].add(student_id)
+            if status == ACCEPTED:
+                self.accepted[student_id].append(application_id)
+
+    @classmethod
+    def load(cls, tenant_id):
+        """
+        Build the index of a tenant's students from the database.
+
+        Args:
+            tenant_id (int): The tenant.
+
+        Returns:
+            StudentIndex: The index.
+        """
+        users = db.session.execute(
+            select(User.id, User.email, User.first_name, User.last_name, User.role).where(User.tenant_id == tenant_id)
+        )
+        students = [row[:4] for row in users if ROLE_ALIASES.get((row.role or "").lower()) == "student"]
+        applications = db.session.execute(
+            select(Application.id, Application.student_id, Application.email_address, Application.status)
+            .where(Application.tenant_id == tenant_id)
+        )
+        return cls(students, applications)
+
+    def _fuzzy(self, key):
+        blocks = [self.blocks[block] for block in _blocks(key) if block in self.blocks]
+        if not blocks:
+            return []
+        limit = max(BLOCK_LIMIT, min(len(block) for block in blocks))
+        candidates = set().union(*(block for block in blocks if len(block) <= limit))
+        # SequenceMatcher caches what it knows about the second sequence
+        matcher = SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(key)
+        scored = []
+        for user_id in candidates:
+            matcher.set_seq1(self.names[user_id])
+            if matcher.real_quick_ratio() < FUZZY_THRESHOLD or matcher.quick_ratio() < FUZZY_THRESHOLD:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= FUZZY_THRESHOLD:
+                scored.append((ratio, user_id))
+        return sorted(scored, reverse=True)
+
+    def match(self, email, student_id, full_name):
+        """
+        Find the student a tracker row refers to.
+
+        Args:
+            email (str): The row's ``minerva_email``.
+            student_id (str): The row's ``student_id``.
+            full_name (str): The row's ``full_name``.
+
+        Returns:
+            dict: The ``status``, and the ``user_id``, ``method`` ("email", "id",
+            "name" or "fuzzy"), ``score`` and accepted ``application_ids`` of
+            the student found.
+        """
+        key = name_key(full_name)
+        user_ids, method, score = set(), None, None
+
+        if email:
+            user_ids, method, score = self.by_email.get(email.strip().casefold(), set()), "email", 1.0
+        if not user_ids and student_id and student_id.strip().isdigit():
+            user_id = int(student_id)
+            if user_id in self.names:
+                similarity = _similarity(key, self.names[user_id])
+                if similarity >= ID_NAME_THRESHOLD:
+                    user_ids, method, score = {user_id}, "id", similarity
+        if not user_ids and key:
+            user_ids, method, score = self.by_name.get(key, set()), "name", 1.0
+        if not user_ids and key:
+            scored = self._fuzzy(key)
+            if scored:
+                method, score = "fuzzy", scored[0][0]
+                user_ids = {user_id for ratio, user_id in scored if ratio > score - FUZZY_MARGIN}
+
+        if not user_ids:
+            return {"status": UNMATCHED, "user_id": None, "method": None, "score": None, "application_ids": []}
+        if len(user_ids) > 1:
+            return {"status": AMBIGUOUS, "user_id": None, "method": method, "score": score, "application_ids": []}
+        (user_id,) = user_ids
+        application_ids = sorted(self.accepted.get(user_id, []))
+        return {
+            "status": MERGED if application_ids else UNPLACED,
+            "user_id": user_id,
+            "method": method,
+            "score": round(score, 3),
+            "application_ids": application_ids,
+        }
+
+
+def reconcile(tenant_id, dry_run=False):
+    """
+    Match a tenant's tracker rows with its students and write their ``merge_status``.
+
+    The caller commits.
+
+    Args:
+        tenant_id (int): The tenant.
+        dry_run (bool): Compute the changes without writing them.
+
+    Returns:
+        dict: The number of ``rows``, the count of each status, and the
+        ``changes``: each row whose status changed, with its old status
+        (``previous``) and match.
+    """
+    index = StudentIndex.load(tenant_id)
+    rows = db.session.execute(
+        select(WSTracker.id, WSTracker.minerva_email, WSTracker.student_id, WSTracker.full_name, WSTracker.merge_status)
+        .where(WSTracker.tenant_id == tenant_id)
+    ).all()
+
+    statuses = Counter()
+    changes = []
+    for row_id, email, student_id, full_name, merge_status in rows:
+        match = index.match(email, student_id, full_name)
+        statuses[match["status"]] += 1
+        if match["status"] != merge_status:
+            changes.append({"id": row_id, "previous": merge_status, **match})
+
+    if changes and not dry_run:
+        tracker = WSTracker.__table__
+        db.session.execute(
+            tracker.update()
+            .where(tracker.c.id == bindparam("row_id"))
+            .values(merge_status=bindparam("status"), updated_at=datetime.utcnow()),
+            [{"row_id": change["id"], "status": change["status"]} for change in changes],
+        )
+        # Core updates bypass the audit listener
+        record_updates(
+            "ws_tracker",
+            [(change["id"], tenant_id, {"merge_status": [change["previous"], change["status"]]}) for change in changes],
+        )
+    return {"rows": len(rows), "statuses": dict(statuses), "changes": changes}
+
+
+def init_app(app):
+    """
+    Register the ``flask reconcile-tracker`` command.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    @app.cli.command("reconcile-tracker")
+    @click.option("--dry-run", is_flag=True, help="Report the changes without writing them.")
+    def reconcile_tracker_command(dry_run):
+        """Match WS tracker rows with students and update their merge status (run it after imports)."""
+        for tenant_id in db.session.execute(select(Tenant.id)).scalars().all():
+            result = reconcile(tenant_id, dry_run)
+            statuses = ", ".join(f"{count} {status}" for status, count in sorted(result["statuses"].items()))
+            click.echo(f"Tenant {tenant_id}: {result['rows']} row(s) ({statuses or 'none'}), "
+                       f"{len(result['changes'])} change(s){' (dry run)' if dry_run else ''}.")
+        db.session.commit()
@@ -0,0 +1,351 @@
+import io
+import itertools
+import math
+import re
+import threading
+import zipfile
+import zlib
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+from sqlalchemy import bindparam, func, or_, select, true
+
+from . import db
+from .audit import missing_ids
+from .models import Application, ChangeLog, User
+from .tenancy import TenantNamespaces, tenant_default
+from .text import tokenize
+
+_PDF_STREAM_RE = re.compile(rb"stream\r?\n(.*?)\r?\nendstream", re.S)
+_PDF_STRING_RE = re.compile(rb"\(((?:\\.|[^\\)])*)\)")
+_XML_TAG_RE = re.compile(r"<[^>]+>")
+
+# Above this many changed applications or students a refresh rebuilds the whole index
+RELOAD_THRESHOLD = 500
+
+# Built once: the newest log ID, and how many of the missing IDs have committed since
+_VERSION = select(
+    select(func.coalesce(func.max(ChangeLog.id), 0)).scalar_subquery(),
+    select(func.count(ChangeLog.id)).where(ChangeLog.id.in_(bindparam("gaps", expanding=True))).scalar_subquery(),
+).execution_options(all_tenants=True)
+
+
+def extract_text(resume):
+    """
+    Extract plain text from an uploaded resume.
+
+    Handles plain text, .docx files and simple (text-based) PDFs using only the
+    standard library. Scanned PDFs or other binary formats yield an empty string.
+
+    Args:
+        resume (bytes | str | None): The uploaded resume.
+
+    Returns:
+        str: The extracted text.
+    """
+    if not resume:
+        return ""
+    if isinstance(resume, str):
+        return resume
+    if resume.startswith(b"%PDF"):
+        return _extract_pdf(resume)
+    if resume.startswith(b"PK"):
+        return _extract_docx(resume)
+    return resume.decode("utf-8", errors="ignore")
+
+
+def _extract_pdf(data):
+    chunks = []
+    for stream in _PDF_STREAM_RE.findall(data):
+        try:
+            stream = zlib.decompress(stream)
+        except zlib.error:
+            pass
+        chunks.extend(_PDF_STRING_RE.findall(stream))
+    return " ".join(chunk.decode("latin-1") for chunk in chunks)
+
+
+def _extract_docx(data):
+    try:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            xml = archive.read("word/document.xml").decode("utf-8", errors="ignore")
+    except (zipfile.BadZipFile, KeyError):
+        return ""
+    return _XML_TAG_RE.sub(" ", xml)
+
+
+class ResumeIndex:
+    """
+    In-memory inverted index over application resumes, ranked with BM25.
+
+    Text extraction runs in a worker pool, off the request path. The index is
+    built from the database in the background on first use and is ``loaded``
+    only once every application has been indexed. Applications and profile
+    resume edits leave change log entries (``backend.audit``), so like the
+    catalog the index checks the newest log ID once per search and reindexes
+    only the applications changed since, by any process.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self, workers=2):
+        self._lock = threading.RLock()
+        self._postings = defaultdict(dict)  # term -> {application_id: term frequency}
+        self._docs = {}  # application_id -> (job_id, document length, terms)
+        self._total_length = 0
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="resume-index") if workers else None
+        self._pending = set()
+        self._tickets = itertools.count()
+        self._latest = {}  # application_id -> ticket of its newest queued submission
+        self._loader = None
+        self._refresh_lock = threading.Lock()
+        self.version = None
+        # The log IDs behind the version that may still commit
+        self.gaps = set()
+        self.loaded = False
+
+    def submit(self, application_id, job_id, *sources):
+        """
+        Queue an application for (re)indexing.
+
+        Args:
+            application_id (int): The ID of the application.
+            job_id (int): The ID of the job applied for.
+            *sources: Resume blobs or texts to index (application resume,
+                profile resume, candidate statement, ...).
+        """
+        ticket = next(self._tickets)
+        with self._lock:
+            self._latest[application_id] = ticket
+        if self._executor is None:
+            self._index(ticket, application_id, job_id, sources)
+            return
+        future = self._executor.submit(self._index, ticket, application_id, job_id, sources)
+        with self._lock:
+            self._pending.add(future)
+        future.add_done_callback(self._discard)
+
+    def _discard(self, future):
+        with self._lock:
+            self._pending.discard(future)
+
+    def _index(self, ticket, application_id, job_id, sources):
+        terms = Counter(tokenize(" ".join(extract_text(source) for source in sources)))
+        with self._lock:
+            # A newer submission (or a removal) supersedes this one
+            if self._latest.get(application_id) != ticket:
+                return
+            del self._latest[application_id]
+            self._remove(application_id)
+            for term, count in terms.items():
+                self._postings[term][application_id] = count
+            length = sum(terms.values())
+            self._docs[application_id] = (job_id, length, tuple(terms))
+            self._total_length += length
+
+    def remove(self, application_id):
+        """
+        Drop an application from the index.
+
+        Args:
+            application_id (int): The ID of the application.
+        """
+        with self._lock:
+            self._latest.pop(application_id, None)
+            self._remove(application_id)
+
+    def _remove(self, application_id):
+        doc = self._docs.pop(application_id, None)
+        if doc is None:
+            return
+        _, length, terms = doc
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings[term]
+            postings.pop(application_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def wait(self):
+        """
+        Block until all queued extractions have been indexed.
+        """
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.result()
+
+    def load(self, rows):
+        """
+        Index every application from ``(application_id, job_id, *sources)`` rows.
+
+        Applications missing from the rows are dropped. The index is
+        ``loaded`` once all of them have been indexed.
+
+        Args:
+            rows (iterable): The rows to index.
+        """
+        application_ids = set()
+        for application_id, job_id, *sources in rows:
+            application_ids.add(application_id)
+            self.submit(application_id, job_id, *sources)
+        self.wait()
+        with self._lock:
+            for application_id in self._docs.keys() - application_ids:
+                self._remove(application_id)
+        self.loaded = True
+
+    def refresh(self, tenant_id):
+        """
+        Bring the index up to date with the database.
+
+        The first call builds the index, in the background when there is a
+        worker pool. Later calls reindex the applications changed since, or
+        rebuild the index in the background past ``RELOAD_THRESHOLD`` changes.
+
+        Args:
+            tenant_id (int): The index's tenant.
+        """
+        if self._building() or (self.loaded and self._newer() is None):
+            return
+        with self._refresh_lock:
+            if self._building():
+                return
+            if not self.loaded:
+                # First use, or a build that failed
+                version, _ = self._version()
+                self.gaps = missing_ids(ChangeLog, 0, (), version)
+                changed = None
+            else:
+                version = self._newer()
+                if version is None:
+                    return
+                changed = self._changed(tenant_id, version)
+            self.version = version
+            if changed is None or sum(map(len, changed)) > RELOAD_THRESHOLD:
+                self._build(tenant_id)
+            else:
+                self._reindex(tenant_id, *changed)
+
+    def _building(self):
+        return self._loader is not None and self._loader.is_alive()
+
+    def _version(self):
+        # The newest log ID, and how many of the missing IDs have committed since
+        return db.session.execute(_VERSION, {"gaps": list(self.gaps)}).one()
+
+    def _newer(self):
+        # The newest log ID, or None if it and the missing IDs are as the index last saw them
+        newest, late = self._version()
+        if newest == self.version and not late:
+            return None
+        return newest
+
+    def _changed(self, tenant_id, version):
+        # The applications and students written since the index's version,
+        # or behind it by transactions that committed late
+        missing = missing_ids(ChangeLog, self.version, self.gaps, version)
+        rows = db.session.execute(
+            select(ChangeLog.table_name, ChangeLog.row_id)
+            .where((ChangeLog.id > self.version) | ChangeLog.id.in_(self.gaps), ChangeLog.id <= version,
+                   ChangeLog.tenant_id == tenant_id, ChangeLog.table_name.in_(("application", "user")))
+            .execution_options(all_tenants=True)
+        )
+        application_ids, student_ids = set(), set()
+        for table, row_id in rows:
+            (application_ids if table == "application" else student_ids).add(row_id)
+        self.gaps = missing
+        return application_ids, student_ids
+
+    def _build(self, tenant_id):
+        if self._executor is None:
+            self.load(_rows(tenant_id))
+            return
+        app = current_app._get_current_object()
+
+        def build():
+            with app.app_context():
+                self.load(_rows(tenant_id))
+
+        self._loader = threading.Thread(target=build, name="resume-index-loader", daemon=True)
+        self._loader.start()
+
+    def _reindex(self, tenant_id, application_ids, student_ids):
+        if not application_ids and not student_ids:
+            return
+        found = set()
+        changed = or_(Application.id.in_(application_ids), Application.student_id.in_(student_ids))
+        for application_id, job_id, *sources in _rows(tenant_id, changed):
+            found.add(application_id)
+            self.submit(application_id, job_id, *sources)
+        for application_id in application_ids - found:
+            self.remove(application_id)
+
+    def search(self, query, job_ids, limit=20):
+        """
+        Rank the applications to the given jobs against a keyword query.
+
+        Args:
+            query (str): The keywords to search for.
+            job_ids (set): Only applications to these jobs are considered.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list: ``(application_id, score)`` tuples, best match first.
+        """
+        terms = set(tokenize(query))
+        scores = defaultdict(float)
+        with self._lock:
+            count = len(self._docs)
+            if not terms or not count:
+                return []
+            average_length = self._total_length / count or 1
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for application_id, tf in postings.items():
+                    job_id, length, _ = self._docs[application_id]
+                    if job_id not in job_ids:
+                        continue
+                    norm = self.K1 * (1 - self.B + self.B * length / average_length)
+                    scores[application_id] += idf * tf * (self.K1 + 1) / (tf + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+
+def init_app(app):
+    """
+    Attach the resume indexes to the application, one per tenant.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    workers = app.config.get("RESUME_INDEX_WORKERS", 2)
+    app.extensions["resume_index"] = TenantNamespaces(lambda: ResumeIndex(workers))
+
+
+def _rows(tenant_id, criterion=true()):
+    # What an application is indexed with: its resume, the profile resume and the candidate statement
+    return db.session.execute(
+        select(Application.id, Application.job_id, Application.resume, User.resume, Application.candidate_statement)
+        .join(User, User.id == Application.student_id)
+        .where(Application.tenant_id == tenant_id, criterion)
+        .execution_options(all_tenants=True, yield_per=500)
+    )
+
+
+def get_index():
+    """
+    Return the current tenant's resume index, refreshed.
+
+    Returns:
+        ResumeIndex | None: The index, or None while it is still being built.
+    """
+    tenant_id = tenant_default()
+    index = current_app.extensions["resume_index"].get(tenant_id)
+    index.refresh(tenant_id)
+    return index if index.loaded else None
@@ -0,0 +1,336 @@
+from functools import wraps
+
+from flask import g, jsonify, request
+
+# Text columns have no length in the database; these keep one request from storing megabytes
+STATEMENT_MAX = 5000
+DESCRIPTION_MAX = 5000
+RESUME_MAX = 100_000
+
+_MISSING = object()
+_TRUE = frozenset({"true", "1", "yes", "on"})
+_FALSE = frozenset({"false", "0", "no", "off", ""})
+
+
+class Invalid(ValueError):
+    """Raised by a field's converter with the message reported to the client."""
+
+
+def _string(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise Invalid("must be a string")
+
+
+def _integer(value):
+    if isinstance(value, bool):
+        raise Invalid("must be an integer")
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise Invalid("must be an integer")
+
+
+def _boolean(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in (0, 1):
+        return bool(value)
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in _TRUE:
+            return True
+        if lowered in _FALSE:
+            return False
+    raise Invalid("must be true or false")
+
+
+def _email(value):
+    value = _string(value)
+    if "@" not in value[1:-1]:
+        raise Invalid("must be an email address")
+    return value
+
+
+def _string_list(value):
+    if not isinstance(value, list):
+        raise Invalid("must be a list of strings")
+    return [_string(item) for item in value]
+
+
+CONVERTERS = {str: _string, int: _integer, bool: _boolean, "email": _email, list: _string_list}
+
+
+class Field:
+    """
+    One field of a request body.
+
+    Args:
+        kind: ``str``, ``int``, ``bool``, ``list`` (of strings) or ``"email"``.
+        required (bool): Reject bodies without it. Defaults to True.
+        default: Used when an optional field is missing.
+        nullable (bool): Accept ``null``.
+        max_length (int): Longest accepted string (or list).
+        minimum, maximum (int): Bounds of an integer.
+        choices (iterable): The accepted values.
+    """
+    __slots__ = ("kind", "required", "default", "nullable", "max_length", "minimum", "maximum", "choices")
+
+    def __init__(self, kind=str, required=True, default=_MISSING, nullable=False, max_length=None,
+                 minimum=None, maximum=None, choices=None):
+        self.kind = kind
+        self.required = required and default is _MISSING
+        self.default = default
+        self.nullable = nullable
+        self.max_length = max_length
+        self.minimum = minimum
+        self.maximum = maximum
+        self.choices = frozenset(choices) if choices is not None else None
+
+    def compile(self):
+        """
+        Build the converter of this field: one function applying the type
+        coercion and every check, with nothing left to look up per request.
+        """
+        convert = CONVERTERS[self.kind]
+        checks = []
+        if self.max_length is not None:
+            max_length = self.max_length
+            checks.append(lambda value: len(value) <= max_length or f"must be at most {max_length} characters long")
+        if self.minimum is not None:
+            minimum = self.minimum
+            checks.append(lambda value: value >= minimum or f"must be at least {minimum}")
+        if self.maximum is not None:
+            maximum = self.maximum
+            checks.append(lambda value: value <= maximum or f"must be at most {maximum}")
+        if self.choices is not None:
+            choices = self.choices
+            checks.append(lambda value: value in choices or f"must be one of {', '.join(sorted(choices))}")
+        nullable = self.nullable
+
+        def field(value):
+            if value is None:
+                if nullable:
+                    return None
+                raise Invalid("may not be null")
+            value = convert(value)
+            for check in checks:
+                result = check(value)
+                if result is not True:
+                    raise Invalid(result)
+            return value
+
+        return field
+
+
+class Schema:
+    """
+    A request body schema, compiled once into a single validating function.
+
+    Calling the schema returns ``(data, errors)``: the converted fields (keys
+    not in the schema are dropped) and the problems found, by field.
+
+    Args:
+        fields (dict): Field name to ``Field``.
+        partial (bool): For updates: every field is optional and missing ones
+            are left out instead of defaulted.
+    """
+
+    def __init__(self, fields, partial=False):
+        self.fields = fields
+        self.is_partial = partial
+        self._steps = tuple(
+            (name, spec.compile(), spec.required and not partial, _MISSING if partial else spec.default)
+            for name, spec in fields.items()
+        )
+
+    def partial(self):
+        """Return the schema of a partial update of the same resource."""
+        return Schema(self.fields, partial=True)
+
+    def __call__(self, payload):
+        if not isinstance(payload, dict):
+            return None, {"": "must be a JSON object"}
+        data, errors = {}, {}
+        for name, convert, required, default in self._steps:
+            value = payload.get(name, _MISSING)
+            if value is _MISSING:
+                if required:
+                    errors[name] = "is required"
+                elif default is not _MISSING:
+                    data[name] = default
+                continue
+            try:
+                data[name] = convert(value)
+            except Invalid as error:
+                errors[name] = str(error)
+        return data, errors
+
+
+def validate(schema, source="json", methods=("POST", "PUT", "PATCH")):
+    """
+    Validate the request body before the view runs.
+
+    Invalid bodies get a 400 listing the problems by field, before any
+    database work. The converted body is available to the view as ``g.data``.
+
+    Args:
+        schema (Schema): The schema of the body.
+        source (str): "json" or "form".
+        methods (tuple): The HTTP methods whose body is validated.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method in methods:
+                payload = request.form.to_dict() if source == "form" else request.get_json(silent=True)
+                data, errors = schema(payload)
+                if errors:
+                    return jsonify({"message": "Invalid request", "errors": errors}), 400
+                g.data = data
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _name(required=True):
+    return Field(str, required=required, max_length=100)
+
+
+def _optional(max_length=100):
+    return Field(str, required=False, nullable=True, max_length=max_length)
+
+
+# Job posted from the employer dashboard (`/employers`, `/jobs/<id>`)
+JOB = Schema({
+    "positionTitle": _name(),
+    "department": _name(),
+    "managerName": _name(),
+    "managerEmail": Field("email", max_length=100),
+    "hiringSemester": Field(list, max_length=20),
+    "minStudents": Field(int, minimum=0, maximum=1000),
+    "maxStudents": Field(int, minimum=1, maximum=1000),
+    "roleLocation": _name(),
+    "typeOfWork": _name(),
+    "prerequisites": Field(str, default="", max_length=200),
+    "briefDescription": Field(str, max_length=DESCRIPTION_MAX),
+    "moreDetails": Field(str, default="", max_length=DESCRIPTION_MAX),
+    "applicationDeadline": _name(),
+})
+
+# Job posted through the legacy `/post-job` endpoint
+POSTED_JOB = Schema({
+    "employer_id": Field(int, required=False, minimum=1),  # Defaults to the current user
+    "title": _name(),
+    "department": _name(),
+    "managerName": _name(),
+    "managerEmail": Field("email", max_length=100),
+    "hiringSemesters": _name(),
+    "minStudents": Field(int, minimum=0, maximum=1000),
+    "maxStudents": Field(int, minimum=1, maximum=1000),
+    "roleLocation": _name(),
+    "typeOfWork": _name(),
+    "prerequisites": Field(str, default="", max_length=200),
+    "briefDescription": Field(str, max_length=DESCRIPTION_MAX),
+    "moreDetails": Field(str, default="", max_length=DESCRIPTION_MAX),
+    "applicationDeadline": _name(),
+})
+
+JOB_SEARCH = Schema({
+    "department": Field(str, default="", nullable=True, max_length=100),
+    "keyword": Field(str, default="", nullable=True, max_length=100),
+    "location": Field(str, default="", nullable=True, max_length=100),
+    "semesters": Field(list, required=False, max_length=20),
+    "openOnly": Field(bool, default=False),
+    "closingBefore": _optional(),
+})
+
+# Multipart form of `/apply`; the resume is a file upload
+APPLICATION = Schema({
+    "jobId": Field(int, minimum=1),
+    "emailAddress": Field("email", max_length=100),
+    "yearOfGraduation": Field(int, minimum=1900, maximum=2200),
+    "candidateStatement": Field(str, max_length=STATEMENT_MAX),
+})
+
+APPLICATION_REVIEW = Schema({
+    "status": Field(str, choices=("pending", "accepted", "rejected", "withdrawn")),
+}, partial=True)
+
+TEAM = Schema({
+    "name": _name(),
+    "manager": _name(),
+    "email": Field("email", max_length=100),
+    "maxStudents": Field(int, minimum=0, maximum=1000),
+    "contact": _optional(),
+    "priority": Field(str, max_length=50),
+    "recruitingFor": _optional(),
+})
+
+POSITION = Schema({
+    "student_id": _name(),
+    "minerva_email": Field("email", max_length=100),
+    "full_name": _name(),
+    "expected_grad_year": Field(int, minimum=1900, maximum=2200),
+    "ws_eligible": Field(bool, default=False),
+    "role": _optional(),
+    "manager_name": _optional(),
+    "paycom_manager": _optional(),
+    "manager_email": _optional(),
+    "department_name": _optional(),
+    "paycom_id": _optional(),
+    "contractor_status": _optional(50),
+    "notes": _optional(DESCRIPTION_MAX),
+    "merge_status": _optional(50),
+})
+
+# Users created by an admin (`/students`, `/employers`)
+NEW_USER = Schema({
+    "username": _name(),
+    "password": Field(str, max_length=100),
+    "first_name": _name(),
+    "last_name": _name(),
+    "email": Field("email", max_length=100),
+    "role": Field(str, required=False, max_length=50),
+    "education_level": Field(str, default="", max_length=100),
+    "resume": Field(str, default="", max_length=RESUME_MAX),
+})
+
+PROFILE = Schema({
+    "first_name": _name(),
+    "last_name": _name(),
+    "email": Field("email", max_length=100),
+    "education_level": Field(str, nullable=True, max_length=100),
+    "resume": Field(str, nullable=True, max_length=RESUME_MAX),
+}, partial=True)
+
+CREDENTIALS = Schema({
+    "email": Field(str, max_length=100),
+    "password": Field(str, max_length=200),
+})
+
+REGISTRATION = Schema({
+    "email": Field("email", max_length=100),
+    "firstName": _name(),
+    "lastName": _name(),
+    "password": Field(str, max_length=200),
+    # Admins are appointed by another admin (``PUT /auth/users/<id>/role``)
+    "userType": Field(str, choices=("student", "manager")),
+    "studentId": Field(str, required=False, max_length=100),
+})
+
+ROLE_CHANGE = Schema({"role": Field(str, choices=("student", "manager", "admin"))})
+
+REFRESH = Schema({"refresh_token": Field(str, max_length=2000)})
+
+REVOKE = Schema({"token": Field(str, max_length=2000)})
@@ -0,0 +1,389 @@
+"""
+Static snapshots of the job board.
+
+The job listing is read constantly but only changes a few times a day, so the
+rendered JSON is precomputed per tenant: every job's ``to_dict()``, the whole
+listing, and its per-department and per-location slices, each both for all
+jobs and for the jobs still open. Files are named by a hash of their content
+(``jobs-open.3f2a9c0d1e4b5a67.json``) so they can be cached forever, and a
+``manifest.json`` maps the listings to their current files.
+
+Job writes mark the tenant's snapshot stale when they commit, by replacing
+the ``generation`` file next to the manifest with a new token. Every process
+compares the token its manifest was built at with the file's on each read,
+so a write in one worker is seen by all of them. A stale snapshot is rebuilt
+in the background (or on the next read when ``SNAPSHOT_WORKERS`` is 0) and
+callers fall back to the database until then. Only files whose content
+changed are written on a rebuild.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import click
+from flask import current_app, request, url_for
+from sqlalchemy import event, select
+
+from . import db
+from .lifecycle import now
+from .models import Job, Tenant
+from .tenancy import TenantNamespaces, tenant_default
+
+MANIFEST = "manifest.json"
+GENERATION = "generation"  # Replaced with a new token by every committed job write
+YEAR = 365 * 24 * 3600  # max-age of the content-hashed files
+
+# Session.info key of the tenants whose jobs were written in the transaction
+_CHANGED = "snapshot_tenants"
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+logger = logging.getLogger(__name__)
+
+
+def _slug(name):
+    return _SLUG_RE.sub("-", name.lower()).strip("-") or "none"
+
+
+def _digest(body):
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+def _listing(bodies):
+    return b"[" + b",".join(bodies) + b"]"
+
+
+def build_snapshot(directory, tenant_id, at=None):
+    """
+    Render the job board of a tenant into ``directory``.
+
+    Each job is serialized once; the listings are spliced together from the
+    serialized jobs. Files that already exist (same content, same name) are
+    left alone, the manifest is replaced atomically, and files referenced by
+    neither the new nor the previous manifest are removed.
+
+    Args:
+        directory (str): The tenant's snapshot directory.
+        tenant_id (int): The tenant.
+        at (datetime, optional): The reference time for open jobs. Defaults to now.
+
+    Returns:
+        dict: The new manifest.
+    """
+    at = at or now()
+    os.makedirs(directory, exist_ok=True)
+    existing = set(os.listdir(directory))
+    written = []
+
+    def write(name, body):
+        filename = f"{name}.{_digest(body)}.json"
+        if filename not in existing:
+            path = os.path.join(directory, filename)
+            with open(f"{path}.tmp", "wb") as file:
+                file.write(body)
+            os.replace(f"{path}.tmp", path)
+            existing.add(filename)
+        written.append(filename)
+        return filename
+
+    def write_listings(name, bodies, open_bodies):
+        return {"all": write(name, _listing(bodies)), "open": write(f"{name}-open", _listing(open_bodies))}
+
+    jobs = db.session.execute(
+        select(Job).where(Job.tenant_id == tenant_id).order_by(Job.id).execution_options(all_tenants=True)
+    ).scalars()
+
+    dumps = current_app.json.dumps
+    details = {}
+    bodies, open_bodies = [], []
+    slices = {"department": {}, "location": {}}
+    expires_at = None
+    for job in jobs:
+        body = dumps(job.to_dict(), separators=(",", ":")).encode()
+        details[str(job.id)] = write(f"job-{job.id}", body)
+        is_open = job.deadline_at is None or job.deadline_at >= at
+        if is_open and job.deadline_at is not None and (expires_at is None or job.deadline_at < expires_at):
+            expires_at = job.deadline_at
+        bodies.append(body)
+        if is_open:
+            open_bodies.append(body)
+        for kind, name in (("department", job.department), ("location", job.role_location)):
+            slice_all, slice_open = slices[kind].setdefault((name or "").strip(), ([], []))
+            slice_all.append(body)
+            if is_open:
+                slice_open.append(body)
+
+    manifest = {
+        "built_at": at.isoformat(),
+        # The open listings are out of date once the earliest open deadline passes
+        "expires_at": expires_at.isoformat() if expires_at else None,
+        "jobs": write_listings("jobs", bodies, open_bodies),
+        "departments": {
+            name: write_listings(f"department-{_slug(name)}", *listings)
+            for name, listings in slices["department"].items()
+        },
+        "locations": {
+            name: write_listings(f"location-{_slug(name)}", *listings)
+            for name, listings in slices["location"].items()
+        },
+        "details": details,
+    }
+    manifest["version"] = _digest("\n".join(sorted(written)).encode())
+
+    keep = set(written) | {MANIFEST}
+    manifest_path = os.path.join(directory, MANIFEST)
+    if os.path.exists(manifest_path):
+        # Clients may still be fetching the files of the previous manifest
+        with open(manifest_path) as file:
+            keep.update(_files(json.load(file)))
+    with open(f"{manifest_path}.tmp", "w") as file:
+        json.dump(manifest, file)
+    os.replace(f"{manifest_path}.tmp", manifest_path)
+
+    for filename in existing - keep:
+        if filename.endswith(".json"):
+            os.remove(os.path.join(directory, filename))
+    return manifest
+
+
+def _files(manifest):
+    for listings in (manifest["jobs"], *manifest["departments"].values(), *manifest["locations"].values()):
+        yield from listings.values()
+    yield from manifest["details"].values()
+
+
+def read_generation(directory):
+    """
+    Return the token of the last committed job write to a snapshot directory.
+
+    Args:
+        directory (str): The tenant's snapshot directory.
+
+    Returns:
+        str: The token, empty before the first write.
+    """
+    try:
+        with open(os.path.join(directory, GENERATION)) as file:
+            return file.read()
+    except FileNotFoundError:
+        return ""
+
+
+def bump_generation(directory):
+    """
+    Mark a snapshot directory stale for every process reading it.
+
+    Args:
+        directory (str): The tenant's snapshot directory.
+    """
+    os.makedirs(directory, exist_ok=True)
+    token = uuid.uuid4().hex
+    path = os.path.join(directory, GENERATION)
+    # Named by the token, so concurrent writers don't share a temporary file
+    with open(f"{path}.{token}.tmp", "w") as file:
+        file.write(token)
+    os.replace(f"{path}.{token}.tmp", path)
+
+
+class Snapshot:
+    """
+    The current snapshot manifest of a tenant and the bookkeeping to rebuild it.
+
+    The manifest is fresh while the tenant's ``generation`` file still holds
+    the token it was built at and no open job has closed since.
+
+    Args:
+        workers (int): Background rebuild threads; 0 rebuilds on the next read instead.
+    """
+
+    def __init__(self, workers):
+        self.built = None
+        self.manifest = None
+        self._expires_at = None
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="snapshots") if workers else None
+        self._building = False
+
+    def fresh(self, tenant_id):
+        return (
+            self.manifest is not None
+            and (self._expires_at is None or now() <= self._expires_at)
+            and self.built == read_generation(snapshot_directory(tenant_id))
+        )
+
+    def invalidate(self, tenant_id):
+        """
+        Rebuild the snapshot of a write committed by this process in the background, if there are workers.
+        """
+        with self._lock:
+            self._schedule(tenant_id)
+
+    def current(self, tenant_id):
+        """
+        Return the fresh manifest, or None if it's being rebuilt.
+        """
+        if self.fresh(tenant_id):
+            return self.manifest
+        with self._lock:
+            if self._executor is None:
+                try:
+                    self._build(tenant_id)
+                except OSError:
+                    logger.exception("Building the job board snapshot of tenant %s failed", tenant_id)
+                    return None
+                return self.manifest
+            self._schedule(tenant_id)
+        return None
+
+    def _schedule(self, tenant_id):
+        if self._executor is not None and not self._building:
+            self._building = True
+            self._executor.submit(self._rebuild, current_app._get_current_object(), tenant_id)
+
+    def _build(self, tenant_id):
+        directory = snapshot_directory(tenant_id)
+        # Read first: a write committed during the build leaves the result stale
+        generation = read_generation(directory)
+        manifest = build_snapshot(directory, tenant_id)
+        self._expires_at = datetime.fromisoformat(manifest["expires_at"]) if manifest["expires_at"] else None
+        self.manifest, self.built = manifest, generation
+
+    def _rebuild(self, app, tenant_id):
+        with app.app_context():
+            try:
+                while not self.fresh(tenant_id):
+                    self._build(tenant_id)
+            except Exception:
+                logger.exception("Rebuilding the job board snapshot of tenant %s failed", tenant_id)
+            finally:
+                with self._lock:
+                    self._building = False
+
+
+def snapshot_directory(tenant_id=None):
+    """
+    Return the snapshot directory of a tenant, or None if snapshots are disabled.
+
+    Args:
+        tenant_id (int, optional): Defaults to the current tenant.
+    """
+    root = current_app.config.get("SNAPSHOT_DIR")
+    if not root:
+        return None
+    return os.path.join(current_app.instance_path, root, str(tenant_id or tenant_default()))
+
+
+def current_manifest():
+    """
+    Return the current tenant's snapshot manifest, or None if it's stale or disabled.
+    """
+    if snapshot_directory() is None:
+        return None
+    tenant_id = tenant_default()
+    return current_app.extensions["snapshots"].get(tenant_id).current(tenant_id)
+
+
+def serve_listing(department=None, location=None, open_only=False):
+    """
+    Serve a job listing from the snapshot without touching the database.
+
+    Args:
+        department (str, optional): Keep the jobs of this department.
+        location (str, optional): Keep the jobs at this location.
+        open_only (bool): Keep only jobs still accepting applications.
+
+    Returns:
+        Response | None: The listing, or None if the caller must query the
+        database (snapshot stale or disabled, or both filters given).
+    """
+    if department and location:
+        return None
+    manifest = current_manifest()
+    if manifest is None:
+        return None
+
+    if department:
+        listings = manifest["departments"].get(department.strip())
+    elif location:
+        listings = manifest["locations"].get(location.strip())
+    else:
+        listings = manifest["jobs"]
+    if listings is None:
+        body, filename = b"[]", None
+    else:
+        filename = listings["open" if open_only else "all"]
+        try:
+            with open(os.path.join(snapshot_directory(), filename), "rb") as file:
+                body = file.read()
+        except FileNotFoundError:  # Removed by another process's rebuild
+            return None
+
+    response = current_app.response_class(body, mimetype="application/json")
+    if filename is not None:
+        response.set_etag(filename)
+        response.headers["Content-Location"] = url_for("snapshots.get_snapshot_file", filename=filename)
+    return response.make_conditional(request)
+
+
+def mark_changed(tenant_ids):
+    """
+    Mark the snapshots of tenants stale once the current transaction commits.
+
+    Job writes through the ORM are tracked automatically; call this after
+    writing the ``job`` table with Core statements.
+
+    Args:
+        tenant_ids (iterable): The tenants whose jobs were written.
+    """
+    db.session.info.setdefault(_CHANGED, set()).update(tenant_ids)
+
+
+@event.listens_for(Job, "after_insert")
+@event.listens_for(Job, "after_update")
+@event.listens_for(Job, "after_delete")
+def _track_job_write(mapper, connection, job):
+    db.session.info.setdefault(_CHANGED, set()).add(job.tenant_id)
+
+
+@event.listens_for(db.session, "after_commit")
+def _invalidate_snapshots(session):
+    # A rolled back write is left in the set; it only costs a spurious rebuild
+    tenant_ids = session.info.pop(_CHANGED, ())
+    if not tenant_ids or snapshot_directory(1) is None:
+        return
+    snapshots = current_app.extensions["snapshots"]
+    for tenant_id in tenant_ids:
+        try:
+            bump_generation(snapshot_directory(tenant_id))
+        except OSError:
+            # The data is committed; failing here would turn the request into an error
+            logger.exception("Marking the job board snapshot of tenant %s stale failed", tenant_id)
+            continue
+        snapshot = snapshots.peek(tenant_id)
+        if snapshot is not None:
+            snapshot.invalidate(tenant_id)
+
+
+def init_app(app):
+    """
+    Attach the per-tenant snapshots and register the ``flask build-snapshots`` command.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    workers = app.config.get("SNAPSHOT_WORKERS", 1)
+    app.extensions["snapshots"] = TenantNamespaces(lambda: Snapshot(workers))
+
+    @app.cli.command("build-snapshots")
+    def build_snapshots_command():
+        """Render the job board of every tenant into SNAPSHOT_DIR."""
+        if snapshot_directory(1) is None:
+            raise click.UsageError("SNAPSHOT_DIR isn't set.")
+        for tenant_id in db.session.execute(select(Tenant.id)).scalars():
+            manifest = build_snapshot(snapshot_directory(tenant_id), tenant_id)
+            click.echo(f"Tenant {tenant_id}: {len(manifest['details'])} job(s), version {manifest['version']}.")
@@ -0,0 +1,52 @@
+from flask import Blueprint, jsonify, request, send_from_directory
+from .rbac import requires
+from .snapshots import YEAR, current_manifest, snapshot_directory
+
+snapshots_bp = Blueprint("snapshots", __name__)
+
+
+@snapshots_bp.route("/snapshots/manifest.json", methods=["GET"])
+@requires("jobs:read")
+def get_snapshot_manifest():
+    """
+    Return the current tenant's job board snapshot manifest.
+
+    The manifest maps the job listings (``jobs``, ``departments`` and
+    ``locations``, each with ``all`` and ``open`` variants) and each job
+    (``details``) to their content-hashed files under ``/snapshots/``. Clients
+    revalidate it with ``If-None-Match``.
+
+    Returns:
+        JSON response containing the manifest, or 503 while it's being rebuilt.
+    """
+    if snapshot_directory() is None:
+        return jsonify({"message": "Snapshots are disabled"}), 404
+    manifest = current_manifest()
+    if manifest is None:
+        return jsonify({"message": "Snapshot is being rebuilt"}), 503
+
+    response = jsonify(manifest)
+    response.set_etag(manifest["version"])
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+@snapshots_bp.route("/snapshots/<filename>", methods=["GET"])
+@requires("jobs:read")
+def get_snapshot_file(filename):
+    """
+    Serve a content-hashed snapshot file, cacheable forever.
+
+    Args:
+        filename (str): The file name, as listed in the manifest.
+
+    Returns:
+        The JSON file, or 404 if it doesn't exist (anymore).
+    """
+    directory = snapshot_directory()
+    if directory is None:
+        return jsonify({"message": "Snapshots are disabled"}), 404
+    response = send_from_directory(directory, filename, mimetype="application/json", max_age=YEAR)
+    response.cache_control.private = True
+    response.cache_control.immutable = True
+    return response
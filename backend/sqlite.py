@@ -0,0 +1,130 @@
+"""
+Production settings for SQLite databases, for campuses too small for PostgreSQL.
+
+With ``SQLITE_TUNING`` on and a file-backed SQLite URI:
+
+- every connection enables WAL journaling (readers no longer block the
+  writer or each other), waits ``SQLITE_BUSY_TIMEOUT`` ms for locks instead
+  of failing with "database is locked", syncs less often
+  (``synchronous=NORMAL``, safe with WAL) and gets a larger page cache and
+  memory-mapped I/O;
+- reads use a pool of ``SQLITE_READ_POOL_SIZE`` connections;
+- writes go through a second engine with a single connection, whose pool is
+  the queue writers wait in. Its transactions start with ``BEGIN IMMEDIATE``
+  so they take the write lock up front rather than failing when a read
+  transaction tries to upgrade.
+
+``RoutingSession`` sends flushes and DML statements to the writer. Once a
+transaction has written, it stays on the writer until it ends, so it reads
+its own writes. Reads before the first write use the pool, which keeps the
+writer's turn short.
+
+This module is imported before ``db`` exists, so it only reaches the
+extension through the app.
+"""
+import sqlalchemy as sa
+from flask import current_app
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+WRITER = "sqlite_writer"  # app.extensions key of the single-connection writer engine
+
+
+class RoutingSession(Session):
+    """
+    ``db.session`` class routing writes to the writer engine when there is one.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        writer = current_app.extensions.get(WRITER)
+        if writer is not None and bind is None and (
+            self.info.get(WRITER)
+            or self._flushing
+            or isinstance(clause, sa.sql.expression.UpdateBase)
+        ):
+            self.info[WRITER] = True
+            return writer
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _leave_writer(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(WRITER, None)
+
+
+def _file_database(uri):
+    url = sa.engine.make_url(uri)
+    return url.get_backend_name() == "sqlite" and url.database not in (None, "", ":memory:")
+
+
+def configure(app):
+    """
+    Size the read pool of the tuned mode.
+
+    Must run before ``db.init_app``, which creates the engine.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    config = app.config
+    uri = config.get("SQLALCHEMY_DATABASE_URI")
+    if not config.get("SQLITE_TUNING") or not uri or not _file_database(uri):
+        return
+    config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        **config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+        "pool_size": config["SQLITE_READ_POOL_SIZE"],
+    }
+
+
+def _tune(engine, config, writer):
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT'])}",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        f"PRAGMA cache_size={int(config['SQLITE_CACHE_SIZE'])}",
+    ]
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+        if writer:
+            # Let SQLAlchemy emit BEGIN itself (see begin_immediate)
+            dbapi_connection.isolation_level = None
+
+    if writer:
+        @event.listens_for(engine, "begin")
+        def begin_immediate(connection):
+            connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def init_app(app):
+    """
+    Create the writer engine of the tuned mode and apply the pragmas and
+    transaction handling to both engines.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    config = app.config
+    uri = config.get("SQLALCHEMY_DATABASE_URI")
+    if not config.get("SQLITE_TUNING") or not uri or not _file_database(uri):
+        return
+    with app.app_context():
+        reader = app.extensions["sqlalchemy"].engine
+    # The reader's URL has the database path resolved against the instance folder
+    writer = sa.create_engine(reader.url, pool_size=1, max_overflow=0, pool_timeout=config["SQLITE_WRITE_TIMEOUT"])
+    _tune(reader, config, writer=False)
+    _tune(writer, config, writer=True)
+    app.extensions[WRITER] = writer
+
+
+def writer_engine():
+    """
+    Return the engine writes should use: the writer in the tuned mode, else the default.
+    """
+    return current_app.extensions.get(WRITER) or current_app.extensions["sqlalchemy"].engine
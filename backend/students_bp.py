@@ -1,10 +1,24 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, g, jsonify
 from .models import db, User, Application
+from .audit import record_updates
+from .events import publish
+from .capacity import delete_application
+from .upsert import update_returning
+from .rbac import requires, scope
+from .tenancy import tenant_default
+from .unit_of_work import on_commit, transactional
+from . import schemas
+from .schemas import validate
 
 students_bp = Blueprint("students", __name__)
 
+PROFILE_COLUMNS = [User.id, User.username, User.first_name, User.last_name, User.email, User.role, User.education_level]
+
 # Edit Student Profile Endpoint
 @students_bp.route("/edit/<int:student_id>", methods=["PUT"])
+@requires("profiles:edit")
+@validate(schemas.PROFILE)
+@transactional
 def edit_student_profile(student_id):
     """
     Edit the profile of a student.
@@ -13,43 +27,29 @@ def edit_student_profile(student_id):
         student_id (int): The ID of the student to be edited.
 
     Returns:
-        dict: A JSON response containing the updated student profile.
+        dict: A JSON response containing the updated profile fields.
 
     Raises:
-        404: If the student with the given ID is not found.
+        404: If the student with the given ID is not found, or is another
+            user and the current user may only edit their own profile.
     """
-    student = db.session.get(User, student_id)
-    if not student:
+    if scope(User.query, User).filter(User.id == student_id).with_entities(User.id).first() is None:
+        return jsonify({"message": "User not found"}), 404
+    data = g.data
+    values = {key: data[key] for key in ("first_name", "last_name", "education_level", "resume") if key in data}
+    student = update_returning(User, student_id, values, PROFILE_COLUMNS)
+    if student is None:
         return jsonify({"message": "User not found"}), 404
 
-    data = request.json
-    student.first_name = data.get("first_name", student.first_name)
-    student.last_name = data.get("last_name", student.last_name)
-    student.education_level = data.get("education_level", student.education_level)
-    student.resume = data.get("resume", student.resume)
-    db.session.commit()
-    return jsonify(student.to_dict()), 200
-
-# Apply for a Job Endpoint
-@students_bp.route("/apply/<int:student_id>/<int:job_id>", methods=["POST"])
-def apply_for_job(student_id, job_id):
-    """
-    Apply for a job by creating a new application.
-
-    Args:
-        student_id (int): The ID of the student applying for the job.
-        job_id (int): The ID of the job being applied for.
-
-    Returns:
-        dict: A dictionary representing the newly created application.
-    """
-    new_application = Application(student_id=student_id, job_id=job_id)
-    db.session.add(new_application)
-    db.session.commit()
-    return jsonify(new_application.to_dict()), 201
+    if "resume" in data:
+        # Tells the resume index to reindex the student's applications; the text itself stays out of the log
+        record_updates("user", [(student_id, tenant_default(), {"resume": [None, None]})])
+    return jsonify(student), 200
 
 # Withdraw Application Endpoint
 @students_bp.route("/withdraw/<int:application_id>", methods=["DELETE"])
+@requires("applications:withdraw")
+@transactional
 def withdraw_application(application_id):
         """
         Withdraws an application by its ID.
@@ -60,12 +60,13 @@ def withdraw_application(application_id):
         Returns:
         - JSON response: A JSON response indicating the result of the withdrawal operation.
             - If the application is found and successfully withdrawn, returns {"message": "Application withdrawn successfully"} with status code 200.
-            - If the application is not found, returns {"message": "Application not found"} with status code 404.
+            - If the application is not found, or isn't the current student's, returns {"message": "Application not found"} with status code 404.
         """
-        application = db.session.get(Application, application_id)
+        application = scope(Application.query, Application).filter(Application.id == application_id).first()
         if not application:
                 return jsonify({"message": "Application not found"}), 404
 
-        db.session.delete(application)
-        db.session.commit()
+        recipients = [application.student_id, application.job.employer_id if application.job else None]
+        delete_application(application)
+        on_commit(publish, "application.withdrawn", {"id": application_id}, user_ids=recipients)
         return jsonify({"message": "Application withdrawn successfully"}), 200
\ No newline at end of file
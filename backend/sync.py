@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta
+
+import click
+from flask import current_app, jsonify
+from sqlalchemy import event, inspect
+
+from . import db
+from .models import Job, Team, Tombstone, WSTracker
+
+# Models served through delta syncs; deleting one leaves a tombstone
+SYNCED = (Job, Team, WSTracker)
+
+
+class SyncTokenError(ValueError):
+    """Raised for sync tokens that are malformed or older than the tombstones kept."""
+
+
+def make_token(moment):
+    return moment.isoformat(timespec="microseconds")
+
+
+def parse_token(token):
+    """
+    Turn a sync token back into the cutoff rows must have changed after.
+
+    The cutoff is moved back by ``SYNC_SAFETY_WINDOW`` seconds so that rows
+    written by transactions still in flight when the token was issued are
+    picked up by the next sync; clients upsert by id, so repeats are harmless.
+
+    Args:
+        token (str): The token returned by a previous sync.
+
+    Returns:
+        datetime: The cutoff.
+
+    Raises:
+        SyncTokenError: If the token is malformed or has expired.
+    """
+    try:
+        issued_at = datetime.fromisoformat(token)
+    except ValueError:
+        raise SyncTokenError("Invalid sync token") from None
+    if issued_at < datetime.utcnow() - timedelta(days=current_app.config["SYNC_TOMBSTONE_DAYS"]):
+        raise SyncTokenError("Sync token has expired, do a full sync")
+    return issued_at - timedelta(seconds=current_app.config["SYNC_SAFETY_WINDOW"])
+
+
+def record_deletions(table_name, rows, connection=None):
+    """
+    Leave tombstones for rows deleted outside the ORM (e.g. bulk archiving).
+
+    Args:
+        table_name (str): The table the rows were deleted from.
+        rows (list): ``(id, tenant_id)`` of each deleted row.
+        connection (Connection, optional): Defaults to the session's connection.
+    """
+    if not rows:
+        return
+    deleted_at = datetime.utcnow()
+    (connection or db.session.connection()).execute(
+        Tombstone.__table__.insert(),
+        [
+            {"table_name": table_name, "row_id": row_id, "tenant_id": tenant_id, "deleted_at": deleted_at}
+            for row_id, tenant_id in rows
+        ],
+    )
+
+
+@event.listens_for(db.session, "after_flush")
+def _record_deleted_rows(session, flush_context):
+    deleted = {}
+    for obj in session.deleted:
+        if isinstance(obj, SYNCED):
+            mapper = inspect(obj).mapper
+            deleted.setdefault(mapper.local_table.name, []).append(
+                (mapper.primary_key_from_instance(obj)[0], obj.tenant_id)
+            )
+    for table_name, rows in deleted.items():
+        record_deletions(table_name, rows, session.connection())
+
+
+def delta(query, model, token):
+    """
+    Restrict a list query to the rows changed since a sync token.
+
+    Args:
+        query (Query): The (possibly filtered) query over ``model``.
+        model: One of the ``SYNCED`` models.
+        token (str): The token from the previous sync, or "" for a full sync.
+
+    Returns:
+        tuple: ``(query, deleted_ids, new_token)``.
+
+    Raises:
+        SyncTokenError: If the token is malformed or has expired.
+    """
+    # Taken before reading, so rows committed while we read are caught next time
+    new_token = make_token(datetime.utcnow())
+    if not token:
+        return query, [], new_token
+
+    cutoff = parse_token(token)
+    deleted = db.session.scalars(
+        db.select(Tombstone.row_id).where(
+            Tombstone.table_name == model.__table__.name, Tombstone.deleted_at > cutoff
+        )
+    ).all()
+    return query.filter(model.updated_at > cutoff), sorted(set(deleted)), new_token
+
+
+def sync_response(query, model, token, serialize=lambda row: row.to_dict()):
+    """
+    Build the ``?since=`` response of a list endpoint.
+
+    Args:
+        query (Query): The list query.
+        model: One of the ``SYNCED`` models.
+        token (str): The ``since`` parameter.
+        serialize (callable): Turns a row into its JSON representation.
+
+    Returns:
+        tuple: A JSON response with the changed ``items``, the ``deleted`` IDs
+        and the next ``sync_token``, and its status code.
+    """
+    try:
+        query, deleted, new_token = delta(query, model, token)
+    except SyncTokenError as error:
+        return jsonify({"message": str(error)}), 410
+    return jsonify({
+        "items": [serialize(row) for row in query],
+        "deleted": deleted,
+        "sync_token": new_token,
+    }), 200
+
+
+def prune_tombstones(days):
+    """
+    Delete tombstones older than any sync token still accepted.
+
+    Args:
+        days (int): Keep this many days of tombstones.
+
+    Returns:
+        int: The number of tombstones deleted.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    pruned = db.session.execute(db.delete(Tombstone).where(Tombstone.deleted_at < cutoff)).rowcount
+    db.session.commit()
+    return pruned
+
+
+def init_app(app):
+    """
+    Register the ``flask prune-tombstones`` command.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    @app.cli.command("prune-tombstones")
+    def prune_tombstones_command():
+        """Delete tombstones older than SYNC_TOMBSTONE_DAYS (run it from cron)."""
+        pruned = prune_tombstones(app.config["SYNC_TOMBSTONE_DAYS"])
+        click.echo(f"Pruned {pruned} tombstone(s).")
@@ -0,0 +1,103 @@
+from itertools import chain
+
+from sqlalchemy import event, inspect, insert, select
+
+from . import db
+from .models import Department, Job, RoleLocation, Semester, WorkType
+
+# (Job string attribute, Job lookup id attribute, lookup model)
+LOOKUPS = (
+    ("department", "department_id", Department),
+    ("role_location", "role_location_id", RoleLocation),
+    ("type_of_work", "type_of_work_id", WorkType),
+)
+
+
+def split_semesters(value):
+    """
+    Split a ``hiring_semesters`` value into distinct semester names.
+
+    Args:
+        value (str | list): A comma-joined string or a list of names.
+
+    Returns:
+        list: The stripped, de-duplicated names in their original order.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    names = []
+    for name in value:
+        name = name.strip()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+def resolve(connection, model, names):
+    """
+    Map lookup names to ids, inserting the names that don't exist yet.
+
+    Args:
+        connection (Connection): The connection (and transaction) to use.
+        model: The lookup model (``Semester``, ``Department``, ...).
+        names (iterable): The names to resolve.
+
+    Returns:
+        dict: name -> id.
+    """
+    names = {name for name in names if name}
+    if not names:
+        return {}
+    table = model.__table__
+    ids = dict(connection.execute(select(table.c.name, table.c.id).where(table.c.name.in_(names))).all())
+    missing = names - ids.keys()
+    if missing:
+        connection.execute(insert(table), [{"name": name} for name in sorted(missing)])
+        ids.update(connection.execute(select(table.c.name, table.c.id).where(table.c.name.in_(missing))).all())
+    return ids
+
+
+def lookup_id(model, name):
+    """
+    Build a scalar subquery selecting the id of a lookup name.
+
+    Args:
+        model: The lookup model.
+        name (str): The name to look up.
+
+    Returns:
+        ScalarSelect: The subquery, usable in ``Job.department_id == ...`` filters.
+    """
+    return select(model.id).where(model.name == name.strip()).scalar_subquery()
+
+
+def _changed(job, attribute):
+    state = inspect(job)
+    return state.pending or state.attrs[attribute].history.has_changes()
+
+
+@event.listens_for(db.session, "before_flush")
+def _sync_job_taxonomy(session, flush_context, instances):
+    jobs = [obj for obj in chain(session.new, session.dirty) if isinstance(obj, Job)]
+    if not jobs:
+        return
+
+    connection = session.connection()
+    for attribute, id_attribute, model in LOOKUPS:
+        changed = [job for job in jobs if _changed(job, attribute)]
+        if not changed:
+            continue
+        ids = resolve(connection, model, [(getattr(job, attribute) or "").strip() for job in changed])
+        for job in changed:
+            setattr(job, id_attribute, ids.get((getattr(job, attribute) or "").strip()))
+
+    changed = [job for job in jobs if _changed(job, "hiring_semesters")]
+    if not changed:
+        return
+    ids = resolve(connection, Semester, chain.from_iterable(split_semesters(job.hiring_semesters) for job in changed))
+    with session.no_autoflush:
+        semesters = {semester.id: semester for semester in session.query(Semester).filter(Semester.id.in_(ids.values()))}
+    for job in changed:
+        job.semesters = [semesters[ids[name]] for name in split_semesters(job.hiring_semesters)]
@@ -0,0 +1,146 @@
+import threading
+
+import click
+from flask import current_app, g, has_request_context, jsonify, request
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.orm import declared_attr, with_loader_criteria
+
+from . import db
+
+# Rows created outside a request (CLI commands, legacy rows) belong here
+DEFAULT_TENANT_ID = 1
+DEFAULT_TENANT_SLUG = "default"
+
+
+def current_tenant_id():
+    """
+    Return the tenant of the current request, or None outside of one.
+    """
+    if has_request_context():
+        return g.get("tenant_id")
+    return None
+
+
+def tenant_default():
+    return current_tenant_id() or DEFAULT_TENANT_ID
+
+
+class TenantScoped:
+    """
+    Mixin for models whose rows belong to a tenant (a campus or program).
+
+    Queries for these models are filtered to the current request's tenant, and
+    new rows are assigned to it.
+    """
+    @declared_attr
+    def tenant_id(cls):
+        return db.Column(db.Integer, db.ForeignKey("tenant.id"), nullable=False, default=tenant_default)
+
+
+@event.listens_for(db.session, "do_orm_execute")
+def _scope_to_tenant(orm_execute_state):
+    if (
+        not (orm_execute_state.is_select or orm_execute_state.is_update or orm_execute_state.is_delete)
+        or orm_execute_state.is_column_load
+        or orm_execute_state.is_relationship_load
+        or orm_execute_state.execution_options.get("all_tenants", False)
+    ):
+        return
+    tenant_id = current_tenant_id()
+    if tenant_id is None:
+        return
+    orm_execute_state.statement = orm_execute_state.statement.options(
+        with_loader_criteria(TenantScoped, lambda cls: cls.tenant_id == tenant_id, include_aliases=True)
+    )
+
+
+class TenantNamespaces:
+    """
+    One instance of a per-app cache per tenant, created on first use.
+
+    Args:
+        factory (callable): Builds the cache of a tenant.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._namespaces = {}
+
+    def get(self, tenant_id=None):
+        """
+        Return the cache of a tenant, creating it if needed.
+
+        Args:
+            tenant_id (int, optional): Defaults to the current tenant.
+        """
+        tenant_id = tenant_id or tenant_default()
+        with self._lock:
+            if tenant_id not in self._namespaces:
+                self._namespaces[tenant_id] = self.factory()
+            return self._namespaces[tenant_id]
+
+    def peek(self, tenant_id):
+        """
+        Return the cache of a tenant if it has been created, else None.
+        """
+        return self._namespaces.get(tenant_id)
+
+
+def resolve_tenant():
+    """
+    Work out the tenant of the request (a ``before_request`` hook).
+
+    Signed-in users always act within their own tenant; other requests may
+    name one with the ``X-Tenant`` header (its slug) and otherwise use the
+    default tenant.
+    """
+    from .models import Tenant
+
+    slug = request.headers.get(current_app.config["TENANT_HEADER"])
+    if current_user.is_authenticated:
+        tenant_id = current_user.tenant_id
+        if slug and db.session.get(Tenant, tenant_id).slug != slug:
+            return jsonify({"message": "Not a member of this tenant"}), 403
+    elif slug:
+        tenant_id = db.session.query(Tenant.id).filter_by(slug=slug).scalar()
+        if tenant_id is None:
+            return jsonify({"message": "Unknown tenant"}), 404
+    else:
+        tenant_id = DEFAULT_TENANT_ID
+    g.tenant_id = tenant_id
+
+
+def ensure_default_tenant():
+    """
+    Create the default tenant if the database doesn't have it yet.
+    """
+    from .models import Tenant
+
+    if db.session.get(Tenant, DEFAULT_TENANT_ID) is None:
+        # Left to the sequence so later tenants don't collide; the first row gets id 1
+        db.session.add(Tenant(slug=DEFAULT_TENANT_SLUG, name="Default"))
+        db.session.commit()
+
+
+def init_app(app):
+    """
+    Resolve the tenant of every request and register the ``flask create-tenant`` command.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    app.before_request(resolve_tenant)
+
+    @app.cli.command("create-tenant")
+    @click.argument("slug")
+    @click.argument("name")
+    def create_tenant_command(slug, name):
+        """Add a tenant (campus or program); clients select it with the X-Tenant header."""
+        from .models import Tenant
+
+        tenant = Tenant(slug=slug, name=name)
+        db.session.add(tenant)
+        db.session.commit()
+        click.echo(f"Created tenant {tenant.id} ({slug}).")
@@ -0,0 +1,78 @@
+import unittest
+from datetime import datetime
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.models import ChangeLog, User, WSTracker
+
+
+class ChangeLogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.admin = User(username="admin", password=generate_password_hash("pw"), first_name="A",
+                          last_name="Admin", email="admin@example.com", role="admin")
+        db.session.add(self.admin)
+        db.session.commit()
+        self.position = WSTracker(student_id="S1", minerva_email="s@example.com", full_name="Sam Student",
+                                  expected_grad_year=2026, paycom_id="P-1")
+        db.session.add(self.position)
+        db.session.commit()
+        self.client.post("auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_update_logs_changed_columns_only(self):
+        self.client.put(f"/ws-position-tracker/{self.position.id}", json={"paycom_id": "P-2", "full_name": "Sam Student"})
+
+        change = ChangeLog.query.order_by(ChangeLog.id.desc()).first()
+        self.assertEqual((change.table_name, change.row_id, change.operation), ("ws_tracker", self.position.id, "update"))
+        self.assertEqual(change.changes, {"paycom_id": ["P-1", "P-2"]})
+        self.assertEqual(change.user_id, self.admin.id)
+
+    def test_rolled_back_changes_are_not_logged(self):
+        self.position.paycom_id = "P-3"
+        db.session.flush()
+        db.session.rollback()
+        self.assertEqual([change.operation for change in ChangeLog.query], ["insert"])
+
+    def test_changes_feed_pages_by_cursor(self):
+        self.client.put(f"/ws-position-tracker/{self.position.id}", json={"paycom_id": "P-2"})
+        self.client.delete(f"/ws-position-tracker/{self.position.id}")
+
+        first = self.client.get("/changes?limit=2").get_json()
+        self.assertEqual([change["operation"] for change in first["changes"]], ["insert", "update"])
+        rest = self.client.get(f"/changes?since={first['next']}").get_json()
+        self.assertEqual([change["operation"] for change in rest["changes"]], ["delete"])
+        self.assertEqual(self.client.get(f"/changes?since={rest['next']}").get_json()["changes"], [])
+
+    def test_changes_feed_rejects_empty_pages(self):
+        for limit in (0, -1):
+            self.assertEqual(self.client.get(f"/changes?limit={limit}").status_code, 400)
+
+    def log(self, change_id):
+        # As written by a transaction that took its ID at flush and committed now
+        db.session.add(ChangeLog(id=change_id, table_name="ws_tracker", row_id=self.position.id, operation="update",
+                                 changes={"notes": [None, str(change_id)]}, changed_at=datetime.utcnow()))
+        db.session.commit()
+
+    def test_changes_committed_late_are_not_skipped(self):
+        self.log(4)
+        first = self.client.get("/changes").get_json()
+        self.assertEqual([change["id"] for change in first["changes"]], [1, 4])
+        self.assertEqual(first["next"], "4:2,3")
+
+        # 2 and 3 were still in flight; 3 commits after 4 was read
+        self.log(3)
+        late = self.client.get(f"/changes?since={first['next']}").get_json()
+        self.assertEqual([change["id"] for change in late["changes"]], [3])
+        self.assertEqual(late["next"], "4:2")
+        self.assertEqual(self.client.get(f"/changes?since={late['next']}").get_json()["changes"], [])
+
+        self.assertEqual(self.client.get("/changes?since=4:x").status_code, 400)
@@ -51,4 +51,7 @@ class AuthBpTestCase(unittest.TestCase):
         self.assertEqual(
             response.get_json(),
             {"message": "Invalid username or password"},
-        )
\ No newline at end of file
+        )
+
+    def test_login_only_accepts_posts(self):
+        self.assertEqual(self.client.get("auth/login").status_code, 405)
@@ -0,0 +1,207 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend import placement
+from backend.capacity import reserve
+from backend.lifecycle import roll_term
+from backend.models import Application, Job, User
+from backend.sqlite import writer_engine
+
+
+def make_job(employer, max_students):
+    return Job(employer_id=employer.id, title="Desk", department="Library", manager_name="M",
+               manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1,
+               max_students=max_students, role_location="SF", type_of_work="Admin", brief_description="Work",
+               application_deadline="2030-01-01")
+
+
+def make_students(count):
+    return [
+        User(username=f"student{i}", password=generate_password_hash("pw", method="pbkdf2:sha256:1"),
+             first_name="S", last_name=str(i), email=f"student{i}@example.com", role="Student")
+        for i in range(count)
+    ]
+
+
+def make_applications(students, job):
+    return [
+        Application(student_id=student.id, job_id=job.id, email_address=student.email, year_of_graduation=2027,
+                    candidate_statement="Hi", term="Fall 2026")
+        for student in students
+    ]
+
+
+class CapacityTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.admin = User(username="admin", password=generate_password_hash("pw"), first_name="Ad",
+                          last_name="Min", email="admin@example.com", role="admin")
+        self.students = make_students(3)
+        db.session.add_all([self.admin, *self.students])
+        db.session.flush()
+        self.job = make_job(self.admin, max_students=2)
+        db.session.add(self.job)
+        db.session.flush()
+        self.applications = make_applications(self.students, self.job)
+        db.session.add_all(self.applications)
+        db.session.commit()
+        self.ids = [application.id for application in self.applications]
+        self.client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def review(self, application_id, status):
+        return self.client.put(f"/applications/{application_id}", json={"status": status})
+
+    def accepted_count(self):
+        db.session.expire_all()
+        return db.session.get(Job, self.job.id).accepted_count
+
+    def test_full_jobs_refuse_acceptances(self):
+        self.assertEqual(self.review(self.ids[0], "accepted").status_code, 200)
+        # Accepting twice takes one seat
+        self.assertEqual(self.review(self.ids[0], "accepted").status_code, 200)
+        self.assertEqual(self.review(self.ids[1], "accepted").get_json()["status"], "accepted")
+        self.assertEqual(self.accepted_count(), 2)
+
+        response = self.review(self.ids[2], "accepted")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(db.session.get(Application, self.ids[2]).status, "pending")
+        self.assertEqual(self.accepted_count(), 2)
+
+    def test_seats_are_given_back(self):
+        self.review(self.ids[0], "accepted")
+        self.review(self.ids[1], "accepted")
+
+        self.assertEqual(self.review(self.ids[0], "rejected").status_code, 200)
+        self.assertEqual(self.review(self.ids[0], "withdrawn").status_code, 200)
+        self.assertEqual(self.accepted_count(), 1)
+        self.assertEqual(self.review(self.ids[2], "accepted").status_code, 200)
+
+        self.assertEqual(self.client.delete(f"/applications/{self.ids[1]}").status_code, 200)
+        self.assertEqual(self.accepted_count(), 1)
+        roll_term("Fall 2026")
+        self.assertEqual(self.accepted_count(), 0)
+
+    def test_jobs_never_shrink_below_their_acceptances(self):
+        self.review(self.ids[0], "accepted")
+        self.review(self.ids[1], "accepted")
+
+        response = self.client.put(f"/jobs/{self.job.id}", json={"maxStudents": 1, "positionTitle": "Front desk"})
+        self.assertEqual(response.status_code, 409)
+        db.session.expire_all()
+        self.assertEqual((self.job.max_students, self.job.title), (2, "Desk"))
+
+        self.assertEqual(self.client.put(f"/jobs/{self.job.id}", json={"maxStudents": 3}).get_json()["max_students"], 3)
+        self.assertEqual(self.client.get(f"/jobs/{self.job.id}").get_json()["max_students"], 3)
+        self.assertEqual(self.review(self.ids[2], "accepted").status_code, 200)
+
+    def test_withdrawals_give_seats_back(self):
+        self.review(self.ids[0], "accepted")
+        self.review(self.ids[1], "accepted")
+
+        self.assertEqual(self.client.delete(f"/withdraw/{self.ids[0]}").status_code, 200)
+        self.assertEqual(self.accepted_count(), 1)
+        self.assertEqual(self.client.delete(f"/user-applications/{self.ids[1]}").status_code, 200)
+        self.assertEqual(self.accepted_count(), 0)
+        self.assertEqual(self.review(self.ids[2], "accepted").status_code, 200)
+
+    def test_placement_skips_jobs_filled_since_the_plan(self):
+        result = placement.plan()
+        self.assertEqual(len(result["assignments"]), 2)
+        self.assertTrue(reserve(self.job.id))
+        db.session.commit()
+
+        self.assertEqual(placement.commit(result), (set(), set()))
+        db.session.commit()
+        self.assertEqual(Application.query.filter_by(status="accepted").count(), 0)
+        self.assertEqual(self.accepted_count(), 1)
+
+        with mock.patch.object(placement, "plan", return_value=result):
+            response = self.client.post("/placements/commit", json={}).get_json()
+        self.assertEqual((response["accepted"], response["assignments"]), (0, []))
+        self.assertEqual([skipped["application_id"] for skipped in response["skipped"]],
+                         [assignment[0] for assignment in result["assignments"]])
+
+
+class ConcurrentAcceptanceTestCase(unittest.TestCase):
+    """Hundreds of acceptances from concurrent workers sharing a SQLite file."""
+
+    APPLICATIONS = 300
+    SEATS = 40
+    WORKERS = 8
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.app = create_app('testing', SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(self.directory, 'test.db')}")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        admin = User(username="admin", password=generate_password_hash("pw", method="pbkdf2:sha256:1"),
+                     first_name="Ad", last_name="Min", email="admin@example.com", role="admin")
+        students = make_students(self.APPLICATIONS)
+        db.session.add_all([admin, *students])
+        db.session.flush()
+        self.jobs = [make_job(admin, max_students=self.SEATS // 2) for _ in range(2)]
+        db.session.add_all(self.jobs)
+        db.session.flush()
+        db.session.add_all(make_applications(students[::2], self.jobs[0]))
+        db.session.add_all(make_applications(students[1::2], self.jobs[1]))
+        db.session.commit()
+        self.ids = [application.id for application in Application.query.order_by(Application.id)]
+        self.job_ids = [job.id for job in self.jobs]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        for engine in (db.engine, writer_engine()):
+            engine.dispose()
+        self.app_context.pop()
+        shutil.rmtree(self.directory)
+
+    def test_concurrent_acceptances_never_overfill(self):
+        statuses = []
+
+        def worker(ids):
+            client = self.app.test_client()
+            client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+            for application_id in ids:
+                statuses.append(client.put(f"/applications/{application_id}", json={"status": "accepted"}).status_code)
+
+        threads = [threading.Thread(target=worker, args=(self.ids[i::self.WORKERS],)) for i in range(self.WORKERS)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(len(statuses), self.APPLICATIONS)
+        self.assertEqual(statuses.count(200), self.SEATS)
+        self.assertEqual(statuses.count(409), self.APPLICATIONS - self.SEATS)
+        db.session.expire_all()
+        for job_id in self.job_ids:
+            accepted = Application.query.filter_by(job_id=job_id, status="accepted").count()
+            self.assertEqual(accepted, self.SEATS // 2)
+            self.assertEqual(db.session.get(Job, job_id).accepted_count, accepted)
+        # Generous, so only pathological serialization (e.g. lock timeouts) fails it
+        self.assertGreater(self.APPLICATIONS / elapsed, 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from datetime import datetime
+from sqlalchemy import event, func
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.catalog import JobRecord, get_catalog
+from backend.lifecycle import archive_expired_jobs
+from backend.matching import get_engine, student_features
+from backend.models import ChangeLog, Job, Team, Tenant, User
+
+
+class CatalogTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        admin = User(username="admin", password=generate_password_hash("pw"), first_name="Ad", last_name="Min",
+                     email="admin@example.com", role="admin")
+        other = Tenant(slug="other", name="Other")
+        db.session.add_all([admin, other])
+        db.session.flush()
+        db.session.add_all([
+            Team(name="Library", manager="M", email="m@example.com", max_students=2, priority="High"),
+            Team(name="Elsewhere", manager="M", email="m@example.com", max_students=2, priority="High",
+                 tenant_id=other.id),
+        ])
+        self.job = Job(employer_id=admin.id, title="Desk", department="Library", manager_name="M",
+                       manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1, max_students=2,
+                       role_location="SF", type_of_work="Admin", brief_description="Work",
+                       application_deadline="2020-01-01")
+        db.session.add(self.job)
+        db.session.commit()
+        self.client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+        self.statements = []
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            self.statements.append(statement)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def team_names(self):
+        return [team["name"] for team in self.client.get("/teams").get_json()]
+
+    def test_records_render_like_the_models(self):
+        record = get_catalog().job(self.job.id)
+        self.assertIsInstance(record, JobRecord)
+        self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual(record.to_dict(), self.job.to_dict())
+        self.assertEqual(self.client.get(f"/jobs/{self.job.id}").get_json(), self.job.to_dict())
+
+    def test_writes_are_visible_on_the_next_request(self):
+        self.assertEqual(self.team_names(), ["Library"])
+        self.client.post("/teams", json={"name": "Tutoring", "manager": "T", "email": "t@example.com",
+                                         "maxStudents": 1, "contact": None, "priority": "Low", "recruitingFor": None})
+        self.assertEqual(self.team_names(), ["Library", "Tutoring"])
+
+        library = Team.query.filter_by(name="Library").one()
+        self.client.put(f"/teams/{library.id}", json={"name": "Main Library"})
+        self.statements.clear()
+        self.assertEqual(self.team_names(), ["Main Library", "Tutoring"])
+        # Only the edited team is reloaded
+        reloads = [statement for statement in self.statements if "FROM team" in statement]
+        self.assertEqual(len(reloads), 1)
+        self.assertIn("IN", reloads[0])
+
+        self.statements.clear()
+        self.team_names()
+        self.assertEqual([statement for statement in self.statements if "FROM team" in statement], [])
+
+    def test_writes_committed_late_are_reloaded(self):
+        library = Team.query.filter_by(name="Library").one()
+        newest = db.session.scalar(db.select(func.max(ChangeLog.id)).execution_options(all_tenants=True))
+
+        def rename(name, change_id):
+            # As by a transaction that took its log ID at flush and committed now
+            db.session.execute(Team.__table__.update().where(Team.id == library.id).values(name=name))
+            db.session.add(ChangeLog(id=change_id, table_name="team", row_id=library.id, operation="update",
+                                     changes={"name": ["Library", name]}, changed_at=datetime.utcnow()))
+            db.session.commit()
+
+        self.assertEqual(self.team_names(), ["Library"])
+        rename("Stacks", newest + 2)
+        self.assertEqual(self.team_names(), ["Stacks"])
+        # The transaction holding the lower ID commits after the catalog read past it
+        rename("Main Library", newest + 1)
+        self.assertEqual(self.team_names(), ["Main Library"])
+
+    def test_bulk_deleted_jobs_disappear(self):
+        job_id = self.job.id
+        self.assertEqual(self.client.get(f"/jobs/{job_id}").status_code, 200)
+        archive_expired_jobs()
+        self.assertEqual(self.client.get(f"/jobs/{job_id}").status_code, 404)
+
+    def test_matching_follows_jobs_written_elsewhere(self):
+        features = student_features("Junior", "python data analysis")
+        self.assertEqual(get_engine().score(features), {})
+
+        # As by another process: no ORM events here, only the row and its log entry
+        db.session.execute(Job.__table__.update().where(Job.id == self.job.id).values(title="Python data analyst"))
+        db.session.add(ChangeLog(table_name="job", row_id=self.job.id, operation="update",
+                                 changes={"title": ["Desk", "Python data analyst"]}, changed_at=datetime.utcnow()))
+        db.session.commit()
+        self.assertIn(self.job.id, get_engine().score(features))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import gzip
+import unittest
+from flask import Response
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.encoding import COLUMNAR_MIMETYPE
+from backend.models import User, WSTracker
+
+
+class EncodingTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        db.session.add_all([
+            WSTracker(student_id=f"S{i}", minerva_email=f"s{i}@example.com", full_name=f"Student {i}",
+                      expected_grad_year=2026, notes="Works at the library desk")
+            for i in range(50)
+        ])
+        db.session.commit()
+
+        db.session.add(User(username="admin", password=generate_password_hash("pw"), first_name="A",
+                            last_name="Admin", email="admin@example.com", role="admin"))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def login(self):
+        self.client.post("auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+    def test_large_responses_are_gzipped(self):
+        self.login()
+        plain = self.client.get("/ws-position-tracker")
+        self.assertNotIn("Content-Encoding", plain.headers)
+
+        compressed = self.client.get("/ws-position-tracker", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(compressed.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", compressed.headers["Vary"])
+        self.assertLess(len(compressed.data), len(plain.data))
+        self.assertEqual(gzip.decompress(compressed.data), plain.data)
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get("/teams", headers={"Accept-Encoding": "gzip"})
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_streamed_responses_are_compressed_per_chunk(self):
+        @self.app.route("/stream-test")
+        def stream():
+            return Response((f"line {i}\n" for i in range(100)), mimetype="text/plain")
+
+        response = self.client.get("/stream-test", headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.data), "".join(f"line {i}\n" for i in range(100)).encode())
+
+    def test_columnar_json(self):
+        self.login()
+        rows = self.client.get("/ws-position-tracker").get_json()
+        response = self.client.get("/ws-position-tracker", headers={"Accept": COLUMNAR_MIMETYPE})
+        self.assertEqual(response.mimetype, COLUMNAR_MIMETYPE)
+        table = response.get_json()
+        self.assertEqual([dict(zip(table["columns"], row)) for row in table["rows"]], rows)
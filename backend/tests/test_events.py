@@ -0,0 +1,93 @@
+import threading
+import unittest
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.events import Broker, InMemoryBroker, get_broker, user_channel
+from backend.models import Application, Job, User
+
+
+class InMemoryBrokerTestCase(unittest.TestCase):
+    def test_fan_out_and_replay(self):
+        broker = InMemoryBroker()
+        first = broker.subscribe(["user:1"])
+        second = broker.subscribe(["user:2"])
+        broker.publish("user:1", {"type": "ping", "data": {}})
+        self.assertEqual(first.get(0)["type"], "ping")
+        self.assertIsNone(second.get(0))
+
+        # A reconnecting client gets what it missed since its last event id
+        first.close()
+        replayed = broker.subscribe(["user:1"], last_event_id=0)
+        self.assertEqual(replayed.get(0)["id"], 1)
+
+    def test_concurrent_publishers_drop_oldest_events(self):
+        self.assertRaises(TypeError, Broker)
+        broker = InMemoryBroker(queue_size=2)
+        subscription = broker.subscribe(["user:1"])
+        errors = []
+
+        def publisher():
+            try:
+                for _ in range(500):
+                    broker.publish("user:1", {"type": "ping", "data": {}})
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=publisher) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(subscription.queue.qsize(), 2)
+
+
+class EventsEndpointTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        employer = User(username="boss", password=generate_password_hash("pw"), first_name="A",
+                        last_name="Boss", email="boss@example.com", role="Employer")
+        self.student = User(username="stu", password=generate_password_hash("pw"), first_name="S",
+                            last_name="Student", email="stu@example.com", role="Student")
+        db.session.add_all([employer, self.student])
+        db.session.commit()
+        job = Job(employer_id=employer.id, title="Desk", department="Library", manager_name="A",
+                  manager_email="boss@example.com", hiring_semesters="Fall", min_students=1, max_students=2,
+                  role_location="SF", type_of_work="Admin", brief_description="Desk",
+                  application_deadline="2030-01-01")
+        db.session.add(job)
+        db.session.commit()
+        self.application = Application(student_id=self.student.id, job_id=job.id, email_address="stu@example.com",
+                                       year_of_graduation=2026, candidate_statement="Hi")
+        db.session.add(self.application)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_status_change_is_pushed_to_student(self):
+        subscription = get_broker().subscribe([user_channel(self.student.id)])
+        self.client.post("auth/login", json={"email": "boss@example.com", "password": "pw"})
+        self.client.put(f"/applications/{self.application.id}", json={"status": "accepted"})
+
+        event = subscription.get(0)
+        self.assertEqual(event["type"], "application.updated")
+        self.assertEqual(event["data"]["status"], "accepted")
+
+    def test_stream_formats_events(self):
+        self.client.post("auth/login", json={"email": "stu@example.com", "password": "pw"})
+        response = self.client.get("/events")
+        self.assertEqual(response.mimetype, "text/event-stream")
+
+        chunks = iter(response.response)
+        self.assertEqual(next(chunks), b"retry: 5000\n\n")
+        get_broker().publish(user_channel(self.student.id), {"type": "application.updated", "data": {"id": 1}})
+        self.assertIn(b"event: application.updated", next(chunks))
+        response.close()
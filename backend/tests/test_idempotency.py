@@ -0,0 +1,89 @@
+import io
+import unittest
+from sqlalchemy import text
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.migrations import deduplicate_applications
+from backend.models import Application, Job, User
+
+
+class ApplicationIdempotencyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.student = User(username="stu", password=generate_password_hash("pw"), first_name="S",
+                            last_name="Student", email="stu@example.com", role="Student")
+        db.session.add(self.student)
+        db.session.commit()
+        self.job = Job(employer_id=self.student.id, title="Desk", department="Library", manager_name="A",
+                       manager_email="boss@example.com", hiring_semesters="Fall", min_students=1, max_students=2,
+                       role_location="SF", type_of_work="Admin", brief_description="Desk",
+                       application_deadline="2030-01-01")
+        db.session.add(self.job)
+        db.session.commit()
+        self.client.post("auth/login", json={"email": "stu@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def apply(self, statement="Hi", key=None, resume=None):
+        headers = {"Idempotency-Key": key} if key else {}
+        data = {
+            "jobId": self.job.id, "emailAddress": "stu@example.com",
+            "yearOfGraduation": 2026, "candidateStatement": statement,
+        }
+        if resume is not None:
+            data["resume"] = (io.BytesIO(resume), "resume.txt")
+        return self.client.post("/apply", headers=headers, data=data)
+
+    def test_duplicate_application_returns_existing(self):
+        first = self.apply()
+        self.assertEqual(first.status_code, 201)
+        second = self.apply("Hi again")
+        self.assertEqual(second.status_code, 409)
+        self.assertEqual(second.get_json()["application"]["id"], first.get_json()["id"])
+        self.assertEqual(Application.query.count(), 1)
+
+    def test_idempotency_key_replays_response(self):
+        first = self.apply(key="abc")
+        retry = self.apply(key="abc")
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.get_json(), first.get_json())
+
+        # The same key can't be reused for a different request
+        self.assertEqual(self.apply("Changed", key="abc").status_code, 422)
+
+    def test_multipart_retries_replay_response(self):
+        # Each upload is encoded with a new multipart boundary
+        first = self.apply(key="upload", resume=b"Python and SQL")
+        self.assertEqual(first.status_code, 201)
+        retry = self.apply(key="upload", resume=b"Python and SQL")
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.headers["Idempotent-Replayed"], "true")
+        self.assertEqual(retry.get_json(), first.get_json())
+        self.assertEqual(db.session.get(Application, first.get_json()["id"]).resume, b"Python and SQL")
+
+        self.assertEqual(self.apply(key="upload", resume=b"Another resume").status_code, 422)
+
+    def test_migration_merges_duplicates(self):
+        with db.engine.begin() as connection:
+            connection.execute(text("DROP INDEX uq_application_student_job"))
+        for status in ("pending", "accepted", "pending"):
+            db.session.add(Application(student_id=self.student.id, job_id=self.job.id, status=status,
+                                       email_address="stu@example.com", year_of_graduation=2026,
+                                       candidate_statement="Hi"))
+        db.session.commit()
+
+        with db.engine.begin() as connection:
+            deduplicate_applications(connection)
+        db.session.expire_all()
+        application = Application.query.one()
+        self.assertEqual((application.id, application.status), (1, "accepted"))
+        self.assertEqual(self.apply().status_code, 409)
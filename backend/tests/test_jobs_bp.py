@@ -1,6 +1,7 @@
 import unittest
+from werkzeug.security import generate_password_hash
 from backend import create_app, db  # Assuming create_app is your factory function
-from backend.models import Job
+from backend.models import Job, User
 
 class EmployersBPTestCase(unittest.TestCase):
     def setUp(self):
@@ -10,6 +11,11 @@ class EmployersBPTestCase(unittest.TestCase):
         db.create_all()
         self.client = self.app.test_client()
 
+        db.session.add(User(username="boss", password=generate_password_hash("pw"), first_name="B",
+                            last_name="Oss", email="boss@example.com", role="Employer"))
+        db.session.commit()
+        self.client.post("auth/login", json={"email": "boss@example.com", "password": "pw"})
+
     def tearDown(self):
         db.session.remove()
         db.drop_all()
@@ -56,3 +62,15 @@ class EmployersBPTestCase(unittest.TestCase):
         self.assertEqual(job.brief_description, 'Job description')
         self.assertEqual(job.more_details, 'Additional details')
         self.assertEqual(job.application_deadline, '2022-12-31')
+
+    def test_employers_only_post_their_own_jobs(self):
+        job = {'title': 'Tutor', 'department': 'Academics', 'managerName': 'B', 'managerEmail': 'boss@example.com',
+               'hiringSemesters': 'Fall', 'minStudents': 1, 'maxStudents': 2, 'roleLocation': 'SF',
+               'typeOfWork': 'Tutoring', 'briefDescription': 'Tutor', 'applicationDeadline': '2030-01-01'}
+        self.assertEqual(self.client.post('/post-job', json={**job, 'employer_id': 99}).status_code, 403)
+        response = self.client.post('/post-job', json=job)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()['employer_id'], 1)
+
+        self.client.post("auth/logout")
+        self.assertEqual(self.client.post('/post-job', json=job).status_code, 401)
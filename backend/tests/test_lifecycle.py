@@ -0,0 +1,127 @@
+import unittest
+from datetime import datetime
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.dates import parse_deadline, term_for
+from backend.lifecycle import archive_expired_jobs, roll_term
+from backend.models import Application, ApplicationArchive, ChangeLog, Job, JobArchive, User
+
+
+class LifecycleTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        db.session.add(User(username="student", password=generate_password_hash("pw"), first_name="S",
+                            last_name="Student", email="student@example.com", role="Student"))
+        db.session.commit()
+        self.client.post("auth/login", json={"email": "student@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def add_job(self, title, deadline):
+        job = Job(employer_id=1, title=title, department="Library", manager_name="M",
+                  manager_email="m@example.com", hiring_semesters="Fall", min_students=1, max_students=2,
+                  role_location="SF", type_of_work="Admin", brief_description="Desk",
+                  application_deadline=deadline)
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    def search(self, **filters):
+        payload = {'department': '', 'keyword': '', 'location': '', **filters}
+        response = self.client.post('/job-search', json=payload)
+        if response.status_code != 200:
+            return response, None
+        return response, [job['title'] for job in response.get_json()]
+
+    def test_parse_deadline(self):
+        self.assertEqual(parse_deadline("06 Sept 2024"), datetime(2024, 9, 6, 23, 59, 59))
+        self.assertEqual(parse_deadline("2024-09-06T12:00"), datetime(2024, 9, 6, 12, 0))
+        self.assertIsNone(parse_deadline("ASAP"))
+
+    def test_open_only_and_closing_before(self):
+        self.add_job("Expired", "2000-01-01")
+        self.add_job("Open", "2999-01-01")
+        self.add_job("Unknown", "rolling")
+
+        _, titles = self.search(openOnly=True)
+        self.assertEqual(sorted(titles), ["Open", "Unknown"])
+        _, titles = self.search(closingBefore="2500-01-01")
+        self.assertEqual(titles, ["Expired"])
+        response, _ = self.search(closingBefore="someday")
+        self.assertEqual(response.status_code, 400)
+
+    def test_archive_moves_only_unreferenced_expired_jobs(self):
+        expired_id = self.add_job("Expired", "2000-01-01").id
+        with_applicants = self.add_job("Expired with applicants", "2000-01-01")
+        self.add_job("Open", "2999-01-01")
+        db.session.add(Application(student_id=1, job_id=with_applicants.id, email_address="s@example.com",
+                                   year_of_graduation=2026, candidate_statement="Hi"))
+        db.session.commit()
+
+        self.assertEqual(archive_expired_jobs(), [expired_id])
+        self.assertEqual(JobArchive.query.one().title, "Expired")
+        self.assertEqual(sorted(job.title for job in Job.query), ["Expired with applicants", "Open"])
+
+    def test_archived_jobs_are_logged_like_deletes(self):
+        expired_id = self.add_job("Expired", "2000-01-01").id
+        db.session.delete(self.add_job("Open", "2999-01-01"))
+        db.session.commit()
+        archive_expired_jobs()
+
+        deleted = ChangeLog.query.filter_by(table_name="job", operation="delete").order_by(ChangeLog.id).all()
+        self.assertEqual(len(deleted), 2)
+        self.assertEqual(deleted[1].row_id, expired_id)
+        self.assertEqual(deleted[1].changes["title"], "Expired")
+        self.assertEqual(deleted[1].changes.keys(), deleted[0].changes.keys())
+
+    def test_roll_term_moves_applications_to_archive(self):
+        student = User(username="stu", password=generate_password_hash("pw"), first_name="S",
+                       last_name="Student", email="stu@example.com", role="Student")
+        db.session.add(student)
+        db.session.commit()
+        for term in ("Fall 2025", "Spring 2026"):
+            job_id = self.add_job(f"Desk {term}", "2000-01-01").id
+            db.session.add(Application(student_id=student.id, job_id=job_id, email_address="stu@example.com",
+                                       year_of_graduation=2026, candidate_statement=term, term=term))
+        db.session.commit()
+
+        self.assertEqual(roll_term("Fall 2025"), 1)
+        self.assertEqual(ApplicationArchive.query.one().candidate_statement, "Fall 2025")
+        self.assertEqual([application.term for application in Application.query], ["Spring 2026"])
+
+        self.client.post("auth/login", json={"email": "stu@example.com", "password": "pw"})
+        self.app.config["CURRENT_TERM"] = "Spring 2026"
+        current = self.client.get("/user-applications").get_json()
+        self.assertEqual([application["term"] for application in current], ["Spring 2026"])
+        past = self.client.get("/user-applications?term=Fall 2025").get_json()
+        self.assertEqual([application["term"] for application in past], ["Fall 2025"])
+        self.assertEqual(len(self.client.get("/user-applications?term=all").get_json()), 2)
+
+    def test_unrolled_past_terms_are_read_on_request_only(self):
+        self.app.config["CURRENT_TERM"] = "Fall 2026"
+        for term in ("Spring 2026", "Fall 2026"):
+            job_id = self.add_job(f"Desk {term}", "2030-01-01").id
+            db.session.add(Application(student_id=1, job_id=job_id, email_address="s@example.com",
+                                       year_of_graduation=2026, candidate_statement=term, term=term))
+        db.session.commit()
+
+        current = self.client.get("/user-applications").get_json()
+        self.assertEqual([application["term"] for application in current], ["Fall 2026"])
+        past = self.client.get("/user-applications?term=Spring 2026").get_json()
+        self.assertEqual([application["term"] for application in past], ["Spring 2026"])
+        self.assertEqual(len(self.client.get("/user-applications?term=all").get_json()), 2)
+
+    def test_new_applications_get_the_current_term(self):
+        application = Application(student_id=1, job_id=1, email_address="s@example.com",
+                                  year_of_graduation=2026, candidate_statement="Hi")
+        db.session.add(application)
+        db.session.commit()
+        self.assertEqual(application.term, term_for(datetime.now()))
@@ -0,0 +1,54 @@
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from backend.matching import MatchingEngine, student_features
+
+
+def make_job(job_id, title, type_of_work="Research", hiring_semesters="Fall 2026"):
+    return SimpleNamespace(
+        id=job_id, title=title, department="Office", prerequisites="", brief_description=title,
+        more_details="", type_of_work=type_of_work, hiring_semesters=hiring_semesters,
+    )
+
+
+class MatchingEngineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.engine = MatchingEngine()
+        self.engine.load([
+            make_job(1, "Graphic design assistant", "Creative"),
+            make_job(2, "Python data analyst", "Technical"),
+            make_job(3, "Library desk", "Administrative"),
+        ])
+
+    def test_rank_orders_by_similarity(self):
+        features = student_features("Junior", "python pandas data visualisation")
+        self.assertEqual(self.engine.rank([1, 2, 3], features), [2, 1, 3])
+
+    def test_incremental_updates(self):
+        features = student_features("Junior", "figma illustration")
+        self.engine.upsert(make_job(3, "Figma illustration intern", "Creative"))
+        self.assertEqual(self.engine.rank([1, 2, 3], features)[0], 3)
+
+        self.engine.remove(3)
+        self.assertNotIn(3, self.engine.score(features))
+
+    def test_sync_refreshes_changed_jobs_only(self):
+        jobs = {job_id: make_job(job_id, f"Library desk {job_id}") for job_id in range(1, 31)}
+        engine = MatchingEngine()
+        engine.sync(jobs)
+        features = student_features("Junior", "figma illustration")
+        self.assertEqual(engine.score(features), {})
+
+        jobs = dict(jobs)
+        jobs[3] = make_job(3, "Figma illustration intern")
+        del jobs[1]
+        with mock.patch.object(engine, "upsert", wraps=engine.upsert) as upsert:
+            engine.sync(jobs)
+        upsert.assert_called_once_with(jobs[3])
+        self.assertEqual(list(engine.score(features)), [3])
+        self.assertNotIn(1, engine.score(student_features("Junior", "library desk")))
+
+    def test_graduation_year_excludes_later_jobs(self):
+        self.engine.upsert(make_job(4, "Python developer", "Technical", "Fall 2030"))
+        features = student_features("Senior", "python developer")
+        self.assertNotIn(4, self.engine.score(features, graduation_year=2027))
@@ -0,0 +1,96 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from sqlalchemy import event
+from backend import create_app, db
+from backend.models import Team
+from backend.observability import FileSpanExporter, JsonFormatter, Tracer
+
+
+class ObservabilityTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        db.session.add(Team(name="Library", manager="M", email="m@example.com", max_students=2, priority="High"))
+        db.session.commit()
+
+        self.statements = []
+
+        @event.listens_for(db.engine, "after_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            self.statements.append(statement)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def trace_to_file(self, sample_rate=1.0):
+        handle, path = tempfile.mkstemp(suffix=".jsonl")
+        os.close(handle)
+        self.addCleanup(os.remove, path)
+        exporter = FileSpanExporter(path)
+        self.app.extensions["tracer"] = Tracer(exporter, sample_rate)
+        return exporter, path
+
+    def read_spans(self, exporter, path):
+        exporter.flush()
+        with open(path) as spans:
+            return [
+                span
+                for line in spans
+                for resource in json.loads(line)["resourceSpans"]
+                for scope in resource["scopeSpans"]
+                for span in scope["spans"]
+            ]
+
+    def test_request_ids_are_echoed_and_tag_sql(self):
+        response = self.client.get("/teams", headers={"X-Request-ID": "req-123"})
+        self.assertEqual(response.headers["X-Request-ID"], "req-123")
+        self.assertTrue(any("request_id='req-123'" in statement for statement in self.statements))
+
+        # Anything that could break out of the SQL comment is replaced
+        response = self.client.get("/teams", headers={"X-Request-ID": "*/ DROP TABLE team"})
+        self.assertRegex(response.headers["X-Request-ID"], r"^[0-9a-f]{16}$")
+
+    def test_sampled_request_exports_nested_spans(self):
+        exporter, path = self.trace_to_file()
+        response = self.client.get("/teams")
+        spans = self.read_spans(exporter, path)
+
+        by_name = {span["name"]: span for span in spans}
+        root = by_name["GET /teams"]
+        handler = by_name["handler main.manage_teams"]
+        self.assertEqual(handler["parentSpanId"], root["spanId"])
+        self.assertEqual(by_name["db.query"]["parentSpanId"], handler["spanId"])
+        self.assertEqual(by_name["serialize"]["parentSpanId"], handler["spanId"])
+        self.assertEqual({span["traceId"] for span in spans}, {root["traceId"]})
+        self.assertIn(root["traceId"], response.headers["traceparent"])
+
+    def test_incoming_sampling_decision_is_followed(self):
+        exporter, path = self.trace_to_file(sample_rate=1.0)
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        self.client.get("/teams", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-00"})
+        self.assertEqual(self.read_spans(exporter, path), [])
+        self.assertTrue(any(trace_id in statement for statement in self.statements))
+
+        self.client.get("/teams", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"})
+        root = next(span for span in self.read_spans(exporter, path) if span["name"] == "GET /teams")
+        self.assertEqual((root["traceId"], root["parentSpanId"]), (trace_id, "00f067aa0ba902b7"))
+
+    def test_json_log_format(self):
+        record = logging.makeLogRecord({"name": "backend.main", "levelname": "INFO", "msg": "Created %s",
+                                        "args": (7,), "position_id": 7, "request_id": "req-1"})
+        entry = json.loads(JsonFormatter().format(record))
+        self.assertEqual(entry["message"], "Created 7")
+        self.assertEqual((entry["position_id"], entry["request_id"]), (7, "req-1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
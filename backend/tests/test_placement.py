@@ -0,0 +1,94 @@
+import unittest
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.events import get_broker, user_channel
+from backend.models import Application, Job, Team, User
+from backend.placement import solve
+
+
+class SolveTestCase(unittest.TestCase):
+    def test_respects_capacities_and_preferences(self):
+        # Two students both prefer job 1, which has a single slot
+        applications = [(1, 1, 1, 0), (2, 1, 2, 1), (3, 2, 1, 0), (4, 2, 2, 1)]
+        jobs = {1: (None, 1, 0), 2: (None, 1, 0)}
+        result = solve(applications, jobs, {})
+        placed = {job_id for _, _, job_id, _ in result["assignments"]}
+        self.assertEqual(len(result["assignments"]), 2)
+        self.assertEqual(placed, {1, 2})
+
+    def test_team_capacity_limits_its_jobs(self):
+        applications = [(1, 1, 1, 0), (2, 2, 2, 0), (3, 3, 3, 0)]
+        jobs = {1: (7, 5, 0), 2: (7, 5, 0), 3: (None, 5, 0)}
+        result = solve(applications, jobs, {7: (1, 1.0)})
+        team_jobs = [job_id for _, _, job_id, _ in result["assignments"] if job_id in (1, 2)]
+        self.assertEqual(len(team_jobs), 1)
+        self.assertEqual(len(result["assignments"]), 2)
+
+
+class PlacementEndpointsTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        admin = User(username="admin", password=generate_password_hash("pw"), first_name="A",
+                     last_name="Admin", email="admin@example.com", role="admin")
+        students = [
+            User(username=f"s{i}", password="x", first_name="S", last_name=str(i),
+                 email=f"s{i}@example.com", role="Student")
+            for i in range(3)
+        ]
+        db.session.add_all([admin, *students])
+        db.session.add(Team(name="Library", manager="M", email="m@example.com", max_students=5, priority="High"))
+        db.session.commit()
+        job = Job(employer_id=admin.id, title="Desk", department="Library", manager_name="M",
+                  manager_email="m@example.com", hiring_semesters="Fall", min_students=1, max_students=2,
+                  role_location="SF", type_of_work="Admin", brief_description="Desk",
+                  application_deadline="2030-01-01")
+        db.session.add(job)
+        db.session.commit()
+        self.student_ids = [student.id for student in students]
+        db.session.add_all([
+            Application(student_id=student.id, job_id=job.id, email_address=student.email,
+                        year_of_graduation=2026, candidate_statement="Hi")
+            for student in students
+        ])
+        db.session.commit()
+
+        self.client.post("auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_dry_run_does_not_write(self):
+        response = self.client.post("/placements/dry-run")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["assignments"]), 2)
+        self.assertEqual(response.get_json()["unplaced_students"], 1)
+        self.assertEqual(Application.query.filter_by(status="accepted").count(), 0)
+
+    def test_commit_accepts_in_bulk(self):
+        response = self.client.post("/placements/commit", json={})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["accepted"], 2)
+        self.assertEqual(Application.query.filter_by(status="accepted").count(), 2)
+
+        # Capacity is used up, so a second run places nobody
+        response = self.client.post("/placements/dry-run")
+        self.assertEqual(response.get_json()["assignments"], [])
+
+    def test_commit_notifies_placed_students(self):
+        subscriptions = [get_broker().subscribe([user_channel(student_id)]) for student_id in self.student_ids]
+        response = self.client.post("/placements/commit", json={}).get_json()
+
+        placed = {assignment["student_id"] for assignment in response["assignments"]}
+        for student_id, subscription in zip(self.student_ids, subscriptions):
+            event = subscription.get(0)
+            if student_id in placed:
+                self.assertEqual((event["type"], event["data"]["status"]), ("application.updated", "accepted"))
+            else:
+                self.assertIsNone(event)
@@ -0,0 +1,111 @@
+import unittest
+from flask import g
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.models import Application, Job, User
+from backend.rbac import permissions_for
+
+
+class AccessControlTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        # Requests share the test's app context, so drop the user Flask-Login caches on g
+        @self.app.teardown_request
+        def forget_user(exception):
+            g.pop("_login_user", None)
+
+        self.users = {}
+        for name, role in [("admin", "admin"), ("alice", "Employer"), ("bob", "manager"),
+                           ("sam", "Student"), ("tess", "student")]:
+            self.users[name] = User(username=name, password=generate_password_hash("pw"), first_name=name,
+                                    last_name="Test", email=f"{name}@example.com", role=role)
+        db.session.add_all(self.users.values())
+        db.session.commit()
+
+        self.job = Job(employer_id=self.users["alice"].id, title="Desk", department="Library", manager_name="A",
+                       manager_email="alice@example.com", hiring_semesters="Fall", min_students=1, max_students=2,
+                       role_location="SF", type_of_work="Admin", brief_description="Desk",
+                       application_deadline="2030-01-01")
+        db.session.add(self.job)
+        db.session.commit()
+        self.application = Application(student_id=self.users["sam"].id, job_id=self.job.id,
+                                       email_address="sam@example.com", year_of_graduation=2027,
+                                       candidate_statement="Hi")
+        db.session.add(self.application)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def login(self, name):
+        self.client.post("auth/login", json={"email": f"{name}@example.com", "password": "pw"})
+
+    def test_role_aliases_share_permissions(self):
+        self.assertEqual(permissions_for("Employer"), permissions_for("manager"))
+        self.assertEqual(permissions_for("Student"), permissions_for("student"))
+        self.assertEqual(permissions_for("visitor"), frozenset())
+
+    def test_anonymous_requests_are_rejected(self):
+        response = self.client.post("/job-search", json={"department": "", "keyword": "", "location": ""})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(self.client.get("/teams").status_code, 200)
+
+    def test_employers_only_edit_their_own_jobs(self):
+        self.login("bob")
+        self.assertEqual(self.client.get(f"/jobs/{self.job.id}").status_code, 200)
+        self.assertEqual(self.client.put(f"/jobs/{self.job.id}", json={"positionTitle": "Mine"}).status_code, 404)
+        self.assertEqual(self.client.delete(f"/jobs/{self.job.id}").status_code, 404)
+
+        self.login("alice")
+        response = self.client.put(f"/jobs/{self.job.id}", json={"positionTitle": "Front desk"})
+        self.assertEqual(response.get_json()["title"], "Front desk")
+
+    def test_students_only_see_their_own_applications(self):
+        self.assertEqual(self.client.delete(f"/withdraw/{self.application.id}").status_code, 401)
+        self.login("tess")
+        self.assertEqual(self.client.delete(f"/withdraw/{self.application.id}").status_code, 404)
+        self.assertEqual(self.client.get(f"/applications/{self.application.id}").status_code, 404)
+        self.assertEqual(self.client.delete(f"/user-applications/{self.application.id}").status_code, 404)
+        self.assertEqual(self.client.put(f"/applications/{self.application.id}", json={"status": "accepted"}).status_code, 403)
+
+        self.login("sam")
+        self.assertEqual(self.client.get(f"/applications/{self.application.id}").status_code, 200)
+
+    def test_admin_only_endpoints(self):
+        self.login("sam")
+        self.assertEqual(self.client.get("/ws-position-tracker").status_code, 403)
+        self.assertEqual(self.client.get("/admin/jobs").status_code, 403)
+
+        self.login("admin")
+        self.assertEqual(self.client.get("/ws-position-tracker").status_code, 200)
+        self.assertEqual(self.client.put(f"/jobs/{self.job.id}", json={"positionTitle": "Audited"}).status_code, 200)
+
+    def test_only_admins_appoint_admins(self):
+        response = self.client.post("/auth/register", json={"email": "eve@example.com", "firstName": "Eve",
+                                                            "lastName": "Test", "password": "pw", "userType": "admin"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIsNone(User.query.filter_by(email="eve@example.com").first())
+
+        promotion = {"role": "admin"}
+        self.login("alice")
+        self.assertEqual(self.client.put(f"/auth/users/{self.users['alice'].id}/role", json=promotion).status_code, 403)
+        self.assertEqual(self.client.get("/auth/all-users").status_code, 403)
+
+        self.login("admin")
+        response = self.client.put(f"/auth/users/{self.users['alice'].id}/role", json=promotion)
+        self.assertEqual(response.get_json()["role"], "admin")
+        self.assertEqual(self.client.put("/auth/users/999/role", json=promotion).status_code, 404)
+
+        self.login("alice")
+        self.assertEqual(self.client.get("/auth/all-users").status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.models import Application, ChangeLog, Job, Tenant, User, WSTracker
+from backend.reconcile import AMBIGUOUS, MERGED, UNMATCHED, UNPLACED, StudentIndex, name_key
+
+
+class StudentIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        students = [
+            (1, "ana@uni.edu", "Ana María", "García"),
+            (2, "bo@uni.edu", "Bo", "Chen"),
+            (3, "kai@uni.edu", "Kai", "Smith"),
+            (4, "kai.s@uni.edu", "Kai", "Smith"),
+            (5, "jonathan@uni.edu", "Jonathan", "Okafor"),
+        ]
+        applications = [(10, 2, "bo.personal@gmail.com", "accepted"), (11, 1, "ana@uni.edu", "pending")]
+        self.index = StudentIndex(students, applications)
+
+    def test_name_key(self):
+        self.assertEqual(name_key("García, Ana-María"), "ana garcia maria")
+        self.assertEqual(name_key("  ANA maria garcia "), "ana garcia maria")
+
+    def test_rules(self):
+        match = self.index.match(" ANA@uni.edu", "", "Someone Else")
+        self.assertEqual((match["status"], match["user_id"], match["method"]), (UNPLACED, 1, "email"))
+
+        # Application contact emails count too
+        match = self.index.match("bo.personal@gmail.com", "", "")
+        self.assertEqual((match["status"], match["user_id"], match["application_ids"]), (MERGED, 2, [10]))
+
+        self.assertEqual(self.index.match("", "2", "Bo Chen")["method"], "id")
+        # An ID alone isn't trusted when the names disagree
+        self.assertEqual(self.index.match("", "2", "Jonathan Okafor")["user_id"], 5)
+
+        self.assertEqual(self.index.match("", "S-1", "Garcia, Ana Maria")["method"], "name")
+        match = self.index.match("", "", "Jonathon Okafor")
+        self.assertEqual((match["user_id"], match["method"]), (5, "fuzzy"))
+
+        self.assertEqual(self.index.match("", "", "Kai Smith")["status"], AMBIGUOUS)
+        self.assertEqual(self.index.match("nobody@uni.edu", "99", "Zed Quill")["status"], UNMATCHED)
+
+
+class ReconcileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        admin = User(username="admin", password=generate_password_hash("pw"), first_name="Ad", last_name="Min",
+                     email="admin@example.com", role="admin")
+        ana = User(username="ana", password="x", first_name="Ana", last_name="Garcia", email="ana@uni.edu",
+                   role="Student")
+        bo = User(username="bo", password="x", first_name="Bo", last_name="Chen", email="bo@uni.edu", role="student")
+        other = Tenant(slug="other", name="Other")
+        db.session.add_all([admin, ana, bo, other])
+        db.session.flush()
+        job = Job(employer_id=admin.id, title="Desk", department="Library", manager_name="M",
+                  manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1, max_students=2,
+                  role_location="SF", type_of_work="Admin", brief_description="Work", application_deadline="2030-01-01")
+        db.session.add(job)
+        db.session.flush()
+        db.session.add(Application(student_id=ana.id, job_id=job.id, status="accepted", email_address="ana@uni.edu",
+                                   year_of_graduation=2027, candidate_statement="Hi"))
+        self.rows = [
+            WSTracker(student_id="A1", minerva_email="ana@uni.edu", full_name="Ana Garcia", expected_grad_year=2027),
+            WSTracker(student_id="B2", minerva_email="", full_name="Chen, Bo", expected_grad_year=2027,
+                      merge_status="Merge status"),
+            WSTracker(student_id="C3", minerva_email="cy@uni.edu", full_name="Cy Young", expected_grad_year=2027,
+                      merge_status=UNMATCHED),
+        ]
+        db.session.add_all(self.rows)
+        self.elsewhere = WSTracker(student_id="A1", minerva_email="ana@uni.edu", full_name="Ana Garcia",
+                                   expected_grad_year=2027, tenant_id=other.id)
+        db.session.add(self.elsewhere)
+        db.session.commit()
+        self.client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def statuses(self):
+        db.session.expire_all()
+        return [row.merge_status for row in self.rows]
+
+    def test_dry_run_writes_nothing(self):
+        body = self.client.post("/ws-position-tracker/reconcile/dry-run").get_json()
+        self.assertEqual(body["rows"], 3)
+        self.assertEqual(body["statuses"], {MERGED: 1, UNPLACED: 1, UNMATCHED: 1})
+        self.assertEqual({change["id"]: change["status"] for change in body["changes"]},
+                         {self.rows[0].id: MERGED, self.rows[1].id: UNPLACED})
+        self.assertEqual(self.statuses(), [None, "Merge status", UNMATCHED])
+
+    def test_statuses_are_written_with_change_log(self):
+        body = self.client.post("/ws-position-tracker/reconcile").get_json()
+        self.assertEqual(len(body["changes"]), 2)
+        self.assertEqual(self.statuses(), [MERGED, UNPLACED, UNMATCHED])
+        self.assertIsNone(db.session.get(WSTracker, self.elsewhere.id).merge_status)
+
+        log = ChangeLog.query.filter_by(table_name="ws_tracker", operation="update").order_by(ChangeLog.row_id).all()
+        self.assertEqual([(entry.row_id, entry.changes) for entry in log], [
+            (self.rows[0].id, {"merge_status": [None, MERGED]}),
+            (self.rows[1].id, {"merge_status": ["Merge status", UNPLACED]}),
+        ])
+        self.assertTrue(all(entry.user_id is not None for entry in log))
+
+        # Nothing left to change
+        self.assertEqual(self.client.post("/ws-position-tracker/reconcile").get_json()["changes"], [])
+
+    def test_cli_reconciles_every_tenant(self):
+        result = self.app.test_cli_runner().invoke(args=["reconcile-tracker"])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("2 change(s)", result.output)
+        self.assertEqual(self.statuses(), [MERGED, UNPLACED, UNMATCHED])
+        # No students in the other tenant
+        self.assertEqual(db.session.get(WSTracker, self.elsewhere.id).merge_status, UNMATCHED)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import io
+import threading
+import unittest
+import zipfile
+from unittest import mock
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.audit import record_updates
+from backend.capacity import delete_application
+from backend.models import Application, Job, User
+from backend.resume_index import ResumeIndex, extract_text
+from backend.tenancy import DEFAULT_TENANT_ID
+
+
+class ResumeIndexTestCase(unittest.TestCase):
+    def test_extract_text_from_docx(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("word/document.xml", "<w:p><w:t>Python developer</w:t></w:p>")
+        self.assertIn("Python developer", extract_text(buffer.getvalue()))
+
+    def test_search_ranks_and_scopes_by_job(self):
+        index = ResumeIndex(workers=0)
+        index.load([
+            (1, 10, b"Python and SQL. Python every day."),
+            (2, 10, "Graphic design, Figma"),
+            (3, 20, "Python"),
+        ])
+        hits = index.search("python", {10})
+        self.assertEqual([application_id for application_id, _ in hits], [1])
+
+        index.remove(1)
+        self.assertEqual(index.search("python", {10}), [])
+
+    def test_loaded_only_once_everything_is_indexed(self):
+        index = ResumeIndex(workers=2)
+        extracted = threading.Event()
+        with mock.patch("backend.resume_index.extract_text", side_effect=lambda source: extracted.wait(5) and source):
+            loader = threading.Thread(target=index.load, args=([(1, 10, "Python")],))
+            loader.start()
+            self.assertFalse(index.loaded)
+            extracted.set()
+            loader.join()
+        self.assertTrue(index.loaded)
+        self.assertEqual(index.search("python", {10})[0][0], 1)
+
+
+class ApplicationSearchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        employer = User(username="boss", password=generate_password_hash("pw"), first_name="Ada",
+                        last_name="Boss", email="boss@example.com", role="Employer")
+        student = User(username="stu", password="x", first_name="Sam", last_name="Student",
+                       email="stu@example.com", role="Student", resume="Data analysis with pandas")
+        db.session.add_all([employer, student])
+        db.session.commit()
+        job = Job(employer_id=employer.id, title="Analyst", department="Ops", manager_name="Ada",
+                  manager_email="boss@example.com", hiring_semesters="Fall", min_students=1,
+                  max_students=2, role_location="Remote", type_of_work="Research",
+                  brief_description="Crunch numbers", application_deadline="2030-01-01")
+        db.session.add(job)
+        db.session.commit()
+        self.student = student
+        self.application = Application(student_id=student.id, job_id=job.id, email_address="stu@example.com",
+                                       year_of_graduation=2026, candidate_statement="I love statistics")
+        db.session.add(self.application)
+        db.session.commit()
+
+        self.client.post("auth/login", json={"email": "boss@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_search_applicants(self):
+        response = self.client.get("/applications/search?q=pandas")
+        self.assertEqual(response.status_code, 200)
+        results = response.get_json()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["student_name"], "Sam Student")
+
+        response = self.client.get("/applications/search?q=welding")
+        self.assertEqual(response.get_json(), [])
+
+    def search(self, keywords):
+        return [result["application"]["id"] for result in self.client.get(f"/applications/search?q={keywords}").get_json()]
+
+    def test_writes_by_other_processes_are_followed(self):
+        self.assertEqual(self.search("pandas"), [self.application.id])
+
+        # As by another worker: the resume edit and its log entry, no in-process hooks
+        db.session.execute(db.update(User).where(User.id == self.student.id).values(resume="Certified welder"))
+        record_updates("user", [(self.student.id, DEFAULT_TENANT_ID, {"resume": [None, None]})])
+        db.session.commit()
+        self.assertEqual(self.search("pandas"), [])
+        self.assertEqual(self.search("welder"), [self.application.id])
+
+        delete_application(self.application)
+        db.session.commit()
+        self.assertEqual(self.search("welder"), [])
+
+    def test_search_waits_for_the_index(self):
+        with mock.patch.object(ResumeIndex, "_build"):
+            response = self.client.get("/applications/search?q=pandas")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.search("pandas"), [self.application.id])
@@ -0,0 +1,56 @@
+import unittest
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend import schemas
+from backend.models import Team, User
+
+
+class SchemaTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        db.session.add(User(username="admin", password=generate_password_hash("pw"), first_name="A",
+                            last_name="Admin", email="admin@example.com", role="admin"))
+        db.session.commit()
+        self.client.post("auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_coercion_and_defaults(self):
+        data, errors = schemas.TEAM({"name": "Library", "manager": "M", "email": "m@example.com",
+                                     "maxStudents": "3", "priority": "High", "extra": "dropped"})
+        self.assertEqual(errors, {})
+        self.assertEqual(data, {"name": "Library", "manager": "M", "email": "m@example.com",
+                                "maxStudents": 3, "priority": "High"})
+
+    def test_errors_are_reported_by_field(self):
+        _, errors = schemas.APPLICATION({"jobId": "x", "emailAddress": "nobody",
+                                         "candidateStatement": "a" * (schemas.STATEMENT_MAX + 1)})
+        self.assertEqual(set(errors), {"jobId", "emailAddress", "yearOfGraduation", "candidateStatement"})
+        self.assertEqual(errors["yearOfGraduation"], "is required")
+        self.assertEqual(schemas.TEAM(["not", "an", "object"])[1], {"": "must be a JSON object"})
+
+    def test_partial_schema_only_checks_given_fields(self):
+        self.assertEqual(schemas.TEAM.partial()({"priority": "Low"}), ({"priority": "Low"}, {}))
+        self.assertIn("maxStudents", schemas.TEAM.partial()({"maxStudents": True})[1])
+
+    def test_invalid_bodies_are_rejected_before_writing(self):
+        response = self.client.post("/teams", json={"name": "Library", "maxStudents": "many"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.get_json()["errors"]), {"manager", "email", "maxStudents", "priority"})
+        self.assertEqual(Team.query.count(), 0)
+
+        response = self.client.post("/ws-position-tracker", json={"student_id": "S1"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("minerva_email", response.get_json()["errors"])
+
+
+if __name__ == '__main__':
+    unittest.main()
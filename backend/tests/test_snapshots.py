@@ -0,0 +1,170 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from datetime import timedelta
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.lifecycle import archive_expired_jobs, now
+from backend.models import Job, User
+from backend.sqlite import writer_engine
+
+
+class SnapshotTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.directory = tempfile.mkdtemp()
+        self.app.config["SNAPSHOT_DIR"] = self.directory
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        admin = User(username="admin", password=generate_password_hash("pw"), first_name="Ad", last_name="Min",
+                     email="admin@example.com", role="admin")
+        db.session.add(admin)
+        db.session.flush()
+        db.session.add_all([
+            self.job("Desk", "Library", "SF", "2030-01-01", admin.id),
+            self.job("Shelving", "Library", "Berlin", "2020-01-01", admin.id),
+            self.job("Tutor", "Academics", "SF", "2030-06-01", admin.id),
+        ])
+        db.session.commit()
+        self.client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+        self.statements = []
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            self.statements.append(statement)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        shutil.rmtree(self.directory)
+
+    def job(self, title, department, location, deadline, employer_id):
+        return Job(employer_id=employer_id, title=title, department=department, manager_name="M",
+                   manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1, max_students=2,
+                   role_location=location, type_of_work="Admin", brief_description="Work",
+                   application_deadline=deadline)
+
+    def titles(self, response):
+        return [job["title"] for job in response.get_json()]
+
+    def job_queries(self):
+        return [statement for statement in self.statements if "FROM job" in statement]
+
+    def test_listings_are_served_without_querying_jobs(self):
+        self.client.get("/jobs")  # Builds the snapshot
+        self.statements.clear()
+
+        self.assertEqual(self.titles(self.client.get("/jobs")), ["Desk", "Shelving", "Tutor"])
+        self.assertEqual(self.titles(self.client.get("/jobs?open_only=true")), ["Desk", "Tutor"])
+        self.assertEqual(self.titles(self.client.get("/jobs?department=Library&open_only=1")), ["Desk"])
+        search = self.client.post("/job-search", json={"department": "", "keyword": "", "location": "SF"})
+        self.assertEqual(self.titles(search), ["Desk", "Tutor"])
+        self.assertEqual(self.client.get("/jobs?department=Nowhere").get_json(), [])
+        self.assertEqual(self.job_queries(), [])
+
+        # Keyword searches still go to the database
+        self.assertEqual(self.titles(self.client.get("/jobs?keyword=tut")), ["Tutor"])
+        self.assertNotEqual(self.job_queries(), [])
+
+    def test_files_are_content_hashed_and_cached_forever(self):
+        manifest = self.client.get("/snapshots/manifest.json")
+        self.assertEqual(manifest.status_code, 200)
+        self.assertTrue(manifest.cache_control.no_cache)
+        self.assertEqual(self.client.get("/snapshots/manifest.json",
+                                         headers={"If-None-Match": manifest.get_json()["version"]}).status_code, 304)
+
+        filename = manifest.get_json()["jobs"]["open"]
+        response = self.client.get(f"/snapshots/{filename}")
+        self.assertEqual(self.titles(response), ["Desk", "Tutor"])
+        self.assertEqual(response.cache_control.max_age, 365 * 24 * 3600)
+        self.assertTrue(response.cache_control.immutable)
+        self.assertEqual(self.client.get("/jobs?open_only=true").headers["Content-Location"], f"/snapshots/{filename}")
+
+        detail = manifest.get_json()["details"][str(Job.query.filter_by(title="Tutor").one().id)]
+        self.assertEqual(self.client.get(f"/snapshots/{detail}").get_json()["title"], "Tutor")
+
+    def test_job_writes_rebuild_the_snapshot(self):
+        before = self.client.get("/snapshots/manifest.json").get_json()
+        tutor = Job.query.filter_by(title="Tutor").one()
+
+        self.client.put(f"/jobs/{tutor.id}", json={"positionTitle": "Math Tutor"})
+        after = self.client.get("/snapshots/manifest.json").get_json()
+        self.assertIn("Math Tutor", self.titles(self.client.get("/jobs")))
+        # Only the files containing the edited job changed
+        self.assertEqual(after["departments"]["Library"], before["departments"]["Library"])
+        self.assertNotEqual(after["details"][str(tutor.id)], before["details"][str(tutor.id)])
+        # The previous manifest's files are kept for clients still reading them
+        self.assertTrue(os.path.exists(os.path.join(self.directory, "1", before["details"][str(tutor.id)])))
+
+        archive_expired_jobs()
+        self.assertEqual(self.titles(self.client.get("/jobs")), ["Desk", "Math Tutor"])
+
+    def test_open_listings_expire_with_the_earliest_deadline(self):
+        desk = Job.query.filter_by(title="Desk").one()
+        # Closes shortly, without a job write marking the snapshot stale
+        db.session.execute(Job.__table__.update().where(Job.id == desk.id)
+                           .values(deadline_at=now() + timedelta(milliseconds=50)))
+        db.session.commit()
+        self.assertIn("Desk", self.titles(self.client.get("/jobs?open_only=true")))
+
+        time.sleep(0.1)
+        self.assertNotIn("Desk", self.titles(self.client.get("/jobs?open_only=true")))
+
+
+class SharedSnapshotTestCase(unittest.TestCase):
+    """Two workers serving the same database and snapshot directory."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        settings = {"SQLALCHEMY_DATABASE_URI": f"sqlite:///{os.path.join(self.directory, 'test.db')}"}
+        self.apps = [create_app('testing', **settings) for _ in range(2)]
+        for app in self.apps:
+            app.config["SNAPSHOT_DIR"] = os.path.join(self.directory, "snapshots")
+        self.app_context = self.apps[0].app_context()
+        self.app_context.push()
+        db.create_all()
+
+        admin = User(username="admin", password=generate_password_hash("pw"), first_name="Ad", last_name="Min",
+                     email="admin@example.com", role="admin")
+        db.session.add(admin)
+        db.session.flush()
+        self.desk = Job(employer_id=admin.id, title="Desk", department="Library", manager_name="M",
+                        manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1, max_students=2,
+                        role_location="SF", type_of_work="Admin", brief_description="Work",
+                        application_deadline="2030-01-01")
+        db.session.add(self.desk)
+        db.session.commit()
+        self.clients = [app.test_client() for app in self.apps]
+        for client in self.clients:
+            client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        for app in self.apps:
+            with app.app_context():
+                for engine in (db.engine, writer_engine()):
+                    engine.dispose()
+        self.app_context.pop()
+        shutil.rmtree(self.directory)
+
+    def test_writes_in_one_worker_refresh_the_others(self):
+        first, second = self.clients
+        for client in self.clients:
+            self.assertEqual([job["title"] for job in client.get("/jobs").get_json()], ["Desk"])
+
+        self.assertEqual(first.put(f"/jobs/{self.desk.id}", json={"positionTitle": "Renamed"}).status_code, 200)
+        self.assertEqual([job["title"] for job in second.get("/jobs").get_json()], ["Renamed"])
+        self.assertEqual(second.get(f"/jobs/{self.desk.id}").get_json()["title"], "Renamed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.models import Application, Job, User
+from backend.sqlite import writer_engine
+
+
+class SQLiteModeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.app = create_app('testing', SQLALCHEMY_DATABASE_URI=f"sqlite:///{os.path.join(self.directory, 'test.db')}")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+        self.students = [
+            User(username=f"student{i}", password=generate_password_hash("pw", method="pbkdf2:sha256:1"),
+                 first_name="S", last_name=str(i), email=f"student{i}@example.com", role="Student")
+            for i in range(4)
+        ]
+        db.session.add_all(self.students)
+        db.session.flush()
+        self.jobs = [
+            Job(employer_id=self.students[0].id, title=f"Job {i}", department="Library", manager_name="M",
+                manager_email="m@example.com", hiring_semesters="Fall 2026", min_students=1, max_students=3,
+                role_location="SF", type_of_work="Admin", brief_description="Desk", application_deadline="2030-01-01")
+            for i in range(10)
+        ]
+        db.session.add_all(self.jobs)
+        db.session.commit()
+        self.job_ids = [job.id for job in self.jobs]
+        self.emails = [student.email for student in self.students]
+
+        self.statements = {"reader": [], "writer": []}
+        event.listen(db.engine, "before_cursor_execute", self.capture("reader"))
+        event.listen(writer_engine(), "before_cursor_execute", self.capture("writer"))
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        for engine in (db.engine, writer_engine()):
+            engine.dispose()
+        self.app_context.pop()
+        shutil.rmtree(self.directory)
+
+    def capture(self, key):
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            self.statements[key].append(statement.split()[0].upper())
+        return capture
+
+    def client_for(self, email):
+        client = self.app.test_client()
+        client.post("/auth/login", json={"email": email, "password": "pw"})
+        return client
+
+    def apply(self, client, job_id):
+        return client.post("/apply", data={"jobId": job_id, "emailAddress": "s@example.com",
+                                           "yearOfGraduation": 2027, "candidateStatement": "Hi"})
+
+    def test_connections_use_wal_and_busy_timeout(self):
+        for engine in (db.engine, writer_engine()):
+            with engine.connect() as connection:
+                self.assertEqual(connection.exec_driver_sql("PRAGMA journal_mode").scalar(), "wal")
+                self.assertEqual(connection.exec_driver_sql("PRAGMA busy_timeout").scalar(), 5000)
+                self.assertEqual(connection.exec_driver_sql("PRAGMA synchronous").scalar(), 1)  # NORMAL
+        self.assertEqual(writer_engine().pool.size(), 1)
+
+    def test_writes_go_through_the_writer(self):
+        client = self.client_for(self.emails[0])
+        for statements in self.statements.values():
+            statements.clear()
+
+        self.assertEqual(self.apply(client, self.job_ids[0]).status_code, 201)
+        self.assertEqual(self.statements["writer"][0], "BEGIN")
+        self.assertIn("INSERT", self.statements["writer"])
+        self.assertNotIn("INSERT", self.statements["reader"])
+
+        self.statements["writer"].clear()
+        self.assertEqual(client.get("/user-applications").status_code, 200)
+        self.assertEqual(self.statements["writer"], [])
+
+    def test_concurrent_applies_and_reads(self):
+        failures = []
+
+        def applicant(email):
+            client = self.client_for(email)
+            for job_id in self.job_ids:
+                response = self.apply(client, job_id)
+                if response.status_code != 201:
+                    failures.append(response.status_code)
+
+        def reader(email):
+            client = self.client_for(email)
+            for _ in range(20):
+                response = client.get("/jobs?keyword=Job")
+                if response.status_code != 200:
+                    failures.append(response.status_code)
+
+        threads = [threading.Thread(target=applicant, args=(email,)) for email in self.emails]
+        threads += [threading.Thread(target=reader, args=(email,)) for email in self.emails]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(failures, [])
+        self.assertEqual(Application.query.count(), len(self.emails) * len(self.job_ids))
+
+
+if __name__ == '__main__':
+    unittest.main()
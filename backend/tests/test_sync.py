@@ -0,0 +1,64 @@
+import unittest
+from datetime import datetime, timedelta
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.models import Team, User, WSTracker
+
+
+class DeltaSyncTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app.config["SYNC_SAFETY_WINDOW"] = 0
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.teams = [Team(name=name, manager="M", email="m@example.com", max_students=2, priority="High")
+                      for name in ("Library", "Admissions", "IT")]
+        db.session.add_all(self.teams)
+        db.session.commit()
+
+        db.session.add(User(username="admin", password=generate_password_hash("pw"), first_name="A",
+                            last_name="Admin", email="admin@example.com", role="admin"))
+        db.session.commit()
+        self.client.post("auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_full_then_delta_sync(self):
+        full = self.client.get("/teams?since=").get_json()
+        self.assertEqual(len(full["items"]), 3)
+        self.assertEqual(full["deleted"], [])
+
+        library, admissions, it = self.teams
+        it_id = it.id
+        library.priority = "Low"
+        db.session.delete(it)
+        db.session.commit()
+
+        delta = self.client.get(f"/teams?since={full['sync_token']}").get_json()
+        self.assertEqual([team["name"] for team in delta["items"]], ["Library"])
+        self.assertEqual(delta["deleted"], [it_id])
+
+        unchanged = self.client.get(f"/teams?since={delta['sync_token']}").get_json()
+        self.assertEqual((unchanged["items"], unchanged["deleted"]), ([], []))
+
+    def test_safety_window_resends_recent_rows(self):
+        self.app.config["SYNC_SAFETY_WINDOW"] = 60
+        token = self.client.get("/ws-position-tracker?since=").get_json()["sync_token"]
+        db.session.add(WSTracker(student_id="S1", minerva_email="s@example.com", full_name="Sam", expected_grad_year=2026))
+        db.session.commit()
+        delta = self.client.get(f"/ws-position-tracker?since={token}").get_json()
+        self.assertEqual([position["full_name"] for position in delta["items"]], ["Sam"])
+
+    def test_bad_or_expired_tokens_require_full_sync(self):
+        self.assertEqual(self.client.get("/teams?since=yesterday").status_code, 410)
+        expired = (datetime.utcnow() - timedelta(days=365)).isoformat()
+        self.assertEqual(self.client.get(f"/teams?since={expired}").status_code, 410)
+
+    def test_plain_list_is_unchanged(self):
+        self.assertEqual(len(self.client.get("/teams").get_json()), 3)
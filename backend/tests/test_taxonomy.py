@@ -0,0 +1,69 @@
+import unittest
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.migrations import normalize_job_taxonomy
+from backend.models import Department, Job, User, job_semester
+
+
+class TaxonomyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        db.session.add(User(username="boss", password=generate_password_hash("pw"), first_name="B",
+                            last_name="Oss", email="boss@example.com", role="Employer"))
+        db.session.commit()
+        self.client.post("auth/login", json={"email": "boss@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def post_job(self, title, semesters, department="Engineering"):
+        return self.client.post('/post-job', json={
+            'employer_id': 1,
+            'title': title,
+            'department': department,
+            'managerName': 'John Doe',
+            'managerEmail': 'john.doe@example.com',
+            'hiringSemesters': semesters,
+            'minStudents': 1,
+            'maxStudents': 5,
+            'roleLocation': 'Remote',
+            'typeOfWork': 'Research',
+            'briefDescription': 'Job description',
+            'applicationDeadline': '2030-12-31',
+        })
+
+    def search(self, **filters):
+        payload = {'department': '', 'keyword': '', 'location': '', **filters}
+        return [job['title'] for job in self.client.post('/job-search', json=payload).get_json()]
+
+    def test_jobs_are_linked_to_lookups(self):
+        self.post_job('Analyst', 'Fall 2026, Spring 2027')
+        job = Job.query.one()
+        self.assertEqual(job.department_id, Department.query.filter_by(name='Engineering').one().id)
+        self.assertEqual([semester.name for semester in job.semesters], ['Fall 2026', 'Spring 2027'])
+
+    def test_semester_and_department_filters(self):
+        self.post_job('Analyst', 'Fall 2026, Spring 2027')
+        self.post_job('Tutor', 'Spring 2027', department='Academics')
+        self.assertEqual(self.search(semesters=['Fall 2026']), ['Analyst'])
+        self.assertEqual(sorted(self.search(semesters=['Spring 2027'])), ['Analyst', 'Tutor'])
+        self.assertEqual(self.search(department='Academics'), ['Tutor'])
+        self.assertEqual(self.search(semesters=['Fall 2030']), [])
+
+    def test_migration_backfills_existing_rows(self):
+        self.post_job('Analyst', 'Fall 2026,Spring 2027')
+        with db.engine.begin() as connection:
+            connection.execute(job_semester.delete())
+            connection.execute(Job.__table__.update().values(department_id=None))
+            normalize_job_taxonomy(connection)
+        db.session.expire_all()
+        job = Job.query.one()
+        self.assertIsNotNone(job.department_id)
+        self.assertEqual(len(job.semesters), 2)
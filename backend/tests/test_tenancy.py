@@ -0,0 +1,60 @@
+import unittest
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.events import get_broker, jobs_channel
+from backend.models import Job, Team, Tenant, User
+
+
+class TenancyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.north = Tenant(slug="north", name="North Campus")
+        db.session.add(self.north)
+        db.session.commit()
+        db.session.add_all([
+            Team(name="Library", manager="M", email="m@example.com", max_students=2, priority="High"),
+            Team(name="North Library", manager="M", email="m@example.com", max_students=2, priority="High",
+                 tenant_id=self.north.id),
+            User(username="boss", password=generate_password_hash("pw"), first_name="N", last_name="Boss",
+                 email="boss@north.example.com", role="admin", tenant_id=self.north.id),
+        ])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def team_names(self, **headers):
+        return [team["name"] for team in self.client.get("/teams", headers=headers).get_json()]
+
+    def test_anonymous_requests_are_scoped_by_header(self):
+        self.assertEqual(self.team_names(), ["Library"])
+        self.assertEqual(self.team_names(**{"X-Tenant": "north"}), ["North Library"])
+        self.assertEqual(self.client.get("/teams", headers={"X-Tenant": "nowhere"}).status_code, 404)
+
+    def test_users_act_within_their_tenant(self):
+        self.client.post("auth/login", json={"email": "boss@north.example.com", "password": "pw"})
+        self.assertEqual(self.team_names(), ["North Library"])
+        self.assertEqual(self.client.get("/teams", headers={"X-Tenant": "default"}).status_code, 403)
+
+        subscription = get_broker().subscribe([jobs_channel(self.north.id)])
+        self.client.post("/teams", json={"name": "Admissions", "manager": "M", "email": "m@example.com",
+                                         "maxStudents": 1, "contact": None, "priority": "Low",
+                                         "recruitingFor": None})
+        self.assertEqual(Team.query.filter_by(name="Admissions").one().tenant_id, self.north.id)
+
+        response = self.client.post("/employers", json={
+            "positionTitle": "Desk", "department": "Library", "managerName": "N",
+            "managerEmail": "boss@north.example.com", "hiringSemester": ["Fall"], "minStudents": 1,
+            "maxStudents": 2, "roleLocation": "SF", "typeOfWork": "Admin", "briefDescription": "Desk",
+            "applicationDeadline": "2030-01-01",
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Job.query.one().tenant_id, self.north.id)
+        self.assertEqual(subscription.get(0)["type"], "job.created")
@@ -0,0 +1,82 @@
+import unittest
+from flask import g
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.models import Team, User
+
+
+class TokenAuthTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        # Requests share the test's app context, so drop the user Flask-Login caches on g
+        @self.app.teardown_request
+        def forget_user(exception):
+            g.pop("_login_user", None)
+
+        self.admin = User(username="admin", password=generate_password_hash("pw"), first_name="A",
+                          last_name="Admin", email="admin@example.com", role="admin")
+        self.team = Team(name="Library", manager="M", email="m@example.com", max_students=2, priority="High")
+        db.session.add_all([self.admin, self.team])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def get_tokens(self):
+        response = self.client.post("/auth/token", json={"email": "admin@example.com", "password": "pw"})
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def bearer(self, token):
+        return {"Authorization": f"Bearer {token}"}
+
+    def test_access_token_authenticates_without_user_lookup(self):
+        tokens = self.get_tokens()
+        # Deleting the row proves the token is checked from its claims alone
+        db.session.delete(self.admin)
+        db.session.commit()
+
+        response = self.client.get("/changes", headers=self.bearer(tokens["access_token"]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get("/changes").status_code, 401)
+        self.assertEqual(self.client.get("/changes", headers=self.bearer("forged")).status_code, 401)
+
+        # ...while refreshing reloads the user
+        response = self.client.post("/auth/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_is_single_use_and_revocation_works(self):
+        tokens = self.get_tokens()
+        refreshed = self.client.post("/auth/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+        self.assertEqual(refreshed.status_code, 200)
+        reused = self.client.post("/auth/token/refresh", json={"refresh_token": tokens["refresh_token"]})
+        self.assertEqual(reused.status_code, 401)
+
+        access_token = refreshed.get_json()["access_token"]
+        self.client.post("/auth/token/revoke", json={"token": access_token})
+        self.assertEqual(self.client.get("/changes", headers=self.bearer(access_token)).status_code, 401)
+
+    def test_tokens_survive_secret_key_rotation(self):
+        tokens = self.get_tokens()
+        self.app.config["SECRET_KEY_FALLBACKS"] = [self.app.config["SECRET_KEY"]]
+        self.app.config["SECRET_KEY"] = "rotated"
+        headers = self.bearer(tokens["access_token"])
+        self.assertEqual(self.client.get("/changes", headers=headers).status_code, 200)
+
+        self.app.config["SECRET_KEY_FALLBACKS"] = []
+        self.assertEqual(self.client.get("/changes", headers=headers).status_code, 401)
+
+    def test_team_update_accepts_token(self):
+        access_token = self.get_tokens()["access_token"]
+        endpoint, _ = self.app.url_map.bind("localhost").match(f"/teams/{self.team.id}", method="PUT")
+        self.assertEqual(endpoint, "main.handle_team")
+        response = self.client.put(f"/teams/{self.team.id}", json={"priority": "Low"}, headers=self.bearer(access_token))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["priority"], "Low")
@@ -0,0 +1,81 @@
+import unittest
+from flask import jsonify
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.models import Team, User
+from backend.unit_of_work import on_commit, transactional
+
+
+class UnitOfWorkTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing')
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.student = User(username="stu", password=generate_password_hash("pw"), first_name="Stu", last_name="Dent",
+                            email="stu@example.com", role="Student", resume="python")
+        self.employer = User(username="boss", password="x", first_name="Bo", last_name="Ss",
+                             email="boss@example.com", role="Employer")
+        db.session.add_all([self.student, self.employer])
+        db.session.commit()
+
+        self.statements = []
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            self.statements.append(statement.split()[0].upper())
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def register(self, email):
+        return self.client.post("/auth/register", json={"email": email, "firstName": "New", "lastName": "User",
+                                                        "password": "pw", "userType": "student"})
+
+    def test_register_relies_on_the_unique_constraint(self):
+        self.assertEqual(self.register("new@example.com").status_code, 201)
+        self.assertEqual(self.statements, ["INSERT"])
+        self.assertEqual(self.register("new@example.com").status_code, 409)
+        self.assertEqual(User.query.filter_by(email="new@example.com").count(), 1)
+
+    def test_profile_edit_returns_updated_columns(self):
+        self.assertEqual(self.client.put(f"/edit/{self.student.id}", json={"first_name": "Stella"}).status_code, 401)
+        self.client.post("/auth/login", json={"email": "stu@example.com", "password": "pw"})
+        self.statements.clear()
+
+        response = self.client.put(f"/edit/{self.student.id}", json={"first_name": "Stella"})
+        self.assertEqual(response.status_code, 200)
+        profile = response.get_json()
+        self.assertEqual(profile["first_name"], "Stella")
+        self.assertNotIn("applications", profile)
+        self.assertEqual(self.statements.count("UPDATE"), 1)
+        db.session.expire_all()
+        self.assertEqual(db.session.get(User, self.student.id).first_name, "Stella")
+
+        self.assertEqual(self.client.put("/edit/999", json={"first_name": "Nobody"}).status_code, 404)
+        # Only their own profile
+        self.assertEqual(self.client.put(f"/edit/{self.employer.id}", json={"first_name": "Nobody"}).status_code, 404)
+
+    def test_error_responses_roll_back(self):
+        published = []
+
+        @self.app.route("/uow-test", methods=["POST"])
+        @transactional
+        def failing_write():
+            db.session.add(Team(name="Ghost", manager="M", email="m@example.com", max_students=1, priority="Low"))
+            db.session.flush()
+            on_commit(published.append, "team.created")
+            return jsonify({"message": "Nope"}), 422
+
+        self.assertEqual(self.client.post("/uow-test").status_code, 422)
+        self.assertEqual(Team.query.count(), 0)
+        self.assertEqual(published, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+from werkzeug.security import generate_password_hash
+from backend import create_app, db
+from backend.models import Tenant, User, WSTracker
+from backend.tenancy import DEFAULT_TENANT_ID
+
+DEPARTMENTS = ["Library", "Admissions", None]
+STATUSES = ["Merged", "Pending", None]
+
+
+class WSTrackerGridTestCase(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app('testing', GRID_COUNT_CAP=10)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        admin = User(username="admin", password=generate_password_hash("pw"), first_name="Ad", last_name="Min",
+                     email="admin@example.com", role="admin")
+        other = Tenant(slug="other", name="Other")
+        db.session.add_all([admin, other])
+        db.session.flush()
+        db.session.add_all(
+            WSTracker(student_id=str(i), minerva_email=f"student{i}@uni.edu", full_name=f"Student {i % 7}",
+                      expected_grad_year=2025 + i % 3, ws_eligible=i % 2 == 0,
+                      department_name=DEPARTMENTS[i % 3], merge_status=STATUSES[i % 4 % 3],
+                      notes="needs I-9" if i % 5 == 0 else None)
+            for i in range(30)
+        )
+        db.session.add(WSTracker(student_id="x", minerva_email="x@uni.edu", full_name="Student 1",
+                                 expected_grad_year=2025, tenant_id=other.id))
+        db.session.commit()
+        self.client.post("/auth/login", json={"email": "admin@example.com", "password": "pw"})
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def grid(self, **params):
+        return self.client.get("/ws-position-tracker/grid", query_string=params)
+
+    def walk(self, **params):
+        """Return the ids of every page of a grid query, following the cursors."""
+        ids, after = [], None
+        while True:
+            response = self.grid(**params, **({"after": after} if after else {}))
+            self.assertEqual(response.status_code, 200)
+            body = response.get_json()
+            ids += [row["id"] for row in body["rows"]]
+            after = body["next"]
+            if after is None:
+                return ids
+
+    def test_pages_follow_the_sort(self):
+        rows = sorted(WSTracker.query.filter_by(tenant_id=DEFAULT_TENANT_ID), key=lambda row: (row.full_name, row.id))
+
+        # NULLs last ascending
+        expected = sorted(rows, key=lambda row: (row.department_name is None, row.department_name or ""))
+        self.assertEqual(self.walk(sort="department_name,full_name", limit=4), [row.id for row in expected])
+
+        # NULLs first descending
+        expected = sorted(rows, key=lambda row: row.merge_status or "", reverse=True)
+        expected.sort(key=lambda row: row.merge_status is not None)
+        self.assertEqual(self.walk(sort="-merge_status,full_name", limit=3), [row.id for row in expected])
+
+        expected = sorted(rows, key=lambda row: (-row.expected_grad_year, row.id))
+        self.assertEqual(self.walk(sort="-expected_grad_year", limit=7), [row.id for row in expected])
+
+    def test_filters_and_search(self):
+        body = self.grid(department_name=["Library", "Admissions"], ws_eligible="true", count="exact").get_json()
+        expected = WSTracker.query.filter(WSTracker.department_name.in_(["Library", "Admissions"]),
+                                          WSTracker.ws_eligible.is_(True)).count()
+        self.assertEqual(body["total"], expected)
+        self.assertFalse(body["estimated"])
+        self.assertTrue(all(row["ws_eligible"] and row["department_name"] for row in body["rows"]))
+
+        body = self.grid(q="I-9 student1", count="exact").get_json()
+        self.assertEqual({row["student_id"] for row in body["rows"]}, {"10", "15"})
+        # Other tenants' rows are never listed
+        self.assertNotIn("x", {row["student_id"] for row in self.grid(q="Student", limit=500).get_json()["rows"]})
+
+    def test_counts(self):
+        body = self.grid(expected_grad_year=2025).get_json()
+        self.assertEqual((body["total"], body["estimated"]), (10, True))  # Reaches GRID_COUNT_CAP
+        body = self.grid(expected_grad_year=2025, merge_status="Merged").get_json()
+        merged = WSTracker.query.filter_by(expected_grad_year=2025, merge_status="Merged").count()
+        self.assertEqual((body["total"], body["estimated"]), (merged, False))
+        self.assertEqual(self.grid(count="exact").get_json()["total"], 30)
+        self.assertIsNone(self.grid(count="none").get_json()["total"])
+
+    def test_invalid_queries(self):
+        self.assertEqual(self.grid(sort="password").status_code, 400)
+        self.assertEqual(self.grid(expected_grad_year="soon").status_code, 400)
+        self.assertEqual(self.grid(limit=0).status_code, 400)
+        self.assertEqual(self.grid(after="garbage").status_code, 400)
+        after = self.grid(sort="full_name", limit=2).get_json()["next"]
+        self.assertEqual(self.grid(sort="-full_name", after=after).status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
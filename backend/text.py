@@ -0,0 +1,45 @@
+import re
+import unicodedata
+
+# Words that carry no signal when searching resumes or job postings
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from has have i in is it its me my of on or our
+that the their this to was we were will with you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+
+def normalize(text):
+    """
+    Normalize free text for indexing.
+
+    Strips accents, folds case and collapses whitespace so that
+    "Résumé" and "resume" index to the same term.
+
+    Args:
+        text (str): The raw text.
+
+    Returns:
+        str: The normalized text.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.casefold().split())
+
+
+def tokenize(text):
+    """
+    Split text into index terms.
+
+    Keeps tokens such as "c++", "c#" and "node.js" intact and drops stopwords.
+
+    Args:
+        text (str): The raw text.
+
+    Returns:
+        list: The list of terms, in order of appearance.
+    """
+    return [token for token in _TOKEN_RE.findall(normalize(text)) if token not in STOPWORDS]
@@ -0,0 +1,149 @@
+import hashlib
+import secrets
+import threading
+import time
+
+from flask import current_app
+from flask_login import UserMixin
+from itsdangerous import BadSignature, URLSafeSerializer
+
+from . import db, login_manager
+
+ACCESS = "access"
+REFRESH = "refresh"
+
+
+class RevocationList:
+    """
+    In-memory set of revoked token IDs, each kept only until its token expires.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked = {}  # jti -> exp
+
+    def revoke(self, jti, exp):
+        now = time.time()
+        with self._lock:
+            self._revoked = {key: until for key, until in self._revoked.items() if until > now}
+            self._revoked[jti] = exp
+
+    def __contains__(self, jti):
+        return jti in self._revoked
+
+
+class TokenUser(UserMixin):
+    """
+    The user behind a valid access token, built from its claims alone.
+
+    ``id``, ``role`` and ``tenant_id`` come from the token; any other attribute
+    loads the ``User`` row on first use.
+    """
+
+    def __init__(self, claims):
+        self.id = claims["sub"]
+        self.role = claims["role"]
+        self.tenant_id = claims["tid"]
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        from .models import User
+
+        if "_user" not in self.__dict__:
+            self.__dict__["_user"] = db.session.get(User, self.id)
+        return getattr(self.__dict__["_user"], name)
+
+
+def _serializer():
+    config = current_app.config
+    # itsdangerous signs with the last key and accepts any of them
+    keys = [*config.get("SECRET_KEY_FALLBACKS", []), config["SECRET_KEY"]]
+    return URLSafeSerializer(keys, salt="api-token", signer_kwargs={"digest_method": hashlib.sha256})
+
+
+def get_revocations():
+    return current_app.extensions["token_revocations"]
+
+
+def issue_tokens(user):
+    """
+    Issue an access token and a refresh token for a user.
+
+    Args:
+        user (User): The user.
+
+    Returns:
+        dict: The tokens and the access token's lifetime in seconds.
+    """
+    now = int(time.time())
+    config = current_app.config
+    serializer = _serializer()
+    access = {
+        "typ": ACCESS, "sub": user.id, "role": user.role, "tid": user.tenant_id,
+        "jti": secrets.token_hex(8), "exp": now + config["ACCESS_TOKEN_TTL"],
+    }
+    refresh = {"typ": REFRESH, "sub": user.id, "jti": secrets.token_hex(8), "exp": now + config["REFRESH_TOKEN_TTL"]}
+    return {
+        "access_token": serializer.dumps(access),
+        "refresh_token": serializer.dumps(refresh),
+        "token_type": "Bearer",
+        "expires_in": config["ACCESS_TOKEN_TTL"],
+    }
+
+
+def validate_token(token, token_type=ACCESS):
+    """
+    Check a token's signature, type, expiry and revocation, without touching the database.
+
+    Args:
+        token (str): The token.
+        token_type (str): The expected type, "access" or "refresh".
+
+    Returns:
+        dict | None: The token's claims, or None if it isn't valid.
+    """
+    try:
+        claims = _serializer().loads(token)
+    except BadSignature:
+        return None
+    if (
+        not isinstance(claims, dict)
+        or claims.get("typ") != token_type
+        or claims.get("exp", 0) <= time.time()
+        or claims.get("jti") in get_revocations()
+    ):
+        return None
+    return claims
+
+
+def revoke_token(claims):
+    """
+    Revoke a token until it would have expired anyway.
+
+    Args:
+        claims (dict): The claims of a valid token.
+    """
+    get_revocations().revoke(claims["jti"], claims["exp"])
+
+
+@login_manager.request_loader
+def load_user_from_token(request):
+    """
+    Authenticate API clients sending ``Authorization: Bearer <access token>``.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    claims = validate_token(token)
+    return TokenUser(claims) if claims else None
+
+
+def init_app(app):
+    """
+    Attach the token revocation list to the application.
+
+    Args:
+        app (Flask): The Flask application.
+    """
+    app.extensions["token_revocations"] = RevocationList()
@@ -0,0 +1,60 @@
+from functools import wraps
+
+from flask import g, has_request_context, jsonify, make_response
+from sqlalchemy.exc import IntegrityError
+
+from . import db
+
+
+def on_commit(callback, *args, **kwargs):
+    """
+    Run a side effect (publishing an event, updating an in-memory index) once
+    the current unit of work has committed.
+
+    Outside a ``transactional`` view the callback runs immediately.
+
+    Args:
+        callback (callable): The side effect.
+        *args, **kwargs: Its arguments, bound now.
+    """
+    pending = g.get("on_commit") if has_request_context() else None
+    if pending is None:
+        callback(*args, **kwargs)
+    else:
+        pending.append((callback, args, kwargs))
+
+
+def transactional(view):
+    """
+    Run a write endpoint as one unit of work.
+
+    The view only flushes (or executes statements); the transaction is
+    committed once after it returns a successful response, and rolled back if
+    it fails or returns an error status. Responses are built before the
+    commit, so serializing them doesn't reload the expired rows. A unique
+    violation anywhere in the unit of work becomes a 409. Callbacks registered
+    with ``on_commit`` run after a successful commit.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.on_commit = []
+        try:
+            response = make_response(view(*args, **kwargs))
+            if response.status_code >= 400:
+                db.session.rollback()
+                return response
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return jsonify({"message": "Conflicts with an existing record"}), 409
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            callbacks = g.pop("on_commit")
+
+        for callback, callback_args, callback_kwargs in callbacks:
+            callback(*callback_args, **callback_kwargs)
+        return response
+
+    return wrapper
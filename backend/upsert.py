@@ -0,0 +1,88 @@
+from sqlalchemy import insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from . import db
+
+# Dialects whose INSERT supports ON CONFLICT DO NOTHING
+_ON_CONFLICT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def insert_unique(model, values, returning=None, unique_columns=None):
+    """
+    Insert a row unless it would violate a unique constraint.
+
+    Uses ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` where the database
+    supports it, so there is no check-then-insert race and a single
+    round-trip, and falls back to catching the unique violation in a
+    savepoint elsewhere. Doesn't commit.
+
+    Args:
+        model: The mapped class.
+        values (dict): The column values of the new row.
+        returning (list, optional): Columns to return; defaults to the whole row as an instance.
+        unique_columns (list, optional): The constraint to check; defaults to any of them.
+
+    Returns:
+        The inserted instance (or row of ``returning`` columns), or None if it conflicted.
+    """
+    dialect = db.session.get_bind().dialect.name
+    make_insert = _ON_CONFLICT_INSERTS.get(dialect)
+    projection = returning or [model]
+    if make_insert is not None:
+        statement = make_insert(model).values(**values).on_conflict_do_nothing(index_elements=unique_columns)
+        result = db.session.execute(statement.returning(*projection))
+    else:
+        try:
+            with db.session.begin_nested():
+                result = db.session.execute(insert(model).values(**values).returning(*projection))
+        except IntegrityError:
+            return None
+    return result.first() if returning else result.scalar()
+
+
+def insert_or_get(model, values, unique_columns):
+    """
+    Insert a row unless one with the same unique key exists.
+
+    Safe under concurrent inserts (see ``insert_unique``). Doesn't commit.
+
+    Args:
+        model: The mapped class.
+        values (dict): The column values of the new row.
+        unique_columns (list): The columns of the unique constraint.
+
+    Returns:
+        tuple: ``(instance, created)``.
+    """
+    instance = insert_unique(model, values, unique_columns=unique_columns)
+    if instance is not None:
+        return instance, True
+    existing = db.session.execute(
+        select(model).filter_by(**{column: values[column] for column in unique_columns})
+    ).scalar_one()
+    return existing, False
+
+
+def update_returning(model, row_id, values, columns):
+    """
+    Update a row and read back a projection of it in the same statement.
+
+    Avoids loading the instance first and serializing it (with its lazy
+    relationships) afterwards just to echo the result.
+
+    Args:
+        model: The mapped class.
+        row_id (int): The primary key.
+        values (dict): The columns to set (may be empty).
+        columns (list): The columns to return.
+
+    Returns:
+        dict | None: The returned columns by name, or None if there is no such row.
+    """
+    if values:
+        statement = update(model).where(model.id == row_id).values(**values).returning(*columns)
+    else:
+        statement = select(*columns).where(model.id == row_id)
+    row = db.session.execute(statement).first()
+    return row._asdict() if row is not None else None
@@ -1,8 +1,76 @@
-# backend/ws_tracker_bp.py
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
+from .grid import Grid, GridError
+from .models import WSTracker
+from .rbac import requires
+from .reconcile import reconcile
+from .tenancy import current_tenant_id
+from .unit_of_work import transactional
 
 ws_tracker_bp = Blueprint('ws_tracker', __name__)
 
-@ws_tracker_bp.route('/ws_tracker', methods=['GET', 'POST'])
-def ws_tracker():
-    return jsonify({"message": "WS Tracker endpoint"})
+TRACKER_GRID = Grid(
+    WSTracker,
+    sortable=["full_name", "minerva_email", "student_id", "expected_grad_year", "ws_eligible", "role",
+              "manager_name", "department_name", "contractor_status", "merge_status", "updated_at"],
+    filters=["department_name", "contractor_status", "merge_status", "ws_eligible", "expected_grad_year"],
+    searchable=["full_name", "minerva_email", "notes"],
+    default_sort="full_name",
+)
+
+
+@ws_tracker_bp.route('/ws-position-tracker/grid', methods=['GET'])
+@requires("tracker:read")
+def ws_tracker_grid():
+    """
+    One page of the work-study tracker, sorted, filtered and searched by the server.
+
+    Query parameters (see ``backend.grid``):
+        sort (str, optional): Columns to sort by, ``-`` for descending, e.g.
+            "-expected_grad_year,full_name". Defaults to "full_name".
+        department_name, contractor_status, merge_status, ws_eligible,
+        expected_grad_year (optional, repeatable): Only rows with one of the values.
+        q (str, optional): Words to find in the name, email or notes.
+        limit (int, optional): The page size, at most 500. Defaults to 50.
+        after (str, optional): The ``next`` cursor of the previous page.
+        count (str, optional): "estimated" (default), "exact" or "none".
+
+    Returns:
+        JSON response containing the ``rows``, the ``next`` cursor (null on
+        the last page), the ``total`` of matching rows and whether it is
+        ``estimated``, or 400 for an invalid query.
+    """
+    try:
+        page = TRACKER_GRID.page(request.args)
+    except GridError as error:
+        return jsonify({"message": str(error)}), 400
+    page["rows"] = [position.to_dict() for position in page["rows"]]
+    return jsonify(page), 200
+
+
+@ws_tracker_bp.route('/ws-position-tracker/reconcile/dry-run', methods=['POST'])
+@requires("tracker:write")
+def reconcile_dry_run():
+    """
+    Match the tracker rows with registered students without saving the result.
+
+    Returns:
+        JSON response containing the number of rows, the count of each merge
+        status and the rows whose merge status would change.
+    """
+    return jsonify(reconcile(current_tenant_id(), dry_run=True)), 200
+
+
+@ws_tracker_bp.route('/ws-position-tracker/reconcile', methods=['POST'])
+@requires("tracker:write")
+@transactional
+def reconcile_tracker():
+    """
+    Match the tracker rows with registered students and update their merge status in bulk.
+
+    Run it after importing rows; only rows whose status changes are written.
+
+    Returns:
+        JSON response containing the number of rows, the count of each merge
+        status and the rows whose merge status changed.
+    """
+    return jsonify(reconcile(current_tenant_id())), 200
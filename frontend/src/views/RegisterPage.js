@@ -16,8 +16,7 @@ const RegisterPage = () => {
         confirmPassword: '',
         userType: 'student',
         studentId: '',
-        employmentId: '',
-        adminId: ''
+        employmentId: ''
     });
     const [emailError, setEmailError] = useState('');
     const [passwordError, setPasswordError] = useState('');
@@ -36,9 +35,6 @@ const RegisterPage = () => {
         } else if (userDetails.userType === 'manager' && !userDetails.email.endsWith('@minerva.edu')) {
             setEmailError('Managers must use a minerva.edu email');
             return false;
-        } else if (userDetails.userType === 'admin' && !userDetails.email.endsWith('@minerva.edu')) {
-            setEmailError('Admins must use a minerva.edu email and be work-study administrators');
-            return false;
         }
         setEmailError('');
         return true;
@@ -136,7 +132,6 @@ const RegisterPage = () => {
                         className="form-select">
                         <option value="student">Student</option>
                         <option value="manager">Manager</option>
-                        <option value="admin">Admin (Work-Study)</option>
                     </select>
                 </div>
                 {userDetails.userType === 'student' && (
@@ -163,18 +158,6 @@ const RegisterPage = () => {
                         />
                     </div>
                 )}
-                {userDetails.userType === 'admin' && (
-                    <div className="mb-3">
-                        <input
-                            type="text"
-                            name="adminId"
-                            placeholder="Admin ID"
-                            value={userDetails.adminId}
-                            onChange={handleChange}
-                            className="form-control"
-                        />
-                    </div>
-                )}
                 <div className="mb-3">
                     <input
                         type="text"
@@ -103,7 +103,9 @@ const WSPositionTracker = () => {
     const fetchEntries = async () => {
       setLoading(true);
       try {
-        const response = await fetch(`${BASE_URL}/ws-position-tracker`);
+        const response = await fetch(`${BASE_URL}/ws-position-tracker`, {
+          credentials: "include",
+        });
         if (response.ok) {
           const data = await response.json();
           setEntries(data);
@@ -167,6 +169,7 @@ const WSPositionTracker = () => {
       const response = await fetch(url, {
         method,
         headers: { "Content-Type": "application/json" },
+        credentials: "include",
         body: JSON.stringify(formData),
       });
 
@@ -197,6 +200,7 @@ const WSPositionTracker = () => {
       try {
         const response = await fetch(`${BASE_URL}/ws-position-tracker/${id}`, {
           method: "DELETE",
+          credentials: "include",
         });
 
         if (!response.ok) {
@@ -237,6 +241,7 @@ const WSPositionTracker = () => {
         const response = await fetch(`${BASE_URL}/ws-position-tracker`, {
           method: "POST",
           headers: { "Content-Type": "application/json" },
+          credentials: "include",
           body: JSON.stringify(entry),
         });
 